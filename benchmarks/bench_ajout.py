@@ -0,0 +1,32 @@
+# --- Benchmark : latence de SearchEngine.ajouter_documents (micro-lots) selon la taille du corpus ---
+# Usage : python -m benchmarks.bench_ajout [taille_lot] [taille_corpus ...]
+#   Corpus : phrases des discours de discours_US.csv ; chaque lot ajoute taille_lot nouvelles phrases
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.discours import documents_discours
+from classes.Corpus import Corpus
+from classes.SearchEngine import SearchEngine
+
+
+if __name__ == '__main__':
+    taille_lot = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    documents = documents_discours('phrase')
+    tailles = [int(x) for x in sys.argv[2:]] or [2000, 8000, len(documents) - 10 * taille_lot]
+    print(f"Lots de {taille_lot} documents\n")
+    print(f"{'documents indexés':>18} {'ajout moyen (ms)':>17} {'ajout max (ms)':>15}")
+    for taille in tailles:
+        Corpus._instance = None
+        Corpus._initialized = False
+        corpus = Corpus.getInstance("Benchmark")
+        corpus.register_documents(documents[:taille])
+        moteur = SearchEngine(corpus)
+        durees = []
+        for debut in range(taille, taille + 10 * taille_lot, taille_lot):
+            doc_ids = corpus.register_documents(documents[debut:debut + taille_lot])
+            chrono = time.perf_counter()
+            moteur.ajouter_documents(doc_ids)
+            durees.append((time.perf_counter() - chrono) * 1000)
+        print(f"{taille:>18} {np.mean(durees):>17.2f} {np.max(durees):>15.2f}")
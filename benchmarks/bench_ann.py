@@ -0,0 +1,50 @@
+# --- Benchmark : documents similaires approchés (SimHashLSH) vs cosinus exact ---
+# Usage : python -m benchmarks.bench_ann [phrase|discours] [k] [nb_requetes]
+#   Rappel@k mesuré par rapport à similar() exact, pour plusieurs nombres de sondes par bande
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.discours import construire_corpus
+from classes.SearchEngine import SearchEngine
+
+
+SONDES = [0, 1, 2, 4, 6, 8, 10]
+
+
+if __name__ == '__main__':
+    granularite = sys.argv[1] if len(sys.argv) > 1 else 'phrase'
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    nb_requetes = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    corpus = construire_corpus(granularite)
+    moteur = SearchEngine(corpus)
+    generateur = np.random.default_rng(0)
+    requetes = generateur.choice(moteur.doc_ids, size=min(nb_requetes, len(moteur.doc_ids)), replace=False)
+
+    debut = time.perf_counter()
+    index = moteur.construire_index_ann()
+    construction = time.perf_counter() - debut
+    print(f"{len(moteur.doc_ids)} documents ({granularite}), k = {k}, {len(requetes)} requêtes")
+    print(f"index : {index.nb_bandes} bandes x {index.bits_par_bande} bits, construction {construction:.2f} s, "
+          f"{index.nb_octets() / 2 ** 20:.1f} Mo\n")
+
+    debut = time.perf_counter()
+    exacts = {doc_id: moteur.similar(doc_id, k) for doc_id in requetes}
+    latence_exacte = (time.perf_counter() - debut) / len(requetes) * 1000
+    print(f"{'sondes':>7} {'candidats':>10} {'rappel@k':>9} {'latence (ms)':>13} {'accélération':>13}")
+    print(f"{'exact':>7} {len(moteur.doc_ids):>10} {1:>9.3f} {latence_exacte:>13.2f} {1:>13.2f}")
+    matrice = moteur.matrice_normalisee()
+    for nb_sondes in SONDES:
+        debut = time.perf_counter()
+        approches = {doc_id: moteur.similar(doc_id, k, approx=True, nb_sondes=nb_sondes) for doc_id in requetes}
+        latence = (time.perf_counter() - debut) / len(requetes) * 1000
+        rappels = [
+            len(set(approches[doc_id].get('id', [])) & set(exacts[doc_id]['id'])) / len(exacts[doc_id])
+            for doc_id in requetes if len(exacts[doc_id])
+        ]
+        candidats = np.mean([
+            len(index.candidats(matrice[moteur.doc_id_to_ligne[doc_id]], nb_sondes)) for doc_id in requetes
+        ])
+        print(f"{nb_sondes:>7} {candidats:>10.0f} {np.mean(rappels):>9.3f} {latence:>13.2f} "
+              f"{latence_exacte / latence:>13.2f}")
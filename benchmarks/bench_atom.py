@@ -0,0 +1,86 @@
+# --- Benchmark : parseur Atom incrémental (iterparse) vs xmltodict ---
+# Usage : python -m benchmarks.bench_atom [nb_entrees ...]
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import xmltodict
+
+from classes.AtomParser import AtomParser
+from classes.DocumentFactory import DocumentFactory
+
+
+def generer_flux(nb_entrees):
+    # --- Construit un flux Atom arXiv synthétique de nb_entrees entrées ---
+    entrees = []
+    for i in range(nb_entrees):
+        entrees.append(
+            "<entry>"
+            f"<id>http://arxiv.org/abs/{i:07d}v1</id>"
+            "<published>2020-01-01T00:00:00Z</published>"
+            f"<title>Basketball analytics {i}</title>"
+            f"<summary>{'We study player tracking data and shot selection. ' * 20}\n</summary>"
+            f"<author><name>Auteur {i}</name></author><author><name>Co-auteur {i}</name></author>"
+            "</entry>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+        f"<opensearch:totalResults>{nb_entrees}</opensearch:totalResults>"
+        + ''.join(entrees) + "</feed>"
+    ).encode('utf-8')
+
+
+def parser_xmltodict(xml_data):
+    # --- Chemin de référence (fetch_arxiv des TD) : dict complet puis extraction ---
+    parsed = xmltodict.parse(xml_data)
+    entries = parsed['feed'].get('entry', [])
+    if isinstance(entries, dict):
+        entries = [entries]
+    for entry in entries:
+        published = entry.get('published')
+        author_field = entry.get('author', {})
+        if isinstance(author_field, dict):
+            author_field = [author_field]
+        co_auteurs = [a.get('name', '') for a in author_field if a.get('name')]
+        yield DocumentFactory.create_document(
+            source='arxiv',
+            titre=entry.get('title', 'arXiv entry').strip(),
+            auteur=co_auteurs[0] if co_auteurs else 'arxiv',
+            date=datetime.strptime(published, "%Y-%m-%dT%H:%M:%SZ") if published else None,
+            url=entry.get('id', ''),
+            texte=entry.get('summary', '').replace('\n', ' '),
+            co_auteurs=co_auteurs
+        )
+
+
+def parser_iterparse(xml_data):
+    # --- Parseur incrémental ---
+    return AtomParser().parser(xml_data)
+
+
+def mesurer(parser, xml_data):
+    # --- Temps jusqu'au premier document, temps total et pic mémoire (documents non conservés) ---
+    tracemalloc.start()
+    debut = time.perf_counter()
+    premier = None
+    nb = 0
+    for _ in parser(xml_data):
+        if premier is None:
+            premier = time.perf_counter() - debut
+        nb += 1
+    total = time.perf_counter() - debut
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'nb': nb, 'premier_ms': (premier or 0) * 1000, 'total_ms': total * 1000, 'pic_mo': pic / 1e6}
+
+
+if __name__ == '__main__':
+    tailles = [int(x) for x in sys.argv[1:]] or [100, 1000, 5000]
+    print(f"{'entrées':>8} {'parseur':>10} {'1er doc (ms)':>13} {'total (ms)':>11} {'pic (Mo)':>9}")
+    for taille in tailles:
+        xml_data = generer_flux(taille)
+        for nom, parser in (('xmltodict', parser_xmltodict), ('iterparse', parser_iterparse)):
+            m = mesurer(parser, xml_data)
+            print(f"{taille:>8} {nom:>10} {m['premier_ms']:>13.2f} {m['total_ms']:>11.1f} {m['pic_mo']:>9.2f}")
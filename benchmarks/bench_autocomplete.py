@@ -0,0 +1,54 @@
+# --- Benchmark : latence de Autocomplete.suggest sur un grand vocabulaire synthétique ---
+# Usage : python -m benchmarks.bench_autocomplete [nb_mots ...]
+import sys
+import time
+
+import numpy as np
+
+from classes.Autocomplete import Autocomplete
+
+
+def generer_vocabulaire(nb_mots, graine=0):
+    # --- Mots aléatoires triés (lettres biaisées comme en anglais) et fréquences en loi de Zipf ---
+    generateur = np.random.default_rng(graine)
+    lettres = np.array(list('etaoinshrdlcumwfgypbvkjxqz'))
+    poids = 1 / np.arange(1, 27)
+    poids /= poids.sum()
+    mots = set()
+    while len(mots) < nb_mots:
+        longueurs = generateur.integers(2, 12, size=nb_mots)
+        for longueur in longueurs:
+            mots.add(''.join(generateur.choice(lettres, size=longueur, p=poids)))
+            if len(mots) >= nb_mots:
+                break
+    mots = sorted(mots)
+    frequences = generateur.zipf(1.5, size=len(mots))
+    return mots, frequences
+
+
+def mesurer(autocompletion, prefixes, k):
+    # --- Latences (µs) de suggest pour chaque préfixe ---
+    latences = []
+    for prefixe in prefixes:
+        debut = time.perf_counter()
+        autocompletion.suggest(prefixe, k)
+        latences.append((time.perf_counter() - debut) * 1e6)
+    return np.array(latences)
+
+
+if __name__ == '__main__':
+    tailles = [int(x) for x in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'mots':>9} {'construction (s)':>17} {'préfixes préc.':>15} {'mémoire (Mo)':>13} "
+          f"{'p50 (µs)':>9} {'p99 (µs)':>9} {'max (µs)':>9}")
+    for taille in tailles:
+        mots, frequences = generer_vocabulaire(taille)
+        debut = time.perf_counter()
+        autocompletion = Autocomplete(mots, frequences)
+        construction = time.perf_counter() - debut
+        # Préfixes de 1 à 4 lettres tirés des mots du vocabulaire
+        generateur = np.random.default_rng(1)
+        prefixes = [mots[i][:generateur.integers(1, 5)] for i in generateur.integers(0, len(mots), size=20_000)]
+        latences = mesurer(autocompletion, prefixes, k=5)
+        print(f"{taille:>9} {construction:>17.2f} {len(autocompletion.meilleurs):>15} "
+              f"{autocompletion.nb_octets() / 1e6:>13.2f} {np.percentile(latences, 50):>9.1f} "
+              f"{np.percentile(latences, 99):>9.1f} {latences.max():>9.1f}")
@@ -0,0 +1,44 @@
+# --- Benchmark : index sémantique latent (SVD tronquée) vs produit creux TFxIDF ---
+# Usage : python -m benchmarks.bench_lsa [phrase|discours] [rang ...]
+#   Mémoire, temps de construction, latence de scoring et recouvrement du top-10 avec le cosinus creux
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.discours import REQUETES, construire_corpus, mesurer
+from classes.SearchEngine import SearchEngine
+
+
+def octets_csr(mat):
+    # --- Taille d'une matrice CSR (valeurs, indices, pointeurs) ---
+    return mat.data.nbytes + mat.indices.nbytes + mat.indptr.nbytes
+
+
+def top(scores, k=10):
+    meilleurs = np.argpartition(-scores, k - 1)[:k]
+    return set(meilleurs[scores[meilleurs] > 0])
+
+
+if __name__ == '__main__':
+    granularite = sys.argv[1] if len(sys.argv) > 1 else 'phrase'
+    rangs = [int(x) for x in sys.argv[2:]] or [50, 100, 200]
+    corpus = construire_corpus(granularite)
+    moteur = SearchEngine(corpus)
+    vecteurs = [moteur._construire_vecteur_requete(mots_cles) for mots_cles in REQUETES]
+    latence_creuse = np.mean([mesurer(lambda: moteur._calculer_similarite_cosinus(v)) for v in vecteurs])
+    print(f"{len(moteur.doc_ids)} documents ({granularite}), {len(moteur.mots)} termes, {len(REQUETES)} requêtes\n")
+    print(f"{'index':>10} {'mémoire (Mo)':>13} {'construction (s)':>17} {'latence (ms)':>13} {'top-10 commun':>14}")
+    print(f"{'creux':>10} {octets_csr(moteur.mat_TFxIDF) / 2 ** 20:>13.1f} {'':>17} {latence_creuse:>13.2f} {'':>14}")
+    for rang in rangs:
+        debut = time.perf_counter()
+        index = moteur.construire_index_lsa(rang)
+        construction = time.perf_counter() - debut
+        latence = np.mean([mesurer(lambda: index.scores(v)) for v in vecteurs])
+        communs = np.mean([
+            len(top(index.scores(v)) & top(moteur._calculer_similarite_cosinus(v))) / 10 for v in vecteurs
+        ])
+        print(f"{'LSA k=' + str(index.rang):>10} {index.nb_octets() / 2 ** 20:>13.1f} {construction:>17.2f} "
+              f"{latence:>13.2f} {communs:>14.2f}")
+    print("\nRequête 'economy jobs america' (LSA, k = dernier rang) :")
+    print(moteur.search(["economy", "jobs", "america"], 5, lsa=True)[['id', 'titre', 'score']].to_string(index=False))
@@ -0,0 +1,66 @@
+# --- Benchmark : listes inversées compressées (taille par posting, débit de décodage) ---
+# Usage : python -m benchmarks.bench_postings [nb_documents ...]
+import sys
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from classes.PostingsCompresses import PostingsCompresses
+
+
+def generer_matrice_TF(nb_documents, nb_termes=50_000, longueur_moyenne=150, graine=0):
+    # --- Matrice Documents x Termes synthétique : mots tirés selon une loi de Zipf ---
+    generateur = np.random.default_rng(graine)
+    longueurs = generateur.poisson(longueur_moyenne, size=nb_documents)
+    rangs = np.arange(1, nb_termes + 1)
+    probabilites = 1 / rangs
+    probabilites /= probabilites.sum()
+    termes = generateur.choice(nb_termes, size=longueurs.sum(), p=probabilites)
+    lignes = np.repeat(np.arange(nb_documents), longueurs)
+    mat_TF = csr_matrix((np.ones(len(termes), dtype=np.int64), (lignes, termes)), shape=(nb_documents, nb_termes))
+    mat_TF.sum_duplicates()
+    return mat_TF
+
+
+def octets_csc(mat):
+    # --- Taille d'une matrice CSC (indices, valeurs, pointeurs) ---
+    mat = mat.tocsc()
+    return mat.indices.nbytes + mat.data.nbytes + mat.indptr.nbytes
+
+
+if __name__ == '__main__':
+    tailles = [int(x) for x in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'documents':>10} {'postings':>11} {'CSC (o/p)':>10} {'compressé (o/p)':>16} "
+          f"{'construction (s)':>17} {'décodage global (Mp/s)':>23} {'décodage par terme (Mp/s)':>26}")
+    for taille in tailles:
+        mat_TF = generer_matrice_TF(taille)
+        nb_postings = mat_TF.nnz
+
+        debut = time.perf_counter()
+        index = PostingsCompresses(mat_TF)
+        construction = time.perf_counter() - debut
+
+        # Décodage de tous les blocs en un appel (débit brut du décodage vectorisé)
+        debut = time.perf_counter()
+        index.decoder_blocs(np.arange(index.debut_blocs[-1]))
+        decodage_global = time.perf_counter() - debut
+
+        # Décodage de toutes les listes, terme par terme (comme à la recherche)
+        debut = time.perf_counter()
+        for terme in range(index.nb_termes):
+            index.postings(terme)
+        decodage_termes = time.perf_counter() - debut
+
+        # Vérification sur quelques termes (fréquents et rares)
+        csc = mat_TF.tocsc()
+        csc.sort_indices()
+        for terme in (0, 1, 10, 1000, index.nb_termes - 1):
+            lignes, tf = index.postings(terme)
+            debut_terme, fin_terme = csc.indptr[terme], csc.indptr[terme + 1]
+            assert np.array_equal(lignes, csc.indices[debut_terme:fin_terme])
+            assert np.array_equal(tf, csc.data[debut_terme:fin_terme])
+
+        print(f"{taille:>10} {nb_postings:>11} {octets_csc(mat_TF) / nb_postings:>10.2f} "
+              f"{index.octets_par_posting():>16.2f} {construction:>17.2f} "
+              f"{nb_postings / decodage_global / 1e6:>23.1f} {nb_postings / decodage_termes / 1e6:>26.1f}")
@@ -0,0 +1,47 @@
+# --- Corpus et outils communs aux benchmarks sur les discours de discours_US.csv ---
+#   phrase : un document par phrase des discours (comme TD8), discours : un document par discours
+import re
+import time
+
+import pandas as pd
+
+from classes.Corpus import Corpus
+from classes.Document import Document
+
+
+REQUETES = [
+    ["america"], ["the", "people"], ["economy", "jobs", "america"], ["middle", "class"],
+    ["freedom", "of", "the"], ["health", "care", "insurance"], ["we", "will", "win"], ["democracy"],
+]
+
+
+def documents_discours(granularite='phrase'):
+    # --- Documents des discours (un par phrase ou par discours), dans l'ordre du fichier ---
+    df = pd.read_csv('discours_US.csv', sep='\t')
+    documents = []
+    for _, ligne in df.iterrows():
+        textes = [str(ligne['text'])]
+        if granularite == 'phrase':
+            textes = re.split(r'(?<=[.!?])\s+', textes[0])
+        for i, texte in enumerate(textes, start=1):
+            documents.append(Document(
+                f"{ligne['descr']} - {i}", ligne['speaker'], 'Discours US', ligne['date'], ligne['link'], texte
+            ))
+    return documents
+
+
+def construire_corpus(granularite):
+    # --- Corpus des discours de discours_US.csv (un document par phrase ou par discours) ---
+    corpus = Corpus.getInstance("Benchmark")
+    for document in documents_discours(granularite):
+        corpus.register_document(document)
+    return corpus
+
+
+def mesurer(fonction, repetitions=20):
+    # --- Latence moyenne (ms) ---
+    fonction()
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        fonction()
+    return (time.perf_counter() - debut) / repetitions * 1000
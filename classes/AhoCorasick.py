@@ -0,0 +1,89 @@
+from collections import deque
+
+
+class AhoCorasick:
+    # --- Automate d'Aho-Corasick : toutes les occurrences d'un ensemble de mots-clés en une passe ---
+    # Le trie des mots-clés est complété par les liens d'échec (plus long suffixe de l'état qui est
+    # aussi un préfixe d'un mot-clé) puis transformé en automate déterministe : chaque caractère du
+    # texte coûte une seule transition, quel que soit le nombre de mots-clés.
+
+    def __init__(self, motifs, ignorer_casse=True):
+        # --- Construit l'automate ---
+        # motifs : mots-clés (les doublons et les chaînes vides sont ignorés)
+        # ignorer_casse : comparaison insensible à la casse (comme Corpus.search / concorde)
+        self.ignorer_casse = ignorer_casse
+        self.motifs = list(dict.fromkeys(m for m in motifs if m))
+        # transitions[etat] : caractère -> état suivant (absent = retour à la racine)
+        # sorties[etat] : indices des motifs qui se terminent dans cet état
+        self.transitions = [{}]
+        sorties = [[]]
+        for indice, motif in enumerate(self.motifs):
+            etat = 0
+            for caractere in self._normaliser(motif):
+                if caractere not in self.transitions[etat]:
+                    self.transitions.append({})
+                    sorties.append([])
+                    self.transitions[etat][caractere] = len(self.transitions) - 1
+                etat = self.transitions[etat][caractere]
+            sorties[etat].append(indice)
+
+        # Parcours en largeur : liens d'échec, sorties héritées et transitions manquantes
+        # (celles de l'état d'échec, déjà complètes car moins profond)
+        echecs = [0] * len(self.transitions)
+        file = deque(self.transitions[0].values())
+        while file:
+            etat = file.popleft()
+            sorties[etat].extend(sorties[echecs[etat]])
+            for caractere, suivant in list(self.transitions[etat].items()):
+                echecs[suivant] = self.transitions[echecs[etat]].get(caractere, 0)
+                file.append(suivant)
+            for caractere, suivant in self.transitions[echecs[etat]].items():
+                self.transitions[etat].setdefault(caractere, suivant)
+        self.sorties = [tuple(s) for s in sorties]
+        # Longueurs dans le texte normalisé (la mise en minuscules peut changer la longueur)
+        self.longueurs = [len(self._normaliser(motif)) for motif in self.motifs]
+
+    def _normaliser(self, texte):
+        return texte.lower() if self.ignorer_casse else texte
+
+    def __len__(self):
+        return len(self.motifs)
+
+    def rechercher(self, texte, mots_entiers=False):
+        # --- Liste des occurrences (debut, fin, indice du motif), chevauchements compris ---
+        # mots_entiers : ne garder que les occurrences qui ne sont pas entourées de lettres ou chiffres
+        # Les positions renvoyées sont celles de `texte`. Quand la mise en minuscules change la longueur
+        # d'un caractère (İ devient i suivi d'un point combinant), le texte normalisé est construit
+        # caractère par caractère avec, pour chacun de ses caractères, sa position dans `texte`.
+        occurrences = []
+        transitions, sorties, longueurs = self.transitions, self.sorties, self.longueurs
+        normalise = self._normaliser(texte)
+        origines = None
+        if len(normalise) != len(texte):
+            morceaux = [caractere.lower() for caractere in texte]
+            normalise = ''.join(morceaux)
+            origines = [position for position, morceau in enumerate(morceaux) for _ in morceau]
+        etat = 0
+        for position, caractere in enumerate(normalise):
+            etat = transitions[etat].get(caractere, 0)
+            if sorties[etat]:
+                fin = position + 1
+                for indice in sorties[etat]:
+                    debut = fin - longueurs[indice]
+                    if origines is None:
+                        occurrences.append((debut, fin, indice))
+                    else:
+                        occurrences.append((origines[debut], origines[fin - 1] + 1, indice))
+        if mots_entiers:
+            occurrences = [
+                (debut, fin, indice) for debut, fin, indice in occurrences
+                if (debut == 0 or not texte[debut - 1].isalnum()) and (fin == len(texte) or not texte[fin].isalnum())
+            ]
+        return occurrences
+
+    def compter(self, texte, mots_entiers=False):
+        # --- Nombre d'occurrences de chaque motif dans le texte : {indice du motif: nombre} ---
+        comptes = {}
+        for _, _, indice in self.rechercher(texte, mots_entiers):
+            comptes[indice] = comptes.get(indice, 0) + 1
+        return comptes
@@ -0,0 +1,181 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from classes.AtomParser import AtomParser
+from classes.RateLimiter import RateLimiter
+
+
+ARXIV_URL = 'http://export.arxiv.org/api/query'
+
+
+class ArxivFetcher:
+    # --- Récupère les résultats de l'API arXiv page par page, en parallèle ---
+
+    def __init__(self, base_url=ARXIV_URL, nb_workers=4, requetes_par_seconde=1 / 3, timeout=30,
+                 session=None, cache=None):
+        # --- Paramètre le client ---
+        # base_url : point d'accès de l'API (modifiable pour un serveur local de test)
+        # nb_workers : nombre de pages récupérées simultanément (taille du pool de connexions)
+        # requetes_par_seconde : débit maximal partagé par tous les workers (arXiv demande 1 requête / 3 s)
+        # cache : HttpCache optionnel (les réponses en cache ne consomment pas le débit)
+        self.base_url = base_url
+        self.nb_workers = nb_workers
+        self.timeout = timeout
+        self.limiteur = RateLimiter(requetes_par_seconde)
+        self.cache = cache
+        if session is None:
+            # Une seule session : connexions keep-alive réutilisées par tous les workers
+            session = requests.Session()
+            adaptateur = HTTPAdapter(pool_connections=1, pool_maxsize=nb_workers)
+            session.mount('http://', adaptateur)
+            session.mount('https://', adaptateur)
+        self.session = session
+        self.metriques = {'nb_requetes': 0, 'nb_documents': 0}
+        self._verrou = threading.Lock()
+        # État du dernier parcours (crawl incrémental)
+        self.watermark_atteint = False
+        self.parcours_complet = False
+
+    def fermer(self):
+        # --- Ferme les connexions du pool ---
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    @staticmethod
+    def _params(query, start, max_results, tri=None):
+        # --- Paramètres de la requête ---
+        # tri : critère sortBy de l'API (ex. 'lastUpdatedDate'), par ordre décroissant
+        params = {
+            'search_query': query,
+            'start': start,
+            'max_results': max_results
+        }
+        if tri:
+            params['sortBy'] = tri
+            params['sortOrder'] = 'descending'
+        return params
+
+    def _avant_requete(self):
+        # --- Appelé avant chaque accès réseau : limite de débit et comptage ---
+        self.limiteur.attendre()
+        with self._verrou:
+            self.metriques['nb_requetes'] += 1
+
+    def ouvrir_page(self, query, start, max_results, tri=None):
+        # --- Ouvre une page en streaming (le corps n'est pas encore lu) ---
+        self._avant_requete()
+        response = self.session.get(
+            self.base_url, params=self._params(query, start, max_results, tri), timeout=self.timeout,
+            stream=True
+        )
+        response.raise_for_status()
+        # Décompresser à la volée si le serveur répond en gzip
+        response.raw.decode_content = True
+        return response
+
+    def iterer_page(self, query, start, max_results, parseur=None, tri=None):
+        # --- Génère les documents d'une page au fil du téléchargement (ou de la lecture du cache) ---
+        parseur = parseur if parseur is not None else AtomParser()
+        if self.cache is not None:
+            flux = self.cache.ouvrir(
+                self.session, self.base_url, self._params(query, start, max_results, tri),
+                timeout=self.timeout, avant_requete=self._avant_requete
+            )
+            with flux:
+                yield from parseur.parser(flux)
+            return
+        with self.ouvrir_page(query, start, max_results, tri) as response:
+            yield from parseur.parser(response.raw)
+
+    def recuperer_page(self, query, start, max_results, tri=None):
+        # --- Télécharge et parse une page : renvoie (documents, nombre total de résultats) ---
+        parseur = AtomParser()
+        documents = list(self.iterer_page(query, start, max_results, parseur, tri))
+        return documents, parseur.total_resultats
+
+    def recuperer(self, query='all:Basketball', max_results=100, taille_page=50, start=0, depuis=None,
+                  par_date=False):
+        # --- Génère les ArxivDocument des pages [start, start + max_results) au fur et à mesure ---
+        # La première page donne le nombre total de résultats ; les suivantes sont
+        # récupérées en parallèle et leurs documents sont renvoyés dès qu'elles arrivent.
+        # depuis : watermark (datetime, date de dernière mise à jour <updated>). Les résultats sont alors
+        # triés de la mise à jour la plus récente à la plus ancienne (nouveaux articles et nouvelles
+        # versions) et le parcours s'arrête à la première page contenant un document plus ancien.
+        # par_date : trier par date de mise à jour décroissante même sans watermark
+        tri = 'lastUpdatedDate' if par_date or depuis is not None else None
+        self.watermark_atteint = False
+        self.parcours_complet = False
+
+        # La première page est parsée en flux : ses documents sortent avant la fin du téléchargement
+        premiere_taille = min(taille_page, max_results)
+        parseur = AtomParser()
+        for document in self.iterer_page(query, start, premiere_taille, parseur, tri):
+            yield from self._compter(self._filtrer_nouveaux([document], depuis))
+
+        fin = start + max_results
+        if parseur.total_resultats is not None:
+            fin = min(fin, parseur.total_resultats)
+        if parseur.nb_entrees < premiere_taille or self.watermark_atteint:
+            self.parcours_complet = True
+            return
+
+        debuts = deque(range(start + premiere_taille, fin, taille_page))
+        with ThreadPoolExecutor(max_workers=self.nb_workers) as pool:
+            en_cours = set()
+            while debuts or en_cours:
+                # Nombre de pages en attente borné (2 par worker)
+                while debuts and len(en_cours) < 2 * self.nb_workers:
+                    debut_page = debuts.popleft()
+                    en_cours.add(pool.submit(
+                        self.recuperer_page, query, debut_page, min(taille_page, fin - debut_page), tri
+                    ))
+                termines, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+                for future in termines:
+                    documents, _ = future.result()
+                    yield from self._compter(self._filtrer_nouveaux(documents, depuis))
+                if self.watermark_atteint:
+                    # Les pages suivantes ne contiennent que des documents plus anciens
+                    debuts.clear()
+        self.parcours_complet = self.watermark_atteint or fin < start + max_results
+
+    def _filtrer_nouveaux(self, documents, depuis):
+        # --- Garde les documents mis à jour depuis le watermark ---
+        # Ceux qui ont exactement la date du watermark sont gardés (plusieurs entrées peuvent
+        # partager cette seconde) : le corpus ignore ceux qu'il a déjà à l'identique.
+        if depuis is None:
+            return documents
+        nouveaux = [doc for doc in documents if doc.date_maj is None or doc.date_maj >= depuis]
+        if len(nouveaux) < len(documents):
+            self.watermark_atteint = True
+        return nouveaux
+
+    def mettre_a_jour_corpus(self, corpus, query='all:Basketball', max_results=100, taille_page=50):
+        # --- Crawl incrémental : enregistre les nouveaux résultats et avance le watermark ---
+        # Renvoie le nombre de documents nouveaux ou mis à jour par ce crawl
+        cle = f"arxiv:{query}"
+        watermark = corpus.get_watermark(cle)
+        documents = list(self.recuperer(
+            query, max_results=max_results, taille_page=taille_page, depuis=watermark, par_date=True
+        ))
+        _, nb_modifies = corpus.register_documents(documents, compter=True)
+        # Résultats triés par date : le watermark n'avance que si aucun trou ne reste entre
+        # l'ancien watermark et les documents récupérés
+        if watermark is None or self.parcours_complet:
+            dates = [doc.date_maj for doc in documents if doc.date_maj is not None]
+            if dates:
+                corpus.update_watermark(cle, max(dates))
+        return nb_modifies
+
+    def _compter(self, documents):
+        # --- Met à jour les métriques et renvoie les documents ---
+        self.metriques['nb_documents'] += len(documents)
+        return documents
@@ -0,0 +1,86 @@
+import io
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from classes.Document import ArxivDocument
+from classes.DocumentFactory import DocumentFactory
+
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+OPENSEARCH = '{http://a9.com/-/spec/opensearch/1.1/}'
+
+
+class AtomParser:
+    # --- Parseur incrémental des flux Atom de l'API arXiv (un ArxivDocument par <entry>) ---
+
+    def __init__(self):
+        # --- Nombre total de résultats annoncé par le flux (renseigné pendant le parcours) ---
+        self.total_resultats = None
+        self.nb_entrees = 0
+
+    def parser(self, source):
+        # --- Génère les ArxivDocument au fil de la lecture ---
+        # source : octets, chemin de fichier ou objet fichier (par ex. response.raw)
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        contexte = ET.iterparse(source, events=('start', 'end'))
+        racine = None
+        for evenement, elem in contexte:
+            if evenement == 'start':
+                if racine is None:
+                    racine = elem
+                continue
+            if elem.tag == ATOM + 'entry':
+                self.nb_entrees += 1
+                yield self.entree_vers_document(elem)
+                # Libérer les entrées déjà traitées : la mémoire reste constante
+                racine.clear()
+            elif elem.tag == OPENSEARCH + 'totalResults' and elem.text:
+                self.total_resultats = int(elem.text)
+
+    @staticmethod
+    def entree_vers_document(entry):
+        # --- Convertit un élément <entry> en ArxivDocument ---
+        # Textes débarrassés des blancs qui les entourent (indentation du flux, retour à la ligne
+        # final des résumés arXiv), comme le faisait xmltodict
+        summary = (AtomParser._texte(entry, 'summary') or '').replace('\n', ' ')
+        title = AtomParser._texte(entry, 'title') or 'arXiv entry'
+        date_pub = AtomParser._date(AtomParser._texte(entry, 'published'))
+        date_maj = AtomParser._date(AtomParser._texte(entry, 'updated'))
+        co_auteurs = [
+            nom for nom in (AtomParser._texte(a, 'name') for a in entry.iter(ATOM + 'author')) if nom
+        ]
+
+        # Premier auteur pour le champ auteur (compatibilité)
+        auteur = co_auteurs[0] if co_auteurs else 'arxiv'
+
+        # --- Utilisation de la Factory pour créer un ArxivDocument ---
+        url = AtomParser._texte(entry, 'id') or ''
+        return DocumentFactory.create_document(
+            source='arxiv',
+            titre=title,
+            auteur=auteur,
+            date=date_pub,
+            url=url,
+            texte=summary,
+            co_auteurs=co_auteurs,
+            # Sans version : une révision (v2) met à jour le document de la v1
+            id_source=ArxivDocument.id_depuis_url(url),
+            date_maj=date_maj
+        )
+
+    @staticmethod
+    def _texte(elem, balise):
+        # --- Texte de la balise Atom fille (sans les blancs qui l'entourent), None si absente ou vide ---
+        texte = elem.findtext(ATOM + balise)
+        if texte is None:
+            return None
+        return texte.strip() or None
+
+    @staticmethod
+    def _date(texte):
+        # --- Date Atom (UTC, ex. 2024-06-01T12:00:00Z) en datetime naïf UTC, None si absente ---
+        try:
+            return datetime.strptime(texte, "%Y-%m-%dT%H:%M:%SZ") if texte else None
+        except ValueError:
+            return None
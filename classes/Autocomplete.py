@@ -0,0 +1,91 @@
+from bisect import bisect_left
+
+import numpy as np
+
+
+class Autocomplete:
+    # --- Complétion de préfixes sur un vocabulaire trié, classée par fréquence en documents ---
+    # Les complétions d'un préfixe forment un intervalle du tableau trié (2 recherches dichotomiques).
+    # Pour les préfixes couvrant plus de `seuil` termes (les nœuds hauts du trie), la liste des
+    # k_max meilleurs termes est précalculée ; les petits intervalles sont triés à la volée.
+
+    def __init__(self, mots, frequences, k_max=10, seuil=256):
+        # --- Construit l'index ---
+        # mots : vocabulaire trié (ex. SearchEngine.mots)
+        # frequences : nombre de documents de chaque mot (même ordre)
+        # k_max : nombre de complétions précalculées par préfixe
+        # seuil : taille d'intervalle à partir de laquelle un préfixe est précalculé
+        self.mots = mots
+        self.frequences = np.asarray(frequences, dtype=np.int64)
+        self.k_max = k_max
+        self.seuil = seuil
+        # Préfixe -> ids des k_max mots les plus fréquents (par fréquence décroissante)
+        self.meilleurs = {}
+        self._precalculer('', 0, len(mots))
+
+    @classmethod
+    def depuis_moteur(cls, moteur, **kwargs):
+        # --- Index construit à partir du vocabulaire d'un SearchEngine ---
+        frequences = [moteur.vocab[mot]['nb_documents'] for mot in moteur.mots]
+        return cls(moteur.mots, frequences, **kwargs)
+
+    def _intervalle(self, prefixe, debut=0, fin=None):
+        fin = len(self.mots) if fin is None else fin
+        debut = bisect_left(self.mots, prefixe, debut, fin)
+        return debut, bisect_left(self.mots, prefixe + '\U0010ffff', debut, fin)
+
+    def _top(self, debut, fin, k):
+        # --- Ids des k mots les plus fréquents de [debut, fin) (ordre alphabétique en cas d'égalité) ---
+        frequences = self.frequences[debut:fin]
+        if fin - debut > k:
+            # k-ième plus grande fréquence : les ex aequo sont départagés par l'ordre alphabétique
+            kieme = np.partition(frequences, len(frequences) - k)[len(frequences) - k]
+            superieurs = np.flatnonzero(frequences > kieme)
+            egaux = np.flatnonzero(frequences == kieme)[:k - len(superieurs)]
+            candidats = np.concatenate([superieurs, egaux])
+        else:
+            candidats = np.arange(fin - debut)
+        ordre = np.lexsort((candidats, -frequences[candidats]))
+        return (debut + candidats[ordre]).astype(np.int32)
+
+    def _precalculer(self, racine, debut, fin):
+        # --- Parcours des nœuds du trie couvrant plus de `seuil` mots (pile explicite) ---
+        pile = [(racine, debut, fin)]
+        while pile:
+            prefixe, debut, fin = pile.pop()
+            if fin - debut <= self.seuil:
+                continue
+            self.meilleurs[prefixe] = self._top(debut, fin, self.k_max)
+            # Enfants : un sous-intervalle par caractère suivant le préfixe
+            position = debut
+            if len(self.mots[position]) == len(prefixe):
+                position += 1
+            while position < fin:
+                enfant = prefixe + self.mots[position][len(prefixe)]
+                _, fin_enfant = self._intervalle(enfant, position, fin)
+                pile.append((enfant, position, fin_enfant))
+                position = fin_enfant
+
+    def suggest(self, prefixe, k=5):
+        # --- Les k mots du vocabulaire commençant par `prefixe`, du plus fréquent au moins fréquent ---
+        prefixe = prefixe.lower()
+        if k <= self.k_max and prefixe in self.meilleurs:
+            ids = self.meilleurs[prefixe][:k]
+        else:
+            debut, fin = self._intervalle(prefixe)
+            if debut == fin:
+                return []
+            ids = self._top(debut, fin, k)
+        return [self.mots[i] for i in ids]
+
+    def completer_requete(self, texte, k=5):
+        # --- Complète le dernier mot d'une requête (saisie du widget) ---
+        # Renvoie les requêtes complètes proposées
+        if not texte or texte[-1].isspace():
+            return []
+        debut_requete, _, dernier = texte.rpartition(' ')
+        return [f"{debut_requete} {mot}".strip() for mot in self.suggest(dernier, k)]
+
+    def nb_octets(self):
+        # --- Taille des listes précalculées ---
+        return self.frequences.nbytes + sum(ids.nbytes for ids in self.meilleurs.values())
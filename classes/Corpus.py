@@ -2,13 +2,24 @@ import os
 import re
 import string
 import math
+import threading
 import numpy as np
 import pandas as pd
 from datetime import datetime
 from scipy.sparse import csr_matrix
 
+from classes.AhoCorasick import AhoCorasick
 from classes.Author import Author
-from classes.Document import Document
+from classes.Document import ArxivDocument, Document
+from classes.DocumentFactory import DocumentFactory
+from classes.IndexTrigrammes import IndexTrigrammes
+from classes.MinHashLSH import MinHashLSH
+
+
+# Politiques pour les quasi-doublons détectés à l'enregistrement :
+# 'supprimer' : le document n'est pas ajouté ; 'lier' : il est ajouté et lié à son document
+# canonique ; 'regrouper' : comme 'lier', et la recherche ne montre qu'un document par groupe
+POLITIQUES_QUASI_DOUBLONS = ('supprimer', 'lier', 'regrouper')
 
 
 class Corpus:
@@ -32,6 +43,29 @@ class Corpus:
             self.naut = 0
             self.next_doc_id = 1
             self.corpus_text = None
+            # Numéro de version incrémenté à chaque modification (clé des caches dérivés)
+            self.version = 0
+            # Index (type de source, id natif) -> doc_id pour détecter les doublons en O(1)
+            self.index_sources = {}
+            # Date du document le plus récent déjà récupéré, par source de crawl
+            # (ex. 'reddit:Basketball', 'arxiv:all:Basketball') pour le crawl incrémental
+            self.watermarks = {}
+            # doc_id d'une soumission -> doc_ids de ses commentaires
+            self.enfants = {}
+            # Détection des quasi-doublons (désactivée tant que configurer_quasi_doublons n'est pas appelé)
+            self.politique_quasi_doublons = None
+            self.lsh = None
+            # doc_id d'un quasi-doublon -> doc_id canonique, et doc_id canonique -> quasi-doublons
+            self.canonique = {}
+            self.quasi_doublons = {}
+            # Compteurs d'enregistrement (nouveaux / mis à jour / inchangés / quasi-doublons)
+            self.compteurs_enregistrement = {'nouveaux': 0, 'mis_a_jour': 0, 'inchanges': 0, 'quasi_doublons': 0}
+            # Index des trigrammes des textes (recherche par expression régulière), clé : version
+            self._cache_index_trigrammes = None
+            # Dernier automate d'Aho-Corasick construit (clé : mots-clés et sensibilité à la casse)
+            self._cache_automate = None
+            # Verrou des écritures (crawls exécutés en parallèle par CrawlScheduler)
+            self._verrou = threading.RLock()
             Corpus._initialized = True
     
     @classmethod
@@ -43,6 +77,28 @@ class Corpus:
 
     def register_document(self, doc, doc_id=None):
         # --- Ajoute un document et met à jour les auteurs ---
+        # Un document déjà connu (même id natif chez la même source) n'est pas ajouté une
+        # seconde fois : il est remplacé s'il a changé, ignoré sinon, et son id est renvoyé.
+        # Avec la détection des quasi-doublons, un document proche (Jaccard estimé >= seuil)
+        # d'un document déjà présent est supprimé ou lié à lui selon la politique choisie.
+        # Les écritures sont sérialisées : plusieurs threads peuvent enregistrer en même temps.
+        with self._verrou:
+            return self._register_document(doc, doc_id)
+
+    def _register_document(self, doc, doc_id=None):
+        cle = self.cle_source(doc)
+        if cle is not None and cle in self.index_sources:
+            return self._mettre_a_jour_document(self.index_sources[cle], doc)
+
+        signature, doublon = None, None
+        if self.lsh is not None:
+            signature = self.lsh.signature(self._mots_minhash(doc))
+            doublon = self.lsh.chercher(signature) if signature is not None else None
+            if doublon is not None:
+                self.compteurs_enregistrement['quasi_doublons'] += 1
+                if self.politique_quasi_doublons == 'supprimer':
+                    return doublon[0]
+
         if doc_id is None:
             doc_id = self.next_doc_id
             self.next_doc_id += 1
@@ -53,10 +109,148 @@ class Corpus:
         author = self.get_or_create_author(doc.auteur)
         author.add(doc_id, doc)
         self.naut = len(self.authors)
+        if cle is not None:
+            self.index_sources[cle] = doc_id
+        parent = getattr(doc, 'doc_id_soumission', None)
+        if parent is not None:
+            self.enfants.setdefault(parent, []).append(doc_id)
+        if doublon is not None:
+            self._lier_quasi_doublon(doc_id, doublon[0])
+        elif signature is not None:
+            # Seuls les documents canoniques sont indexés : un seau LSH contient un document par groupe
+            self.lsh.ajouter(doc_id, signature)
+        self.compteurs_enregistrement['nouveaux'] += 1
         # Invalider le cache de la chaîne concaténée ---
         self.corpus_text = None
+        self.version += 1
+        return doc_id
+
+    @staticmethod
+    def cle_source(doc):
+        # --- Clé de déduplication : (type de source, id natif), None si l'id natif est inconnu ---
+        id_source = getattr(doc, 'id_source', None)
+        if not id_source:
+            return None
+        return (doc.getType(), str(id_source))
+
+    @staticmethod
+    def _signature(doc):
+        # --- Champs comparés pour savoir si un document déjà connu a changé ---
+        return (doc.titre, doc.texte, doc.auteur, getattr(doc, 'nb_commentaires', None))
+
+    def est_inchange(self, doc):
+        # --- Indique si un document de même id natif est déjà présent avec le même contenu ---
+        cle = self.cle_source(doc)
+        if cle is None:
+            return False
+        with self._verrou:
+            doc_id = self.index_sources.get(cle)
+            return doc_id is not None and self._signature(self.id2doc[doc_id]) == self._signature(doc)
+
+    def _mettre_a_jour_document(self, doc_id, doc):
+        # --- Remplace un document déjà indexé s'il a changé ---
+        ancien = self.id2doc[doc_id]
+        if self._signature(ancien) == self._signature(doc):
+            self.compteurs_enregistrement['inchanges'] += 1
+            return doc_id
+        if ancien.auteur != doc.auteur:
+            ancien_auteur = self.get_or_create_author(ancien.auteur)
+            ancien_auteur.production.pop(doc_id, None)
+            ancien_auteur.ndoc = len(ancien_auteur.production)
+        self.id2doc[doc_id] = doc
+        self.get_or_create_author(doc.auteur).add(doc_id, doc)
+        self.naut = len(self.authors)
+        if self.lsh is not None and doc_id in self.lsh.signatures:
+            self.lsh.retirer(doc_id)
+            signature = self.lsh.signature(self._mots_minhash(doc))
+            if signature is not None:
+                self.lsh.ajouter(doc_id, signature)
+        self.compteurs_enregistrement['mis_a_jour'] += 1
+        self.corpus_text = None
+        self.version += 1
         return doc_id
 
+    def contains(self, doc):
+        # --- Indique si un document de même id natif est déjà dans le corpus ---
+        cle = self.cle_source(doc)
+        return cle is not None and cle in self.index_sources
+
+    def configurer_quasi_doublons(self, politique='lier', seuil=0.8, nb_permutations=128, nb_bandes=32,
+                                  taille_shingle=3):
+        # --- Active (ou désactive avec politique=None) la détection des quasi-doublons ---
+        # Les documents déjà présents sont indexés ; ceux qui sont proches d'un document
+        # précédent lui sont liés (ils ne sont jamais supprimés a posteriori).
+        if politique is None:
+            self.politique_quasi_doublons = None
+            self.lsh = None
+            return
+        if politique not in POLITIQUES_QUASI_DOUBLONS:
+            raise ValueError(f"Politique inconnue : '{politique}' (valeurs possibles : {POLITIQUES_QUASI_DOUBLONS})")
+        self.politique_quasi_doublons = politique
+        self.lsh = MinHashLSH(
+            nb_permutations=nb_permutations, nb_bandes=nb_bandes, taille_shingle=taille_shingle, seuil=seuil
+        )
+        self._indexer_quasi_doublons()
+
+    def _indexer_quasi_doublons(self):
+        # --- Insère les documents existants dans l'index LSH (en liant les quasi-doublons) ---
+        for doc_id, doc in self.id2doc.items():
+            if doc_id in self.canonique or doc_id in self.lsh.signatures:
+                continue
+            signature = self.lsh.signature(self._mots_minhash(doc))
+            if signature is None:
+                continue
+            doublon = self.lsh.chercher(signature)
+            if doublon is not None:
+                self._lier_quasi_doublon(doc_id, doublon[0])
+            else:
+                self.lsh.ajouter(doc_id, signature)
+
+    def _mots_minhash(self, doc):
+        # --- Mots servant aux shingles : le texte, ou le titre si le texte est vide (liens Reddit) ---
+        return self.nettoyer_texte(doc.texte or doc.titre or '').split()
+
+    def _lier_quasi_doublon(self, doc_id, doc_id_canonique):
+        self.canonique[doc_id] = doc_id_canonique
+        self.quasi_doublons.setdefault(doc_id_canonique, []).append(doc_id)
+        # Les groupes de la recherche dépendent des liens
+        self.version += 1
+
+    def get_canonique(self, doc_id):
+        # --- doc_id du document canonique du groupe (le document lui-même s'il n'est lié à aucun) ---
+        return self.canonique.get(doc_id, doc_id)
+
+    def get_quasi_doublons(self, doc_id):
+        # --- Documents liés au même document canonique (hors document canonique) ---
+        return [self.id2doc[autre] for autre in self.quasi_doublons.get(self.get_canonique(doc_id), [])]
+
+    def get_commentaires(self, doc_id):
+        # --- Documents commentaires rattachés à une soumission ---
+        return [self.id2doc[enfant] for enfant in self.enfants.get(doc_id, [])]
+
+    def update_watermark(self, source, date):
+        # --- Avance le watermark d'une source (il ne recule jamais) ---
+        if not isinstance(date, datetime):
+            return
+        with self._verrou:
+            courant = self.watermarks.get(source)
+            if courant is None or date > courant:
+                self.watermarks[source] = date
+
+    def get_watermark(self, source):
+        # --- Date du document le plus récent de la source (None si aucun) ---
+        return self.watermarks.get(source)
+
+    def register_documents(self, docs, compter=False):
+        # --- Ajoute un lot de documents et renvoie la liste de leurs ids ---
+        # compter : renvoie (doc_ids, nombre de documents nouveaux ou mis à jour par ce lot) ;
+        # le lot est enregistré sous le verrou, les lots d'autres threads ne sont pas comptés
+        with self._verrou:
+            avant = self.compteurs_enregistrement['nouveaux'] + self.compteurs_enregistrement['mis_a_jour']
+            doc_ids = [self.register_document(doc) for doc in docs]
+            nb_modifies = self.compteurs_enregistrement['nouveaux'] + self.compteurs_enregistrement['mis_a_jour'] - avant
+        return (doc_ids, nb_modifies) if compter else doc_ids
+
     def get_or_create_author(self, name):
         # --- Retourne un auteur existant ou l'initialise ---
         if not name:
@@ -123,8 +317,32 @@ class Corpus:
             )
         return self.corpus_text
     
-    def search(self, mot_cle):
+    def index_trigrammes(self):
+        # --- Index des trigrammes des textes (construit à la demande, reconstruit si le corpus a changé) ---
+        # Renvoie (doc_ids dans l'ordre des lignes de l'index, index)
+        if self._cache_index_trigrammes is None or self._cache_index_trigrammes[0] != self.version:
+            doc_ids = list(self.id2doc.keys())
+            index = IndexTrigrammes(doc.texte for doc in self.id2doc.values())
+            self._cache_index_trigrammes = (self.version, doc_ids, index)
+        return self._cache_index_trigrammes[1], self._cache_index_trigrammes[2]
+    
+    def _correspondances_regex(self, expression):
+        # --- (doc_id, texte, match) des correspondances d'une expression régulière (insensible à la casse) ---
+        # Seuls les documents candidats de l'index des trigrammes sont parcourus
+        doc_ids, index = self.index_trigrammes()
+        for ligne, match in index.correspondances(re.compile(expression, re.IGNORECASE)):
+            yield doc_ids[ligne], index.textes[ligne], match
+    
+    def search(self, mot_cle, regex=False):
         # --- Recherche les passages contenant le mot-clé dans le corpus ---
+        # regex : mot_cle est une expression régulière, cherchée dans chaque document candidat
+        #         de l'index des trigrammes (au lieu d'un parcours complet du texte concaténé)
+        if regex:
+            return [
+                texte[max(0, match.start() - 50):match.end() + 50]
+                for _, texte, match in self._correspondances_regex(mot_cle)
+            ]
+        
         # Construit la chaîne concaténée si nécessaire (une seule fois)
         corpus_text = self.build_corpus_text()
         
@@ -144,8 +362,67 @@ class Corpus:
         
         return matches
     
-    def concorde(self, expression, taille_contexte=30):
+    def automate_mots_cles(self, mots_cles, ignorer_casse=True):
+        # --- Automate d'Aho-Corasick des mots-clés (réutilisé tant que l'ensemble ne change pas) ---
+        cle = (tuple(mots_cles), ignorer_casse)
+        if self._cache_automate is None or self._cache_automate[0] != cle:
+            self._cache_automate = (cle, AhoCorasick(mots_cles, ignorer_casse=ignorer_casse))
+        return self._cache_automate[1]
+    
+    def compter_mots_cles(self, mots_cles, mots_entiers=False):
+        # --- Occurrences de plusieurs mots-clés, en une seule passe sur les documents ---
+        # Renvoie un DataFrame (mot-clé, id, occurrences) : une ligne par mot-clé et document où il apparaît
+        # mots_entiers : ignorer les occurrences à l'intérieur d'un mot (war dans software)
+        automate = self.automate_mots_cles(mots_cles)
+        lignes = []
+        for doc_id, doc in self.id2doc.items():
+            if doc.texte:
+                for indice, nb in automate.compter(doc.texte, mots_entiers).items():
+                    lignes.append((automate.motifs[indice], doc_id, nb))
+        df = pd.DataFrame(lignes, columns=['mot-clé', 'id', 'occurrences'])
+        return df.sort_values(['mot-clé', 'id'], ignore_index=True)
+    
+    def _concorde_multiple(self, expressions, taille_contexte=30):
+        # --- Concordancier de plusieurs expressions : une passe d'Aho-Corasick par document ---
+        automate = self.automate_mots_cles(expressions)
+        resultats = []
+        for doc_id, doc in self.id2doc.items():
+            texte = doc.texte
+            if not texte:
+                continue
+            for debut, fin, indice in automate.rechercher(texte):
+                resultats.append({
+                    'expression': automate.motifs[indice],
+                    'contexte gauche': texte[max(0, debut - taille_contexte):debut],
+                    'motif trouvé': texte[debut:fin],
+                    'contexte droit': texte[fin:fin + taille_contexte],
+                    'id': doc_id
+                })
+        return pd.DataFrame(
+            resultats, columns=['expression', 'contexte gauche', 'motif trouvé', 'contexte droit', 'id']
+        )
+    
+    def concorde(self, expression, taille_contexte=30, regex=False):
         # --- Construit un concordancier pour une expression donnée ---
+        # expression : une chaîne, ou une liste d'expressions cherchées en une seule passe (automate
+        #              d'Aho-Corasick) ; une colonne 'expression' indique alors l'expression trouvée
+        # regex : expression régulière quelconque, exécutée uniquement sur les documents candidats
+        #         de l'index des trigrammes ; les contextes s'arrêtent aux bornes du document et
+        #         une colonne 'id' donne le document de chaque occurrence
+        if isinstance(expression, (list, tuple, set)):
+            return self._concorde_multiple(expression, taille_contexte)
+        if regex:
+            resultats = [
+                {
+                    'contexte gauche': texte[max(0, match.start() - taille_contexte):match.start()],
+                    'motif trouvé': match.group(),
+                    'contexte droit': texte[match.end():match.end() + taille_contexte],
+                    'id': doc_id
+                }
+                for doc_id, texte, match in self._correspondances_regex(expression)
+            ]
+            return pd.DataFrame(resultats, columns=['contexte gauche', 'motif trouvé', 'contexte droit', 'id'])
+        
         # Construit la chaîne concaténée si nécessaire (une seule fois)
         corpus_text = self.build_corpus_text()
         
@@ -280,16 +557,46 @@ class Corpus:
                 'url': doc.url,
                 'texte': doc.texte
             }
+            if doc.id_source:
+                doc_data['id_source'] = doc.id_source
             # Ajouter les attributs spécifiques des sous-classes
             if hasattr(doc, 'nb_commentaires'):
                 doc_data['nb_commentaires'] = doc.nb_commentaires
             if hasattr(doc, 'co_auteurs'):
                 doc_data['co_auteurs'] = doc.co_auteurs
+            if getattr(doc, 'date_maj', None) is not None:
+                doc_data['date_maj'] = self.format_date_for_csv(doc.date_maj)
+            if hasattr(doc, 'id_parent_source'):
+                doc_data['id_parent_source'] = doc.id_parent_source
+                doc_data['id_soumission'] = doc.id_soumission
+                doc_data['doc_id_soumission'] = doc.doc_id_soumission
+                doc_data['profondeur'] = doc.profondeur
+            if doc_id in self.canonique:
+                doc_data['doc_id_canonique'] = self.canonique[doc_id]
             data['documents'][str(doc_id)] = doc_data
-        with open(path, 'w', encoding='utf-8') as f:
+        data['watermarks'] = {
+            source: self.format_date_for_csv(date) for source, date in self.watermarks.items()
+        }
+        # Écriture dans un fichier temporaire puis remplacement : un arrêt pendant la
+        # sauvegarde ne laisse jamais un corpus.json tronqué
+        temporaire = f"{path}.tmp"
+        with open(temporaire, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temporaire, path)
         print(f"Corpus sauvegardé dans '{path}' ({self.ndoc} documents).")
 
+    @staticmethod
+    def _id_source_depuis_url(doc_data):
+        # --- Retrouve l'id natif des documents sauvegardés avant l'ajout du champ id_source ---
+        source = str(doc_data.get('source', '')).lower()
+        url = doc_data.get('url') or ''
+        if source == 'arxiv':
+            return ArxivDocument.id_depuis_url(url)
+        if source == 'reddit':
+            match = re.search(r'/comments/([a-z0-9]+)/', url)
+            return match.group(1) if match else None
+        return None
+
     def load(self, path='corpus.json'):
         # --- Charge le corpus depuis le disque dur en format JSON ---
         if not os.path.exists(path):
@@ -300,17 +607,39 @@ class Corpus:
         with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         self.nom = data.get('nom', self.nom)
+        # Les liens de quasi-doublons sont relus tels quels (pas de détection pendant le chargement)
+        lsh, self.lsh = self.lsh, None
         for doc_id_str, doc_data in data['documents'].items():
             doc_id = int(doc_id_str)
             date_value = self.parse_date(doc_data.get('date'))
-            doc = Document(
+            id_source = doc_data.get('id_source') or self._id_source_depuis_url(doc_data)
+            if str(doc_data.get('source', '')).lower() == 'arxiv':
+                # Sauvegardes antérieures : id arXiv avec numéro de version (URL de l'entrée)
+                id_source = ArxivDocument.id_depuis_url(id_source)
+            # --- Utilisation de la Factory pour retrouver le type de document d'origine ---
+            doc = DocumentFactory.create_document(
+                source=doc_data.get('source', 'inconnu'),
                 titre=doc_data.get('titre', ''),
                 auteur=doc_data.get('auteur', 'inconnu'),
-                source=doc_data.get('source', 'inconnu'),
                 date=date_value,
                 url=doc_data.get('url', ''),
-                texte=doc_data.get('texte', '')
+                texte=doc_data.get('texte', ''),
+                nb_commentaires=doc_data.get('nb_commentaires', 0),
+                co_auteurs=doc_data.get('co_auteurs'),
+                id_parent_source=doc_data.get('id_parent_source'),
+                id_soumission=doc_data.get('id_soumission'),
+                profondeur=doc_data.get('profondeur', 0),
+                doc_id_soumission=doc_data.get('doc_id_soumission'),
+                date_maj=self.parse_date(doc_data.get('date_maj')),
+                id_source=id_source
             )
             self.register_document(doc, doc_id=doc_id)
+            if doc_data.get('doc_id_canonique') is not None:
+                self._lier_quasi_doublon(doc_id, doc_data['doc_id_canonique'])
+        self.lsh = lsh
+        if self.lsh is not None:
+            self._indexer_quasi_doublons()
+        for source, date in data.get('watermarks', {}).items():
+            self.update_watermark(source, self.parse_date(date))
         print(f"Corpus chargé depuis '{path}' ({self.ndoc} documents, {self.naut} auteurs).")
         return True
@@ -0,0 +1,83 @@
+class CorrecteurOrthographique:
+    # --- Correction orthographique par suppressions symétriques (principe de SymSpell) ---
+    # Chaque mot du vocabulaire est indexé sous toutes les chaînes obtenues en lui retirant jusqu'à
+    # distance_max lettres (sur ses longueur_prefixe premières lettres). Un mot inconnu génère ses
+    # propres suppressions : les candidats sont les mots qui partagent l'une d'elles, puis la vraie
+    # distance d'édition est vérifiée. Le coût d'une recherche ne dépend pas de la taille du vocabulaire.
+
+    def __init__(self, mots, frequences, distance_max=2, longueur_prefixe=7):
+        # --- Construit l'index des suppressions ---
+        # mots / frequences : vocabulaire et nombre d'occurrences de chaque mot dans le corpus
+        # distance_max : distance d'édition maximale d'une correction
+        # longueur_prefixe : seules les premières lettres sont indexées (mémoire bornée pour les mots longs)
+        self.mots = list(mots)
+        self.frequences = dict(zip(self.mots, (int(f) for f in frequences)))
+        self.distance_max = distance_max
+        self.longueur_prefixe = longueur_prefixe
+        self.suppressions = {}
+        for idx, mot in enumerate(self.mots):
+            for suppression in self._suppressions(mot[:longueur_prefixe]):
+                self.suppressions.setdefault(suppression, []).append(idx)
+
+    @classmethod
+    def depuis_moteur(cls, moteur, **kwargs):
+        # --- Correcteur construit à partir du vocabulaire d'un SearchEngine ---
+        frequences = [moteur.vocab[mot]['nb_occurrences'] for mot in moteur.mots]
+        return cls(moteur.mots, frequences, **kwargs)
+
+    def _suppressions(self, mot):
+        # --- Le mot et toutes les chaînes obtenues en retirant au plus distance_max lettres ---
+        resultat = {mot}
+        courantes = {mot}
+        for _ in range(self.distance_max):
+            suivantes = set()
+            for chaine in courantes:
+                if len(chaine) > 1:
+                    suivantes.update(chaine[:i] + chaine[i + 1:] for i in range(len(chaine)))
+            resultat |= suivantes
+            courantes = suivantes
+        return resultat
+
+    @staticmethod
+    def distance(a, b, borne):
+        # --- Distance de Damerau-Levenshtein restreinte (transpositions adjacentes) ---
+        # Renvoie borne + 1 dès que la distance dépasse borne
+        if abs(len(a) - len(b)) > borne:
+            return borne + 1
+        precedente_2 = None
+        precedente = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            courante = [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                cout = 0 if a[i - 1] == b[j - 1] else 1
+                courante[j] = min(precedente[j] + 1, courante[j - 1] + 1, precedente[j - 1] + cout)
+                if (precedente_2 is not None and i > 1 and j > 1
+                        and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                    courante[j] = min(courante[j], precedente_2[j - 2] + 1)
+            if min(courante) > borne:
+                return borne + 1
+            precedente_2, precedente = precedente, courante
+        return precedente[-1]
+
+    def suggestions(self, mot, k=5, distance_max=None):
+        # --- Corrections possibles : liste de (mot, distance, fréquence), la plus probable d'abord ---
+        # Classement : distance croissante, puis fréquence décroissante dans le corpus
+        distance_max = self.distance_max if distance_max is None else min(distance_max, self.distance_max)
+        if mot in self.frequences:
+            return [(mot, 0, self.frequences[mot])]
+        candidats = set()
+        for suppression in self._suppressions(mot[:self.longueur_prefixe]):
+            candidats.update(self.suppressions.get(suppression, ()))
+        resultats = []
+        for idx in candidats:
+            candidat = self.mots[idx]
+            d = self.distance(mot, candidat, distance_max)
+            if d <= distance_max:
+                resultats.append((candidat, d, self.frequences[candidat]))
+        resultats.sort(key=lambda resultat: (resultat[1], -resultat[2], resultat[0]))
+        return resultats[:k]
+
+    def corriger(self, mot):
+        # --- Meilleure correction du mot (None si aucune à distance <= distance_max) ---
+        suggestions = self.suggestions(mot, k=1)
+        return suggestions[0][0] if suggestions else None
@@ -0,0 +1,246 @@
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from classes.RateLimiter import TokenBucket
+
+
+class HorlogeSysteme:
+    # --- Horloge réelle ---
+    simulee = False
+
+    def maintenant(self):
+        return time.monotonic()
+
+    def dormir(self, duree):
+        if duree > 0:
+            time.sleep(duree)
+
+
+class HorlogeSimulee:
+    # --- Horloge simulée pour les tests : dormir() avance le temps instantanément ---
+    simulee = True
+
+    def __init__(self, debut=0.0):
+        self.temps = debut
+
+    def maintenant(self):
+        return self.temps
+
+    def dormir(self, duree):
+        if duree > 0:
+            self.temps += duree
+
+
+class SourceCrawl:
+    # --- Une source à garder à jour (subreddit, requête arXiv...) ---
+
+    def __init__(self, nom, api, recuperer, taux_initial=1 / 600, intervalle_min=60, intervalle_max=6 * 3600):
+        # --- Paramètre la source ---
+        # api : nom de l'API (les sources d'une même API partagent le même seau à jetons)
+        # recuperer : fonction sans argument qui interroge la source et renvoie le nombre de
+        #             nouveaux éléments (ou la liste des nouveaux éléments)
+        # taux_initial : estimation a priori du nombre de nouveaux éléments par seconde
+        # intervalle_min / intervalle_max : bornes (s) entre deux crawls réussis
+        self.nom = nom
+        self.api = api
+        self.recuperer = recuperer
+        self.taux = taux_initial
+        self.intervalle_min = intervalle_min
+        self.intervalle_max = intervalle_max
+        self.dernier_crawl = None
+        self.echeance = 0.0
+        self.tentatives = 0
+        self.stats = {'nb_requetes': 0, 'nb_items': 0, 'nb_erreurs': 0}
+
+    @staticmethod
+    def reddit(crawler, subreddit, limite=100, **kwargs):
+        # --- Source Reddit : listing 'new' incrémental d'un subreddit (RedditCrawler) ---
+        def recuperer():
+            return len(crawler.crawler([subreddit], listings=('new',), limite=limite, incremental=True))
+        return SourceCrawl(f"reddit:{subreddit}", 'reddit', recuperer, **kwargs)
+
+    @staticmethod
+    def arxiv(fetcher, corpus, query, max_results=100, taille_page=50, **kwargs):
+        # --- Source arXiv : requête incrémentale (ArxivFetcher) ---
+        def recuperer():
+            return fetcher.mettre_a_jour_corpus(corpus, query, max_results=max_results, taille_page=taille_page)
+        return SourceCrawl(f"arxiv:{query}", 'arxiv', recuperer, **kwargs)
+
+    def items_attendus(self, maintenant):
+        # --- Nombre de nouveaux éléments attendus : taux estimé x ancienneté ---
+        if self.dernier_crawl is None:
+            return float('inf')
+        return self.taux * (maintenant - self.dernier_crawl)
+
+    def __repr__(self):
+        return f"SourceCrawl('{self.nom}', api='{self.api}', taux={self.taux:.4g}/s)"
+
+
+class CrawlScheduler:
+    # --- Ordonnanceur de crawl : file de priorité des sources, seaux à jetons par API, retries ---
+
+    def __init__(self, limites_api=None, nb_workers=4, objectif_items=10, lissage=0.3,
+                 backoff_initial=30, backoff_max=3600, max_tentatives=5, horloge=None):
+        # --- Paramètre l'ordonnanceur ---
+        # limites_api : {api: (capacite, jetons_par_seconde)} ; une API absente n'est pas limitée
+        # nb_workers : nombre de crawls simultanés (0 = exécution dans le thread courant)
+        # objectif_items : nombre de nouveaux éléments visé par crawl (fixe l'intervalle entre crawls)
+        # lissage : poids de la dernière observation dans l'estimation du taux (moyenne exponentielle)
+        # backoff_initial / backoff_max / max_tentatives : retries exponentiels après une erreur
+        self.horloge = horloge if horloge is not None else HorlogeSysteme()
+        self.seaux = {
+            api: TokenBucket(capacite, debit, horloge=self.horloge.maintenant)
+            for api, (capacite, debit) in (limites_api or {}).items()
+        }
+        self.nb_workers = nb_workers
+        self.objectif_items = objectif_items
+        self.lissage = lissage
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.max_tentatives = max_tentatives
+        self.sources = {}
+        self._file = []
+        self._compteur = itertools.count()
+        self.metriques = {
+            'nb_lancements': 0, 'nb_requetes': 0, 'nb_items': 0, 'nb_erreurs': 0, 'nb_retries': 0,
+            'retard_total': 0.0, 'retard_max': 0.0,
+        }
+
+    def ajouter_source(self, source, echeance=None):
+        # --- Ajoute une source ; elle est due immédiatement par défaut ---
+        self.sources[source.nom] = source
+        source.echeance = self.horloge.maintenant() if echeance is None else echeance
+        self._planifier(source)
+
+    def _planifier(self, source):
+        # --- File de priorité sur l'échéance (départagée par le nombre d'éléments attendus au lancement) ---
+        heapq.heappush(self._file, (source.echeance, next(self._compteur), source.nom))
+
+    def _prochaine_source(self):
+        # --- Renvoie (source, délai) : la source à lancer maintenant, ou le délai avant la prochaine ---
+        maintenant = self.horloge.maintenant()
+        dues = []
+        while self._file and self._file[0][0] <= maintenant:
+            dues.append(heapq.heappop(self._file))
+        # Délai avant la prochaine source non encore due
+        delai = (self._file[0][0] - maintenant) if self._file else None
+        if not dues:
+            return None, delai
+
+        # Parmi les sources dues, la plus prometteuse dont l'API a un jeton disponible
+        dues.sort(key=lambda entree: -self.sources[entree[2]].items_attendus(maintenant))
+        choisie = None
+        for entree in dues:
+            source = self.sources[entree[2]]
+            seau = self.seaux.get(source.api)
+            if choisie is None and (seau is None or seau.prendre()):
+                choisie = source
+                continue
+            heapq.heappush(self._file, entree)
+            if seau is not None:
+                attente = seau.delai_avant()
+                delai = attente if delai is None else min(delai, attente)
+        return choisie, delai
+
+    def _crawler(self, source):
+        # --- Exécute un crawl (dans un worker) : renvoie (nb_items, erreur) ---
+        try:
+            resultat = source.recuperer()
+            return (resultat if isinstance(resultat, int) else len(resultat)), None
+        except Exception as erreur:
+            return 0, erreur
+
+    def _terminer(self, source, debut, nb_items, erreur):
+        # --- Met à jour les estimations de la source et la replanifie ---
+        maintenant = self.horloge.maintenant()
+        source.stats['nb_requetes'] += 1
+        self.metriques['nb_requetes'] += 1
+        if erreur is not None:
+            source.stats['nb_erreurs'] += 1
+            self.metriques['nb_erreurs'] += 1
+            source.tentatives += 1
+            if source.tentatives < self.max_tentatives:
+                # Backoff exponentiel
+                self.metriques['nb_retries'] += 1
+                source.echeance = maintenant + min(
+                    self.backoff_max, self.backoff_initial * 2 ** (source.tentatives - 1)
+                )
+            else:
+                # Abandon : retour au rythme normal de la source
+                source.tentatives = 0
+                source.echeance = maintenant + source.intervalle_max
+            self._planifier(source)
+            return
+
+        source.tentatives = 0
+        source.stats['nb_items'] += nb_items
+        self.metriques['nb_items'] += nb_items
+        if source.dernier_crawl is not None:
+            duree = max(debut - source.dernier_crawl, 1e-9)
+            source.taux = self.lissage * (nb_items / duree) + (1 - self.lissage) * source.taux
+        source.dernier_crawl = debut
+
+        # Prochain crawl quand objectif_items nouveaux éléments sont attendus
+        intervalle = self.objectif_items / source.taux if source.taux > 0 else source.intervalle_max
+        source.echeance = maintenant + min(source.intervalle_max, max(source.intervalle_min, intervalle))
+        self._planifier(source)
+
+    def executer(self, duree=None, max_requetes=None):
+        # --- Fait tourner l'ordonnanceur pendant `duree` secondes ou `max_requetes` crawls ---
+        fin = None if duree is None else self.horloge.maintenant() + duree
+        pool = ThreadPoolExecutor(max_workers=self.nb_workers) if self.nb_workers > 0 else None
+        en_cours = {}
+        lances = 0
+        try:
+            while True:
+                maintenant = self.horloge.maintenant()
+                arret = (fin is not None and maintenant >= fin) or (max_requetes is not None and lances >= max_requetes)
+
+                # Lancer les sources dues tant qu'il y a des workers libres
+                source, delai = (None, None)
+                if not arret and (pool is None or len(en_cours) < self.nb_workers):
+                    source, delai = self._prochaine_source()
+                if source is not None:
+                    retard = max(0.0, maintenant - source.echeance)
+                    self.metriques['retard_total'] += retard
+                    self.metriques['retard_max'] = max(self.metriques['retard_max'], retard)
+                    self.metriques['nb_lancements'] += 1
+                    lances += 1
+                    if pool is None:
+                        self._terminer(source, maintenant, *self._crawler(source))
+                    else:
+                        en_cours[pool.submit(self._crawler, source)] = (source, maintenant)
+                    continue
+
+                if arret and not en_cours:
+                    break
+                if en_cours:
+                    # Attendre la fin d'un crawl (ou la prochaine échéance avec une horloge réelle)
+                    timeout = None if self.horloge.simulee or delai is None else delai
+                    termines, _ = wait(list(en_cours), timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in termines:
+                        source_terminee, debut = en_cours.pop(future)
+                        self._terminer(source_terminee, debut, *future.result())
+                    continue
+                if delai is None:
+                    break
+                if fin is not None:
+                    delai = min(delai, fin - maintenant)
+                self.horloge.dormir(delai)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        return self.rapport()
+
+    def rapport(self):
+        # --- Métriques globales : éléments par requête, retard de la file ---
+        nb = self.metriques['nb_requetes']
+        nb_lancements = self.metriques['nb_lancements']
+        return {
+            **self.metriques,
+            'items_par_requete': self.metriques['nb_items'] / nb if nb else 0.0,
+            'retard_moyen': self.metriques['retard_total'] / nb_lancements if nb_lancements else 0.0,
+            'taille_file': len(self._file),
+        }
@@ -0,0 +1,162 @@
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from tqdm import tqdm
+
+from classes.Document import Document
+
+
+COLONNES_DISCOURS = ['speaker', 'text', 'date', 'descr', 'link']
+
+
+def decouper_en_phrases(texte):
+    # --- Découpe un texte en phrases (fin de phrase : . ! ou ? suivi d'une majuscule ou de la fin) ---
+    if not texte or pd.isna(texte):
+        return []
+
+    # Pattern pour détecter les fins de phrases : . ! ou ? suivi d'un espace ou d'une majuscule
+    pattern = r'([.!?])\s+([A-Z])|([.!?])\s*$'
+
+    # On remplace les fins de phrases par un marqueur spécial
+    texte_marque = re.sub(pattern, r'\1\3|||SEPARATEUR|||\2', str(texte))
+
+    # On découpe sur le marqueur
+    phrases = [p.strip() for p in texte_marque.split('|||SEPARATEUR|||') if p.strip()]
+
+    # Nettoyage / on s'assure que chaque phrase se termine bien par un point
+    phrases_nettoyees = []
+    for phrase in phrases:
+        phrase = phrase.strip()
+        if phrase:
+            if not re.search(r'[.!?]$', phrase):
+                phrase += '.'
+            phrases_nettoyees.append(phrase)
+
+    return phrases_nettoyees
+
+
+def _valeur(value):
+    # --- Remplace les NaN pandas par None ---
+    return None if value is None or (isinstance(value, float) and pd.isna(value)) else value
+
+
+def segmenter_chunk(lignes, offset):
+    # --- Découpe un bloc de discours en phrases (exécuté dans un processus du pool) ---
+    # lignes : liste de tuples (speaker, text, date, descr, link)
+    # offset : index global du premier discours du bloc (pour les titres)
+    # Renvoie (nb_discours_traites, liste de tuples (titre, auteur, date, url, texte))
+    phrases_chunk = []
+    nb_discours = 0
+    for position, (speaker, texte, date, descr, link) in enumerate(lignes):
+        phrases = decouper_en_phrases(_valeur(texte))
+        if not phrases:
+            continue
+        nb_discours += 1
+        idx = offset + position
+        descr = _valeur(descr)
+        for phrase_idx, phrase_texte in enumerate(phrases):
+            titre = f"{descr} - Phrase {phrase_idx + 1}" if descr else f"Discours {idx + 1} - Phrase {phrase_idx + 1}"
+            phrases_chunk.append((titre, _valeur(speaker), _valeur(date), _valeur(link), phrase_texte))
+    return nb_discours, phrases_chunk
+
+
+class DiscoursIngestion:
+    # --- Ingestion en flux du jeu de données discours_US.csv (une phrase = un Document) ---
+
+    def __init__(self, corpus, taille_chunk=500, nb_workers=None, max_chunks_en_vol=None,
+                 source="Discours US"):
+        # --- Paramètre le pipeline ---
+        # taille_chunk : nombre de discours lus à la fois dans le fichier
+        # nb_workers : nombre de processus de découpage (0 = découpage dans le processus courant)
+        # max_chunks_en_vol : nombre maximal de blocs lus mais pas encore enregistrés (mémoire bornée)
+        self.corpus = corpus
+        self.taille_chunk = taille_chunk
+        self.nb_workers = nb_workers
+        self.max_chunks_en_vol = max_chunks_en_vol if max_chunks_en_vol else 2 * (nb_workers or 4)
+        self.source = source
+        self.metriques = {}
+
+    def ingerer(self, chemin='discours_US.csv', afficher_progression=True):
+        # --- Lit le fichier par blocs, découpe en parallèle et enregistre les phrases par lots ---
+        self.metriques = {
+            'nb_chunks': 0,
+            'nb_lignes': 0,
+            'nb_discours': 0,
+            'nb_phrases': 0,
+            'duree_lecture': 0.0,
+            'duree_enregistrement': 0.0,
+            'duree_totale': 0.0,
+        }
+        debut = time.perf_counter()
+        progression = tqdm(desc="Ingestion des discours", unit="discours", disable=not afficher_progression)
+
+        lecteur = pd.read_csv(
+            chemin, sep='\t', quotechar='"', usecols=COLONNES_DISCOURS,
+            chunksize=self.taille_chunk, dtype=str, keep_default_na=False
+        )
+        en_vol = deque()
+        try:
+            if self.nb_workers == 0:
+                for lignes, offset in self._lire_chunks(lecteur):
+                    self._enregistrer(segmenter_chunk(lignes, offset), len(lignes), progression)
+            else:
+                with ProcessPoolExecutor(max_workers=self.nb_workers) as pool:
+                    for lignes, offset in self._lire_chunks(lecteur):
+                        # Attendre le bloc le plus ancien si trop de blocs sont en cours (mémoire bornée)
+                        while len(en_vol) >= self.max_chunks_en_vol:
+                            future, nb_lignes = en_vol.popleft()
+                            self._enregistrer(future.result(), nb_lignes, progression)
+                        en_vol.append((pool.submit(segmenter_chunk, lignes, offset), len(lignes)))
+                    # Les blocs sont enregistrés dans l'ordre de lecture (ids déterministes)
+                    while en_vol:
+                        future, nb_lignes = en_vol.popleft()
+                        self._enregistrer(future.result(), nb_lignes, progression)
+        finally:
+            progression.close()
+
+        duree = time.perf_counter() - debut
+        self.metriques['duree_totale'] = duree
+        self.metriques['phrases_par_seconde'] = self.metriques['nb_phrases'] / duree if duree > 0 else 0.0
+        self.metriques['discours_par_seconde'] = self.metriques['nb_lignes'] / duree if duree > 0 else 0.0
+        return self.metriques
+
+    def _lire_chunks(self, lecteur):
+        # --- Génère les blocs du fichier sous forme de listes de tuples ---
+        offset = 0
+        while True:
+            debut = time.perf_counter()
+            chunk = next(lecteur, None)
+            self.metriques['duree_lecture'] += time.perf_counter() - debut
+            if chunk is None:
+                return
+            lignes = list(chunk[COLONNES_DISCOURS].itertuples(index=False, name=None))
+            yield lignes, offset
+            offset += len(lignes)
+
+    def _enregistrer(self, resultat, nb_lignes, progression):
+        # --- Crée les Documents d'un bloc et les ajoute au corpus en un seul lot ---
+        nb_discours, phrases = resultat
+        debut = time.perf_counter()
+        documents = [
+            Document(
+                titre=titre,
+                auteur=auteur,
+                source=self.source,
+                date=date,
+                url=url,
+                texte=texte
+            )
+            for titre, auteur, date, url, texte in phrases
+        ]
+        self.corpus.register_documents(documents)
+        self.metriques['duree_enregistrement'] += time.perf_counter() - debut
+
+        self.metriques['nb_chunks'] += 1
+        self.metriques['nb_lignes'] += nb_lignes
+        self.metriques['nb_discours'] += nb_discours
+        self.metriques['nb_phrases'] += len(documents)
+        progression.update(nb_lignes)
+        progression.set_postfix(phrases=self.metriques['nb_phrases'])
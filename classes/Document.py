@@ -1,11 +1,16 @@
+import re
+
+
 class Document:
-    def __init__(self, titre, auteur, source, date, url, texte):
+    def __init__(self, titre, auteur, source, date, url, texte, id_source=None):
         self.titre = titre
         self.auteur = auteur
         self.source = source
         self.date = date
         self.url = url
         self.texte = texte
+        # Identifiant natif chez la source (id du post Reddit, id de l'entrée arXiv)
+        self.id_source = id_source
     
     def afficher_infos(self):
         print(f"Titre : {self.titre}")
@@ -23,8 +28,8 @@ class Document:
 
 
 class RedditDocument(Document):
-    def __init__(self, titre, auteur, source, date, url, texte, nb_commentaires=0):
-        super().__init__(titre, auteur, source, date, url, texte)
+    def __init__(self, titre, auteur, source, date, url, texte, nb_commentaires=0, id_source=None):
+        super().__init__(titre, auteur, source, date, url, texte, id_source)
         self.nb_commentaires = nb_commentaires
     
     def get_nb_commentaires(self):
@@ -40,10 +45,38 @@ class RedditDocument(Document):
         return "Reddit"
 
 
+class RedditCommentDocument(RedditDocument):
+    def __init__(self, titre, auteur, source, date, url, texte, nb_commentaires=0, id_source=None,
+                 id_parent_source=None, id_soumission=None, profondeur=0, doc_id_soumission=None):
+        super().__init__(titre, auteur, source, date, url, texte, nb_commentaires, id_source)
+        # Fullname Reddit du parent (t3_... pour la soumission, t1_... pour un commentaire)
+        self.id_parent_source = id_parent_source
+        # Id natif de la soumission et id du document correspondant dans le corpus
+        self.id_soumission = id_soumission
+        self.doc_id_soumission = doc_id_soumission
+        self.profondeur = profondeur
+    
+    def __str__(self):
+        return f"Commentaire de {self.auteur} (profondeur {self.profondeur}) — {self.titre}"
+    
+    def getType(self):
+        return "Commentaire Reddit"
+
+
 class ArxivDocument(Document):
-    def __init__(self, titre, auteur, source, date, url, texte, co_auteurs=None):
-        super().__init__(titre, auteur, source, date, url, texte)
+    def __init__(self, titre, auteur, source, date, url, texte, co_auteurs=None, id_source=None, date_maj=None):
+        super().__init__(titre, auteur, source, date, url, texte, id_source)
         self.co_auteurs = co_auteurs if co_auteurs is not None else []
+        # Date de la dernière version (<updated>) : une révision la fait avancer, pas la date de publication
+        self.date_maj = date_maj if date_maj is not None else date
+    
+    @staticmethod
+    def id_depuis_url(url):
+        # --- Identifiant arXiv sans numéro de version : toutes les versions d'un article ont le même ---
+        # http://arxiv.org/abs/2509.22442v2 -> 2509.22442, hep-th/9901001v1 -> hep-th/9901001
+        if not url:
+            return None
+        return re.sub(r'v\d+$', '', url.split('/abs/', 1)[-1]) or None
     
     def __str__(self):
         if len(self.co_auteurs) > 0:
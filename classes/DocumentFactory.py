@@ -1,11 +1,12 @@
 from datetime import datetime
-from classes.Document import Document, RedditDocument, ArxivDocument
+from classes.Document import Document, RedditDocument, RedditCommentDocument, ArxivDocument
 
 
 class DocumentFactory:
     # --- Factory Pattern pour créer des documents selon leur source ---
     @staticmethod
     def create_document(source, titre, auteur, date, url, texte, **kwargs):
+        id_source = kwargs.get('id_source', None)
         if source.lower() == 'reddit':
             nb_commentaires = kwargs.get('nb_commentaires', 0)
             return RedditDocument(
@@ -15,7 +16,23 @@ class DocumentFactory:
                 date=date,
                 url=url,
                 texte=texte,
-                nb_commentaires=nb_commentaires
+                nb_commentaires=nb_commentaires,
+                id_source=id_source
+            )
+        elif source.lower() == 'reddit_commentaire':
+            return RedditCommentDocument(
+                titre=titre,
+                auteur=auteur,
+                source=source,
+                date=date,
+                url=url,
+                texte=texte,
+                nb_commentaires=kwargs.get('nb_commentaires', 0),
+                id_source=id_source,
+                id_parent_source=kwargs.get('id_parent_source', None),
+                id_soumission=kwargs.get('id_soumission', None),
+                profondeur=kwargs.get('profondeur', 0),
+                doc_id_soumission=kwargs.get('doc_id_soumission', None)
             )
         elif source.lower() == 'arxiv':
             co_auteurs = kwargs.get('co_auteurs', None)
@@ -26,7 +43,9 @@ class DocumentFactory:
                 date=date,
                 url=url,
                 texte=texte,
-                co_auteurs=co_auteurs
+                co_auteurs=co_auteurs,
+                id_source=id_source,
+                date_maj=kwargs.get('date_maj', None)
             )
         else:
             # Par défaut, crée un Document de base
@@ -36,6 +55,7 @@ class DocumentFactory:
                 source=source,
                 date=date,
                 url=url,
-                texte=texte
+                texte=texte,
+                id_source=id_source
             )
 
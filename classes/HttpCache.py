@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+
+class HttpCache:
+    # --- Cache disque des réponses HTTP (clé : URL complète) avec revalidation conditionnelle ---
+
+    def __init__(self, dossier='.cache_http', ttl=24 * 3600, taille_max=200 * 1024 * 1024,
+                 hors_ligne=False, horloge=time.time):
+        # --- Paramètre le cache ---
+        # dossier : répertoire des réponses (un fichier .body et un fichier .json par URL)
+        # ttl : durée (s) pendant laquelle une réponse est servie sans contacter le serveur
+        # taille_max : taille totale maximale des corps (octets) ; les moins récemment utilisés sont évincés
+        # hors_ligne : ne jamais contacter le réseau (les URL absentes du cache lèvent LookupError)
+        self.dossier = dossier
+        self.ttl = ttl
+        self.taille_max = taille_max
+        self.hors_ligne = hors_ligne
+        self.horloge = horloge
+        self._verrou = threading.Lock()
+        self.stats = {'hits': 0, 'revalidations': 0, 'misses': 0, 'evictions': 0, 'octets_lus': 0}
+        os.makedirs(self.dossier, exist_ok=True)
+        self._taille_totale = sum(meta.get('taille', 0) for _, meta in self._entrees())
+
+    @staticmethod
+    def construire_url(url, params=None):
+        # --- URL complète (paramètres encodés) servant de clé ---
+        return requests.Request('GET', url, params=params).prepare().url
+
+    def _chemins(self, url_complete):
+        # --- Chemins du corps et des métadonnées : adressés par le hash de l'URL ---
+        cle = hashlib.sha256(url_complete.encode('utf-8')).hexdigest()
+        base = os.path.join(self.dossier, cle[:2], cle)
+        return base + '.body', base + '.json'
+
+    def _lire_meta(self, chemin_meta):
+        try:
+            with open(chemin_meta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _temporaire(chemin, mode):
+        # --- Fichier temporaire unique à côté de `chemin` (remplacement atomique, threads concurrents) ---
+        descripteur, temporaire = tempfile.mkstemp(
+            dir=os.path.dirname(chemin), prefix=os.path.basename(chemin) + '.', suffix='.tmp'
+        )
+        return os.fdopen(descripteur, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})), temporaire
+
+    def _ecrire_meta(self, chemin_meta, meta):
+        f, temporaire = self._temporaire(chemin_meta, 'w')
+        with f:
+            json.dump(meta, f)
+        os.replace(temporaire, chemin_meta)
+        self._marquer_utilise(chemin_meta)
+
+    def _marquer_utilise(self, chemin_meta):
+        # --- Date de dernière utilisation (ordre d'éviction) : mtime des métadonnées, selon l'horloge du cache ---
+        instant = self.horloge()
+        os.utime(chemin_meta, (instant, instant))
+
+    def ouvrir(self, session, url, params=None, timeout=30, avant_requete=None):
+        # --- Renvoie un fichier binaire ouvert sur le corps de la réponse ---
+        # avant_requete : fonction appelée juste avant chaque accès réseau (ex. limiteur de débit)
+        url_complete = self.construire_url(url, params)
+        chemin_corps, chemin_meta = self._chemins(url_complete)
+        meta = self._lire_meta(chemin_meta)
+        present = meta is not None and os.path.exists(chemin_corps)
+
+        if present and (self.hors_ligne or self.horloge() - meta['stocke_le'] < self.ttl):
+            return self._servir(chemin_corps, chemin_meta, meta, 'hits')
+        if self.hors_ligne:
+            raise LookupError(f"'{url_complete}' absente du cache (mode hors ligne)")
+
+        # Requête conditionnelle si une version (périmée) est en cache
+        entetes = {}
+        if present:
+            if meta.get('etag'):
+                entetes['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                entetes['If-Modified-Since'] = meta['last_modified']
+        if avant_requete is not None:
+            avant_requete()
+        with session.get(url_complete, headers=entetes, timeout=timeout, stream=True) as response:
+            if present and response.status_code == 304:
+                meta['stocke_le'] = self.horloge()
+                self._ecrire_meta(chemin_meta, meta)
+                return self._servir(chemin_corps, chemin_meta, meta, 'revalidations')
+            response.raise_for_status()
+            response.raw.decode_content = True
+            self._stocker(response, url_complete, chemin_corps, chemin_meta, meta if present else None)
+        with self._verrou:
+            self.stats['misses'] += 1
+        return open(chemin_corps, 'rb')
+
+    def _servir(self, chemin_corps, chemin_meta, meta, statistique):
+        # --- Sert une réponse du cache et la marque comme récemment utilisée ---
+        self._marquer_utilise(chemin_meta)
+        with self._verrou:
+            self.stats[statistique] += 1
+            self.stats['octets_lus'] += meta.get('taille', 0)
+        return open(chemin_corps, 'rb')
+
+    def _stocker(self, response, url_complete, chemin_corps, chemin_meta, ancienne_meta):
+        # --- Écrit le corps en flux dans le cache (remplacement atomique) puis évince si besoin ---
+        os.makedirs(os.path.dirname(chemin_corps), exist_ok=True)
+        f, temporaire = self._temporaire(chemin_corps, 'wb')
+        taille = 0
+        with f:
+            for bloc in iter(lambda: response.raw.read(64 * 1024), b''):
+                f.write(bloc)
+                taille += len(bloc)
+        os.replace(temporaire, chemin_corps)
+        self._ecrire_meta(chemin_meta, {
+            'url': url_complete,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'stocke_le': self.horloge(),
+            'taille': taille,
+        })
+        with self._verrou:
+            self._taille_totale += taille - (ancienne_meta.get('taille', 0) if ancienne_meta else 0)
+            depassement = self._taille_totale > self.taille_max
+        if depassement:
+            self.evincer(garder=chemin_meta)
+
+    def _entrees(self):
+        # --- Parcourt les métadonnées présentes sur le disque : (chemin_meta, meta) ---
+        for sous_dossier in os.listdir(self.dossier):
+            chemin_sous_dossier = os.path.join(self.dossier, sous_dossier)
+            if not os.path.isdir(chemin_sous_dossier):
+                continue
+            for nom in os.listdir(chemin_sous_dossier):
+                if nom.endswith('.json'):
+                    chemin_meta = os.path.join(chemin_sous_dossier, nom)
+                    meta = self._lire_meta(chemin_meta)
+                    if meta is not None:
+                        yield chemin_meta, meta
+
+    def evincer(self, garder=None):
+        # --- Supprime les réponses les moins récemment utilisées jusqu'à repasser sous taille_max ---
+        with self._verrou:
+            entrees = sorted(
+                ((os.path.getmtime(chemin), chemin, meta) for chemin, meta in self._entrees() if chemin != garder),
+                key=lambda entree: entree[0]
+            )
+            for _, chemin_meta, meta in entrees:
+                if self._taille_totale <= self.taille_max:
+                    break
+                for chemin in (chemin_meta, chemin_meta[:-len('.json')] + '.body'):
+                    try:
+                        os.remove(chemin)
+                    except OSError:
+                        pass
+                self._taille_totale -= meta.get('taille', 0)
+                self.stats['evictions'] += 1
+
+    def taux_succes(self):
+        # --- Part des requêtes servies sans retélécharger le corps ---
+        total = self.stats['hits'] + self.stats['revalidations'] + self.stats['misses']
+        return (self.stats['hits'] + self.stats['revalidations']) / total if total else 0.0
+
+    def vider(self):
+        # --- Supprime toutes les réponses du cache ---
+        with self._verrou:
+            for chemin_meta, _ in list(self._entrees()):
+                for chemin in (chemin_meta, chemin_meta[:-len('.json')] + '.body'):
+                    try:
+                        os.remove(chemin)
+                    except OSError:
+                        pass
+            self._taille_totale = 0
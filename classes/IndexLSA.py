@@ -0,0 +1,47 @@
+import numpy as np
+from scipy.sparse.linalg import svds
+
+
+class IndexLSA:
+    # --- Index sémantique latent (LSA) : SVD tronquée de rang k de la matrice TFxIDF ---
+    # mat_TFxIDF ≈ U Σ Vᵀ. Un document est représenté par sa ligne de U Σ (ses coordonnées sur les
+    # k facteurs de termes V), une requête par q V : des mots qui apparaissent dans les mêmes
+    # contextes (synonymes) ont des facteurs proches, un document peut donc être trouvé sans
+    # contenir les mots de la requête. Les documents sont stockés normalisés, en float32 contigus :
+    # la recherche est un seul produit matrice-vecteur dense de dimension k.
+
+    def __init__(self, mat_TFxIDF, rang=100, graine=0):
+        # --- Calcule la SVD tronquée ---
+        # rang : nombre de dimensions latentes (strictement inférieur aux deux dimensions de la matrice)
+        # graine : vecteur de départ de l'algorithme itératif (résultats reproductibles)
+        if not 0 < rang < min(mat_TFxIDF.shape):
+            raise ValueError(f"rang doit être compris entre 1 et {min(mat_TFxIDF.shape) - 1}")
+        self.rang = rang
+        depart = np.random.default_rng(graine).standard_normal(min(mat_TFxIDF.shape))
+        U, sigma, Vt = svds(mat_TFxIDF.astype(np.float64), k=rang, v0=depart)
+        # svds renvoie les valeurs singulières par ordre croissant
+        ordre = np.argsort(-sigma)
+        self.valeurs_singulieres = sigma[ordre]
+        # Facteurs des termes (termes x k), pour projeter les requêtes
+        self.termes = np.ascontiguousarray(Vt[ordre].T, dtype=np.float32)
+        # Coordonnées des documents (U Σ), normalisées : le produit scalaire est le cosinus latent
+        documents = U[:, ordre] * self.valeurs_singulieres
+        normes = np.linalg.norm(documents, axis=1, keepdims=True)
+        normes[normes == 0] = 1
+        self.documents = np.ascontiguousarray(documents / normes, dtype=np.float32)
+
+    def projeter(self, vecteur):
+        # --- Vecteur requête (dense, termes) -> vecteur latent normalisé (k) ---
+        termes = np.flatnonzero(vecteur)
+        projection = vecteur[termes].astype(np.float32).dot(self.termes[termes])
+        norme = np.linalg.norm(projection)
+        return projection / norme if norme > 0 else projection
+
+    def scores(self, vecteur, lignes=None):
+        # --- Cosinus latent entre la requête et les documents (lignes : indices retenus, None = tous) ---
+        documents = self.documents if lignes is None else self.documents[lignes]
+        return documents.dot(self.projeter(vecteur))
+
+    def nb_octets(self):
+        # --- Taille des documents et des facteurs de termes ---
+        return self.documents.nbytes + self.termes.nbytes
@@ -0,0 +1,125 @@
+import numpy as np
+
+
+class IndexPositionnel:
+    # --- Index positionnel : terme -> documents -> positions, stocké en écarts (delta) ---
+    # Pour chaque terme (colonne de la matrice TF) :
+    #   lignes des documents contenant le terme, en écarts successifs ;
+    #   pour chaque document, positions du terme, la première en absolu puis en écarts.
+    # Les tableaux de tous les termes sont concaténés (format CSR) : debut_postings[t] et
+    # debut_positions[p] donnent le début des données du terme t et du posting p.
+
+    def __init__(self, lignes_mots, nb_termes):
+        # --- Construit l'index ---
+        # lignes_mots : pour chaque ligne de la matrice TF, tableau des ids de colonne de ses mots
+        #               dans l'ordre du texte
+        # nb_termes : nombre de colonnes de la matrice TF
+        longueurs = np.array([len(mots) for mots in lignes_mots], dtype=np.int64)
+        termes = np.concatenate(lignes_mots).astype(np.int64) if len(lignes_mots) else np.empty(0, np.int64)
+        lignes = np.repeat(np.arange(len(lignes_mots), dtype=np.int64), longueurs)
+        positions = np.arange(len(termes), dtype=np.int64) - np.repeat(np.cumsum(longueurs) - longueurs, longueurs)
+        self.longueur_max = int(longueurs.max()) if len(longueurs) else 0
+        self.nb_lignes = len(lignes_mots)
+
+        # Tri par (terme, ligne, position)
+        ordre = np.lexsort((positions, lignes, termes))
+        termes, lignes, positions = termes[ordre], lignes[ordre], positions[ordre]
+
+        # Un posting par couple (terme, ligne)
+        nouveau = np.ones(len(termes), dtype=bool)
+        nouveau[1:] = (termes[1:] != termes[:-1]) | (lignes[1:] != lignes[:-1])
+        debuts = np.flatnonzero(nouveau)
+        termes_postings = termes[debuts]
+        lignes_postings = lignes[debuts]
+        self.frequences = np.diff(np.append(debuts, len(termes))).astype(np.int32)
+
+        self.debut_postings = np.searchsorted(termes_postings, np.arange(nb_termes + 1)).astype(np.int64)
+        self.debut_positions = np.append(debuts, len(termes)).astype(np.int64)
+
+        # Encodage en écarts : le premier élément de chaque segment reste absolu
+        self.ecarts_lignes = self._encoder_ecarts(lignes_postings, self.debut_postings)
+        self.ecarts_positions = self._encoder_ecarts(positions, self.debut_positions)
+
+    @staticmethod
+    def _encoder_ecarts(valeurs, debuts):
+        ecarts = np.empty(len(valeurs), dtype=np.int32)
+        if len(valeurs):
+            ecarts[0] = valeurs[0]
+            ecarts[1:] = np.diff(valeurs)
+            premiers = debuts[:-1][debuts[:-1] < debuts[1:]]
+            ecarts[premiers] = valeurs[premiers]
+        return ecarts
+
+    @staticmethod
+    def _decoder_ecarts(ecarts, debuts_segments):
+        # --- Somme cumulée remise à zéro au début de chaque segment ---
+        # debuts_segments : indices (relatifs à ecarts) du début de chaque segment
+        cumul = np.cumsum(ecarts, dtype=np.int64)
+        longueurs = np.diff(np.append(debuts_segments, len(ecarts)))
+        base = cumul[debuts_segments] - ecarts[debuts_segments]
+        return cumul - np.repeat(base, longueurs)
+
+    def nb_octets(self):
+        # --- Taille mémoire des tableaux de l'index ---
+        return sum(tableau.nbytes for tableau in (
+            self.ecarts_lignes, self.ecarts_positions, self.frequences, self.debut_postings, self.debut_positions
+        ))
+
+    def lignes(self, terme):
+        # --- Lignes (triées) des documents contenant le terme ---
+        debut, fin = self.debut_postings[terme], self.debut_postings[terme + 1]
+        return np.cumsum(self.ecarts_lignes[debut:fin], dtype=np.int64)
+
+    def positions_globales(self, terme, lignes_gardees=None):
+        # --- Positions du terme codées ligne * pas + position (triées), restreintes à lignes_gardees ---
+        debut, fin = self.debut_postings[terme], self.debut_postings[terme + 1]
+        lignes = np.cumsum(self.ecarts_lignes[debut:fin], dtype=np.int64)
+        postings = np.arange(debut, fin)
+        if lignes_gardees is not None:
+            garder = np.isin(lignes, lignes_gardees, assume_unique=True)
+            lignes, postings = lignes[garder], postings[garder]
+        if len(postings) == 0:
+            return np.empty(0, dtype=np.int64)
+        # Décoder uniquement les positions des postings gardés
+        debuts = self.debut_positions[postings]
+        longueurs = self.debut_positions[postings + 1] - debuts
+        indices = np.repeat(debuts - np.cumsum(longueurs) + longueurs, longueurs) + np.arange(longueurs.sum())
+        debuts_segments = np.cumsum(longueurs) - longueurs
+        positions = self._decoder_ecarts(self.ecarts_positions[indices], debuts_segments)
+        return np.repeat(lignes, longueurs) * self.pas + positions
+
+    @property
+    def pas(self):
+        # Écart entre deux lignes dans le codage global (aucune correspondance ne franchit une ligne)
+        return self.longueur_max + 1
+
+    def phrase(self, termes, slop=0):
+        # --- Documents contenant les termes dans l'ordre, à au plus `slop` mots intercalés au total ---
+        # Renvoie (lignes, nombre d'occurrences de la phrase par ligne)
+        vide = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        if not termes or any(t is None for t in termes):
+            return vide
+
+        # Intersection des listes de documents, en partant du terme le plus rare
+        candidats = None
+        for terme in sorted(set(termes), key=lambda t: self.debut_postings[t + 1] - self.debut_postings[t]):
+            lignes = self.lignes(terme)
+            candidats = lignes if candidats is None else np.intersect1d(candidats, lignes, assume_unique=True)
+            if len(candidats) == 0:
+                return vide
+
+        # Pour chaque occurrence du premier terme, position la plus proche de chaque terme suivant
+        # (recherche dichotomique vectorisée sur toutes les lignes candidates à la fois)
+        departs = self.positions_globales(termes[0], candidats)
+        courant = departs
+        for terme in termes[1:]:
+            positions = self.positions_globales(terme, candidats)
+            idx = np.searchsorted(positions, courant, side='right')
+            valides = idx < len(positions)
+            departs, idx = departs[valides], idx[valides]
+            courant = positions[idx]
+        # Mots intercalés = étendue - (nombre de termes - 1), dans la même ligne
+        memes_lignes = (courant // self.pas) == (departs // self.pas)
+        correspond = memes_lignes & (courant - departs - (len(termes) - 1) <= slop)
+        lignes, nb = np.unique(departs[correspond] // self.pas, return_counts=True)
+        return lignes, nb
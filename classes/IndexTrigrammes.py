@@ -0,0 +1,240 @@
+import re
+
+import numpy as np
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+class IndexTrigrammes:
+    # --- Index des trigrammes de caractères des textes, pour la recherche par expression régulière ---
+    # Principe des moteurs de recherche de code : une expression régulière est traduite en requête
+    # booléenne sur les trigrammes que toute correspondance contient forcément, par exemple
+    # democra(cy|tic) -> dem AND emo AND ... AND (acy OR ati AND tic). Seuls les documents qui
+    # satisfont cette requête (les candidats) sont parcourus par la vraie expression régulière.
+    # Les textes sont indexés en minuscules : la requête est valable avec ou sans re.IGNORECASE.
+
+    # Au-delà de ces tailles, les ensembles de chaînes de l'analyse sont abandonnés (requête moins
+    # sélective mais toujours correcte)
+    MAX_CHAINES = 16
+    MAX_CROISEMENTS = 64
+
+    def __init__(self, textes):
+        # --- Construit l'index : trigramme -> lignes (triées) des textes qui le contiennent ---
+        self.textes = list(textes)
+        self.nb_lignes = len(self.textes)
+        postings = {}
+        for ligne, texte in enumerate(self.textes):
+            texte = (texte or '').lower()
+            for trigramme in {texte[i:i + 3] for i in range(len(texte) - 2)}:
+                postings.setdefault(trigramme, []).append(ligne)
+        self.postings = {trigramme: np.array(lignes, dtype=np.int32) for trigramme, lignes in postings.items()}
+
+    def nb_octets(self):
+        # --- Taille des listes de lignes ---
+        return sum(lignes.nbytes for lignes in self.postings.values())
+
+    # --- Requêtes booléennes sur les trigrammes : True (tout document), ('tri', t), ('et', ...), ('ou', ...) ---
+
+    @staticmethod
+    def _et(*requetes):
+        termes = []
+        for requete in requetes:
+            if requete is True:
+                continue
+            termes.extend(requete[1] if requete[0] == 'et' else (requete,))
+        termes = list(dict.fromkeys(termes))
+        if not termes:
+            return True
+        return termes[0] if len(termes) == 1 else ('et', tuple(termes))
+
+    @staticmethod
+    def _ou(*requetes):
+        termes = []
+        for requete in requetes:
+            if requete is True:
+                return True
+            termes.extend(requete[1] if requete[0] == 'ou' else (requete,))
+        termes = list(dict.fromkeys(termes))
+        return termes[0] if len(termes) == 1 else ('ou', tuple(termes))
+
+    def _requete_chaines(self, chaines):
+        # --- Au moins une des chaînes : OU des ET de leurs trigrammes ---
+        return self._ou(*(
+            self._et(*(('tri', chaine[i:i + 3]) for i in range(len(chaine) - 2))) for chaine in chaines
+        ))
+
+    # --- Analyse de l'expression : pour chaque nœud de l'arbre de sre_parse, un dictionnaire ---
+    # exact : ensemble des chaînes reconnues si elles sont peu nombreuses (sinon None)
+    # prefixe / suffixe : débuts et fins possibles des correspondances (2 caractères au plus)
+    # requete : requête sur les trigrammes vérifiée par toute correspondance
+
+    @staticmethod
+    def _exact(chaines):
+        return {'exact': set(chaines), 'prefixe': None, 'suffixe': None, 'requete': True}
+
+    @staticmethod
+    def _quelconque():
+        # N'importe quelle chaîne, éventuellement vide : aucune information
+        return {'exact': None, 'prefixe': {''}, 'suffixe': {''}, 'requete': True}
+
+    def _complete(self, info):
+        # --- Requête de l'info, y compris les trigrammes de ses chaînes exactes ---
+        if info['exact'] is not None:
+            return self._et(info['requete'], self._requete_chaines(info['exact']))
+        return info['requete']
+
+    @staticmethod
+    def _bords(info):
+        # --- (préfixes, suffixes) de l'info ---
+        if info['exact'] is not None:
+            return info['exact'], info['exact']
+        return info['prefixe'], info['suffixe']
+
+    def _borner(self, chaines, cote):
+        chaines = {chaine[:2] if cote == 'prefixe' else chaine[-2:] for chaine in chaines}
+        return chaines if len(chaines) <= self.MAX_CROISEMENTS else {''}
+
+    def _concatener(self, x, y):
+        if x['exact'] is not None and y['exact'] is not None:
+            chaines = {a + b for a in x['exact'] for b in y['exact']}
+            if len(chaines) <= self.MAX_CHAINES:
+                return self._exact(chaines)
+        prefixes_x, suffixes_x = self._bords(x)
+        prefixes_y, suffixes_y = self._bords(y)
+        # Trigrammes à cheval sur la frontière entre x et y
+        croisement = True
+        if len(suffixes_x) * len(prefixes_y) <= self.MAX_CROISEMENTS:
+            croisement = self._requete_chaines({a[-2:] + b[:2] for a in suffixes_x for b in prefixes_y})
+        if x['exact'] is not None:
+            prefixes = {a + b for a in x['exact'] for b in prefixes_y}
+        else:
+            prefixes = prefixes_x
+        if y['exact'] is not None:
+            suffixes = {a + b for a in suffixes_x for b in y['exact']}
+        else:
+            suffixes = suffixes_y
+        return {
+            'exact': None,
+            'prefixe': self._borner(prefixes, 'prefixe'),
+            'suffixe': self._borner(suffixes, 'suffixe'),
+            'requete': self._et(self._complete(x), self._complete(y), croisement),
+        }
+
+    def _alterner(self, infos):
+        if all(info['exact'] is not None for info in infos):
+            chaines = set().union(*(info['exact'] for info in infos))
+            if len(chaines) <= self.MAX_CHAINES:
+                return self._exact(chaines)
+        prefixes, suffixes = set(), set()
+        for info in infos:
+            prefixes_info, suffixes_info = self._bords(info)
+            prefixes |= prefixes_info
+            suffixes |= suffixes_info
+        return {
+            'exact': None,
+            'prefixe': self._borner(prefixes, 'prefixe'),
+            'suffixe': self._borner(suffixes, 'suffixe'),
+            'requete': self._ou(*(self._complete(info) for info in infos)),
+        }
+
+    def _sans_exact(self, info):
+        # --- Même info, sans l'ensemble exact (répétitions non bornées) ---
+        if info['exact'] is None:
+            return info
+        return {
+            'exact': None,
+            'prefixe': self._borner(info['exact'], 'prefixe'),
+            'suffixe': self._borner(info['exact'], 'suffixe'),
+            'requete': self._complete(info),
+        }
+
+    def _classe(self, elements):
+        # --- Classe de caractères [...] : ensemble exact si elle est petite ---
+        caracteres = set()
+        for op, av in elements:
+            if op is sre_parse.LITERAL:
+                caracteres.add(chr(av).lower())
+            elif op is sre_parse.RANGE and av[1] - av[0] < self.MAX_CHAINES:
+                caracteres.update(chr(c).lower() for c in range(av[0], av[1] + 1))
+            else:
+                # Négation, catégorie (\w, \d...) ou grand intervalle
+                return self._quelconque()
+        return self._exact(caracteres) if len(caracteres) <= self.MAX_CHAINES else self._quelconque()
+
+    def _analyser(self, motif):
+        # --- Info d'une suite de nœuds (concaténation) ---
+        info = self._exact({''})
+        for op, av in motif:
+            info = self._concatener(info, self._analyser_noeud(op, av))
+        return info
+
+    def _analyser_noeud(self, op, av):
+        if op is sre_parse.LITERAL:
+            return self._exact({chr(av).lower()})
+        if op is sre_parse.IN:
+            return self._classe(av)
+        if op is sre_parse.AT:
+            return self._exact({''})
+        if op is sre_parse.SUBPATTERN:
+            return self._analyser(av[-1])
+        if op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+            return self._analyser(av)
+        if op is sre_parse.BRANCH:
+            return self._alterner([self._analyser(branche) for branche in av[1]])
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, 'POSSESSIVE_REPEAT', None)):
+            minimum, maximum, motif = av
+            sous_info = self._analyser(motif)
+            if maximum == 0:
+                return self._exact({''})
+            if minimum == 0:
+                return self._alterner([self._exact({''}), sous_info]) if maximum == 1 else self._quelconque()
+            # Au moins `minimum` répétitions : on en garde au plus 3 dans l'analyse
+            info = sous_info
+            for _ in range(min(minimum, 3) - 1):
+                info = self._concatener(info, sous_info)
+            return info if minimum == maximum and minimum <= 3 else self._sans_exact(info)
+        # ANY, NOT_LITERAL, assertions, références arrière... : aucune information
+        return self._quelconque()
+
+    def requete_trigrammes(self, expression, flags=0):
+        # --- Requête booléenne sur les trigrammes satisfaite par tout texte où `expression` trouve une correspondance ---
+        if isinstance(expression, re.Pattern):
+            expression, flags = expression.pattern, expression.flags
+        return self._complete(self._analyser(sre_parse.parse(expression, flags)))
+
+    def _evaluer(self, requete):
+        if requete is True:
+            return np.arange(self.nb_lignes, dtype=np.int32)
+        if requete[0] == 'tri':
+            return self.postings.get(requete[1], np.empty(0, dtype=np.int32))
+        if requete[0] == 'et':
+            # Intersection en partant des listes les plus courtes (trigrammes d'abord)
+            sous_requetes = sorted(
+                requete[1], key=lambda r: len(self.postings.get(r[1], ())) if r[0] == 'tri' else self.nb_lignes
+            )
+            lignes = self._evaluer(sous_requetes[0])
+            for sous_requete in sous_requetes[1:]:
+                if len(lignes) == 0:
+                    break
+                lignes = np.intersect1d(lignes, self._evaluer(sous_requete), assume_unique=True)
+            return lignes
+        lignes = np.empty(0, dtype=np.int32)
+        for sous_requete in requete[1]:
+            lignes = np.union1d(lignes, self._evaluer(sous_requete))
+        return lignes
+
+    def candidats(self, expression, flags=0):
+        # --- Lignes (triées) des textes pouvant contenir une correspondance de l'expression ---
+        return self._evaluer(self.requete_trigrammes(expression, flags))
+
+    def correspondances(self, expression, flags=0):
+        # --- (ligne, match) de toutes les correspondances, l'expression n'étant exécutée que sur les candidats ---
+        motif = expression if isinstance(expression, re.Pattern) else re.compile(expression, flags)
+        for ligne in self.candidats(motif):
+            texte = self.textes[ligne]
+            if texte:
+                for match in motif.finditer(texte):
+                    yield int(ligne), match
@@ -0,0 +1,398 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from classes.DiscoursIngestion import COLONNES_DISCOURS, segmenter_chunk
+from classes.Document import Document
+from classes.RedditCrawler import RedditCrawler
+from classes.SearchEngine import SearchEngine
+
+
+_FIN = object()
+
+ETAPES = ('fetch', 'parse', 'dedupe', 'register', 'index', 'snapshot')
+
+
+class SourceIngestion:
+    # --- Une source du pipeline : pages brutes repérées par un curseur de reprise ---
+
+    def __init__(self, nom, pages, parser):
+        # --- Paramètre la source ---
+        # nom : identifiant unique de la source (clé du checkpoint)
+        # pages : fonction(curseur) générant des couples (curseur_suivant, page_brute) ;
+        #         curseur vaut None au premier lancement, sinon le dernier curseur enregistré
+        #         (il doit être sérialisable en JSON)
+        # parser : fonction(page_brute) renvoyant la liste des Documents de la page
+        self.nom = nom
+        self.pages = pages
+        self.parser = parser
+
+    @staticmethod
+    def reddit(crawler, subreddit, listing='new', limite=1000):
+        # --- Listing d'un subreddit (RedditCrawler), curseur : {'after', 'restant'} ---
+        def pages(curseur):
+            curseur = curseur or {'after': None, 'restant': limite}
+            after, restant = curseur['after'], curseur['restant']
+            while restant > 0:
+                params = {'limit': min(100, restant), 'raw_json': 1}
+                if after:
+                    params['after'] = after
+                donnees = crawler.requete_json(f"/r/{subreddit}/{listing}", params).get('data', {})
+                posts = [enfant['data'] for enfant in donnees.get('children', []) if enfant.get('kind') == 't3']
+                posts = posts[:restant]
+                restant -= len(posts)
+                after = donnees.get('after')
+                if not posts or not after:
+                    restant = 0
+                yield {'after': after, 'restant': restant}, posts
+
+        def parser(posts):
+            return [RedditCrawler.post_vers_document(post) for post in posts]
+        return SourceIngestion(f"reddit:{subreddit}:{listing}", pages, parser)
+
+    @staticmethod
+    def arxiv(fetcher, query, max_results=1000, taille_page=100):
+        # --- Résultats d'une requête arXiv (ArxivFetcher), curseur : indice de la page suivante ---
+        # La page est parsée en flux pendant son téléchargement (ArxivFetcher.recuperer_page) : le
+        # nombre d'entrées lues et le total annoncé par le flux indiquent la dernière page
+        def pages(curseur):
+            debut = curseur or 0
+            while debut < max_results:
+                taille = min(taille_page, max_results - debut)
+                documents, total_resultats = fetcher.recuperer_page(query, debut, taille)
+                debut += taille
+                if len(documents) < taille or (total_resultats is not None and debut >= total_resultats):
+                    debut = max_results
+                yield debut, documents
+
+        return SourceIngestion(f"arxiv:{query}", pages, list)
+
+    @staticmethod
+    def discours(chemin='discours_US.csv', taille_chunk=500, source="Discours US"):
+        # --- Fichier discours_US.csv lu par blocs, curseur : nombre de discours déjà lus ---
+        def pages(curseur):
+            offset = curseur or 0
+            lecteur = pd.read_csv(
+                chemin, sep='\t', quotechar='"', usecols=COLONNES_DISCOURS, chunksize=taille_chunk,
+                dtype=str, keep_default_na=False, skiprows=range(1, offset + 1)
+            )
+            for chunk in lecteur:
+                lignes = list(chunk[COLONNES_DISCOURS].itertuples(index=False, name=None))
+                yield offset + len(lignes), (lignes, offset)
+                offset += len(lignes)
+
+        def parser(bloc):
+            _, phrases = segmenter_chunk(*bloc)
+            return [
+                Document(titre=titre, auteur=auteur, source=source, date=date, url=url, texte=texte)
+                for titre, auteur, date, url, texte in phrases
+            ]
+        return SourceIngestion(f"discours:{chemin}", pages, parser)
+
+    def __repr__(self):
+        return f"SourceIngestion('{self.nom}')"
+
+
+class IngestionPipeline:
+    # --- Pipeline fetch -> parse -> dedupe -> register -> index -> snapshot (un thread par étape) ---
+
+    def __init__(self, corpus, sources, chemin_corpus='corpus.json', chemin_checkpoint='ingestion_checkpoint.json',
+                 moteur=None, indexer=True, taille_file=8, taille_lot_index=1000, intervalle_snapshot=60.0,
+                 docs_par_snapshot=5000):
+        # --- Paramètre le pipeline ---
+        # sources : liste de SourceIngestion (chaque source est lue par son propre thread)
+        # chemin_corpus / chemin_checkpoint : snapshot du corpus et état de reprise
+        # moteur : SearchEngine à tenir à jour (construit depuis le corpus si None et indexer=True) ;
+        #         il n'est pas sauvegardé, l'appelant le récupère dans self.moteur après executer()
+        # indexer : tenir l'index à jour pendant l'ingestion (utile seulement si l'appelant interroge
+        #           self.moteur dans le même processus : le snapshot ne contient que le corpus)
+        # taille_file : nombre de lots en attente entre deux étapes (contre-pression)
+        # taille_lot_index : nombre de documents accumulés avant une mise à jour de l'index
+        #                    (l'index est aussi mis à jour dès que l'étape n'a plus rien en attente)
+        # intervalle_snapshot / docs_par_snapshot : un snapshot est écrit toutes les
+        #                    intervalle_snapshot secondes ou tous les docs_par_snapshot documents
+        self.corpus = corpus
+        self.sources = {source.nom: source for source in sources}
+        self.chemin_corpus = chemin_corpus
+        self.chemin_checkpoint = chemin_checkpoint
+        self.moteur = moteur
+        self.indexer = indexer
+        self.taille_file = taille_file
+        self.taille_lot_index = taille_lot_index
+        self.intervalle_snapshot = intervalle_snapshot
+        self.docs_par_snapshot = docs_par_snapshot
+
+        # Le corpus est partagé par les étapes dedupe, register, index et snapshot
+        self._verrou = threading.Lock()
+        self._arret = threading.Event()
+        self.erreur = None
+        # État de reprise : dernier curseur enregistré dans le corpus pour chaque source
+        self.curseurs = {}
+        self.metriques = {etape: self._metriques_vides() for etape in ETAPES}
+        self.metriques['snapshot']['nb_snapshots'] = 0
+        self.duree = 0.0
+
+    @staticmethod
+    def _metriques_vides():
+        return {'nb_lots': 0, 'nb_entrees': 0, 'nb_sorties': 0, 'duree_active': 0.0}
+
+    def arreter(self):
+        # --- Demande l'arrêt : plus aucune page n'est lue, les lots en cours vont jusqu'au snapshot ---
+        self._arret.set()
+
+    # --- Checkpoint ---
+
+    def charger_corpus(self):
+        # --- Relit le snapshot existant dans un corpus vide : les snapshots suivants le complètent ---
+        # au lieu de le remplacer par les seuls documents de cette exécution
+        if self.corpus.id2doc or not os.path.exists(self.chemin_corpus):
+            return False
+        return self.corpus.load(self.chemin_corpus)
+
+    def charger_checkpoint(self):
+        # --- Reprend l'état d'une exécution interrompue (False s'il n'y a pas de checkpoint) ---
+        if not os.path.exists(self.chemin_checkpoint):
+            return False
+        with open(self.chemin_checkpoint, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        self.charger_corpus()
+        self.curseurs = checkpoint.get('sources', {})
+        for etape, valeurs in checkpoint.get('etapes', {}).items():
+            if etape in self.metriques:
+                self.metriques[etape].update(valeurs)
+        self.duree = checkpoint.get('duree', 0.0)
+        return True
+
+    def _snapshot(self):
+        # --- Sauvegarde le corpus puis le checkpoint (les curseurs correspondent au corpus sauvegardé) ---
+        with self._verrou:
+            self.corpus.save(self.chemin_corpus)
+            curseurs = json.loads(json.dumps(self.curseurs))
+        checkpoint = {
+            'corpus': self.chemin_corpus,
+            'sauvegarde_le': datetime.now().isoformat(),
+            'sources': curseurs,
+            'etapes': self.metriques,
+            'duree': self.duree + time.perf_counter() - self._debut,
+        }
+        temporaire = self.chemin_checkpoint + '.tmp'
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(temporaire, self.chemin_checkpoint)
+
+    # --- Étapes ---
+
+    def _fetch(self, source, sortie, restantes):
+        # --- Thread de lecture d'une source : envoie les pages brutes à l'étape parse ---
+        etat = self.curseurs.get(source.nom, {})
+        try:
+            if not etat.get('termine'):
+                pages = source.pages(etat.get('curseur'))
+                while not self._arret.is_set():
+                    debut = time.perf_counter()
+                    page = next(pages, _FIN)
+                    if page is _FIN:
+                        # Lot vide marquant la fin de la source dans le checkpoint
+                        sortie.put({'source': source.nom, 'curseur': etat.get('curseur'), 'termine': True})
+                        break
+                    etat = {'curseur': page[0]}
+                    self._compter('fetch', 1, 1, time.perf_counter() - debut)
+                    sortie.put({'source': source.nom, 'curseur': page[0], 'termine': False, 'brut': page[1]})
+        except Exception as erreur:
+            self._echec(erreur)
+        finally:
+            with self._verrou:
+                restantes[0] -= 1
+                derniere = restantes[0] == 0
+            if derniere:
+                sortie.put(_FIN)
+
+    def _parse(self, lot):
+        brut = lot.pop('brut', None)
+        lot['documents'] = self.sources[lot['source']].parser(brut) if brut is not None else []
+        return lot
+
+    def _dedupe(self, lot):
+        # Écarter les documents déjà présents à l'identique (et les doublons à l'intérieur du lot)
+        gardes, vus = [], set()
+        with self._verrou:
+            for doc in lot['documents']:
+                cle = self.corpus.cle_source(doc)
+                if cle is not None:
+                    if cle in vus:
+                        continue
+                    vus.add(cle)
+                    if self.corpus.est_inchange(doc):
+                        continue
+                gardes.append(doc)
+        lot['documents'] = gardes
+        return lot
+
+    def _register(self, lot):
+        # Le curseur n'avance qu'une fois les documents de la page dans le corpus
+        with self._verrou:
+            lot['doc_ids'] = self.corpus.register_documents(lot.pop('documents'))
+            self.curseurs[lot['source']] = {'curseur': lot['curseur'], 'termine': lot['termine']}
+        return lot
+
+    def _index(self, doc_ids):
+        # Mise à jour de l'index par micro-lots (ajouter_documents ne retokenise que le lot)
+        if self.indexer and doc_ids:
+            with self._verrou:
+                if self.moteur is None:
+                    # Premier passage (ou reprise) : l'index couvre tout le corpus déjà enregistré
+                    self.moteur = SearchEngine(self.corpus)
+                else:
+                    self.moteur.ajouter_documents(doc_ids)
+
+    def _executer_etape(self, nom, fonction, entree, sortie):
+        # --- Boucle d'une étape : lit les lots de l'entrée, les traite et les passe à la suivante ---
+        while True:
+            lot = entree.get()
+            if lot is _FIN:
+                if sortie is not None:
+                    sortie.put(_FIN)
+                return
+            if self.erreur is not None:
+                # Une étape a échoué : vider la file sans traiter (le dernier snapshot reste cohérent)
+                continue
+            debut = time.perf_counter()
+            nb_entrees = len(lot['documents']) if 'documents' in lot else 1
+            try:
+                lot = fonction(lot)
+            except Exception as erreur:
+                self._echec(erreur)
+                continue
+            nb_sorties = len(lot['documents']) if 'documents' in lot else len(lot.get('doc_ids', []))
+            self._compter(nom, nb_entrees, nb_sorties, time.perf_counter() - debut)
+            sortie.put(lot)
+
+    def _executer_index(self, entree, sortie):
+        # --- Étape index : regroupe les lots disponibles avant de mettre l'index à jour ---
+        lots, nb_docs, fin = [], 0, False
+        while not fin:
+            lot = entree.get()
+            if lot is _FIN:
+                fin = True
+            else:
+                lots.append(lot)
+                nb_docs += len(lot['doc_ids'])
+            if lots and (fin or nb_docs >= self.taille_lot_index or entree.empty()):
+                debut = time.perf_counter()
+                if self.erreur is None:
+                    try:
+                        self._index([doc_id for lot_index in lots for doc_id in lot_index['doc_ids']])
+                    except Exception as erreur:
+                        self._echec(erreur)
+                self._compter('index', nb_docs, nb_docs, time.perf_counter() - debut, nb_lots=len(lots))
+                for lot_indexe in lots:
+                    sortie.put(lot_indexe)
+                lots, nb_docs = [], 0
+        sortie.put(_FIN)
+
+    def _executer_snapshot(self, entree):
+        # --- Étape snapshot : écrit corpus + checkpoint périodiquement et à la fin ---
+        dernier = time.monotonic()
+        docs_depuis = 0
+        while True:
+            lot = entree.get()
+            fin = lot is _FIN
+            if not fin:
+                docs_depuis += len(lot['doc_ids'])
+                self._compter('snapshot', len(lot['doc_ids']), 0, 0.0)
+            if fin or docs_depuis >= self.docs_par_snapshot or time.monotonic() - dernier >= self.intervalle_snapshot:
+                # Compteurs mis à jour avant l'écriture : le checkpoint inclut ce snapshot
+                self._compter('snapshot', 0, docs_depuis, 0.0, nb_lots=0)
+                self.metriques['snapshot']['nb_snapshots'] += 1
+                debut = time.perf_counter()
+                self._snapshot()
+                self._compter('snapshot', 0, 0, time.perf_counter() - debut, nb_lots=0)
+                dernier = time.monotonic()
+                docs_depuis = 0
+            if fin:
+                return
+
+    def _compter(self, etape, nb_entrees, nb_sorties, duree, nb_lots=1):
+        with self._verrou:
+            metriques = self.metriques[etape]
+            metriques['nb_lots'] += nb_lots
+            metriques['nb_entrees'] += nb_entrees
+            metriques['nb_sorties'] += nb_sorties
+            metriques['duree_active'] += duree
+
+    def _echec(self, erreur):
+        # --- Première erreur d'une étape : arrêt de la lecture, le reste du pipeline se vide ---
+        if self.erreur is None:
+            self.erreur = erreur
+        self.arreter()
+
+    def executer(self, reprendre=True, corpus_vide=False):
+        # --- Lance toutes les étapes et attend la fin des sources (ou un arrêt / Ctrl+C) ---
+        # reprendre : repartir du checkpoint s'il existe (sinon toutes les sources repartent du début ;
+        #             le corpus déjà sauvegardé est conservé et complété)
+        # corpus_vide : ne pas relire chemin_corpus ni le checkpoint : le premier snapshot remplace
+        #               le corpus sauvegardé par les seuls documents de cette exécution
+        if not corpus_vide:
+            self.charger_corpus()
+            if reprendre:
+                self.charger_checkpoint()
+        self._arret.clear()
+        self.erreur = None
+        self._debut = time.perf_counter()
+
+        files = [queue.Queue(maxsize=self.taille_file) for _ in range(len(ETAPES) - 1)]
+        restantes = [len(self.sources)]
+        threads = [
+            threading.Thread(target=self._fetch, args=(source, files[0], restantes), daemon=True)
+            for source in self.sources.values()
+        ]
+        if not self.sources:
+            files[0].put(_FIN)
+        threads += [
+            threading.Thread(target=self._executer_etape, args=('parse', self._parse, files[0], files[1]), daemon=True),
+            threading.Thread(target=self._executer_etape, args=('dedupe', self._dedupe, files[1], files[2]), daemon=True),
+            threading.Thread(target=self._executer_etape, args=('register', self._register, files[2], files[3]), daemon=True),
+            threading.Thread(target=self._executer_index, args=(files[3], files[4]), daemon=True),
+            threading.Thread(target=self._executer_snapshot, args=(files[4],), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            # Ctrl+C : les lots déjà lus sont enregistrés et un dernier snapshot est écrit
+            print("\nInterruption : arrêt après le snapshot des lots en cours...")
+            self.arreter()
+            for thread in threads:
+                thread.join()
+
+        self.duree += time.perf_counter() - self._debut
+        if self.erreur is not None:
+            raise self.erreur
+        return self.rapport()
+
+    def sources_terminees(self):
+        # --- Indique si toutes les sources ont été lues jusqu'au bout ---
+        return all(self.curseurs.get(nom, {}).get('termine') for nom in self.sources)
+
+    def rapport(self):
+        # --- Débit par étape : éléments produits par seconde active et sur la durée totale ---
+        lignes = []
+        for etape in ETAPES:
+            metriques = self.metriques[etape]
+            duree_active = metriques['duree_active']
+            lignes.append({
+                'etape': etape,
+                **metriques,
+                'debit_actif': metriques['nb_sorties'] / duree_active if duree_active > 0 else 0.0,
+                'debit': metriques['nb_sorties'] / self.duree if self.duree > 0 else 0.0,
+                'occupation': duree_active / self.duree if self.duree > 0 else 0.0,
+            })
+        return pd.DataFrame(lignes).set_index('etape')
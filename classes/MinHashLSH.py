@@ -0,0 +1,97 @@
+import zlib
+
+import numpy as np
+
+
+class MinHashLSH:
+    # --- Signatures MinHash des documents et index LSH par bandes (détection de quasi-doublons) ---
+
+    def __init__(self, nb_permutations=128, nb_bandes=32, taille_shingle=3, seuil=0.8, graine=42):
+        # --- Paramètre l'index ---
+        # nb_permutations : longueur des signatures (précision de l'estimation de Jaccard)
+        # nb_bandes : nombre de bandes LSH (nb_permutations doit en être un multiple) ; avec
+        #             r = nb_permutations / nb_bandes lignes par bande, deux documents de
+        #             similarité s sont candidats avec la probabilité 1 - (1 - s^r)^nb_bandes
+        # taille_shingle : nombre de mots consécutifs par shingle
+        # seuil : similarité de Jaccard estimée à partir de laquelle deux documents sont des quasi-doublons
+        if nb_permutations % nb_bandes:
+            raise ValueError("nb_permutations doit être un multiple de nb_bandes")
+        self.nb_permutations = nb_permutations
+        self.nb_bandes = nb_bandes
+        self.lignes_par_bande = nb_permutations // nb_bandes
+        self.taille_shingle = taille_shingle
+        self.seuil = seuil
+        # Famille de hachage multiply-shift : h_i(x) = (a_i * x + b_i) mod 2^64 >> 32 (a_i impair)
+        generateur = np.random.default_rng(graine)
+        self._a = generateur.integers(1, 2 ** 63, size=nb_permutations, dtype=np.uint64) | np.uint64(1)
+        self._b = generateur.integers(0, 2 ** 63, size=nb_permutations, dtype=np.uint64)
+        # Clé d'une bande : combinaison linéaire de ses valeurs, décalée selon le numéro de bande
+        # (une collision ne fait qu'ajouter un candidat, vérifié ensuite sur la signature complète)
+        self._coefs_bande = generateur.integers(1, 2 ** 63, size=self.lignes_par_bande, dtype=np.uint64) | np.uint64(1)
+        self._decalages_bande = generateur.integers(0, 2 ** 63, size=nb_bandes, dtype=np.uint64)
+        # Seaux de toutes les bandes : clé -> doc_ids
+        self.seaux = {}
+        self.signatures = {}
+
+    def shingles(self, mots):
+        # --- Ensemble des hachages (32 bits) des shingles de taille_shingle mots ---
+        k = self.taille_shingle
+        if len(mots) < k:
+            groupes = [' '.join(mots)] if mots else []
+        else:
+            groupes = (' '.join(mots[i:i + k]) for i in range(len(mots) - k + 1))
+        return np.fromiter({zlib.crc32(groupe.encode('utf-8')) for groupe in groupes}, dtype=np.uint64)
+
+    def signature(self, mots):
+        # --- Signature MinHash (uint32) d'une liste de mots ; None si le texte est vide ---
+        valeurs = self.shingles(mots)
+        if len(valeurs) == 0:
+            return None
+        signature = np.full(self.nb_permutations, np.iinfo(np.uint32).max, dtype=np.uint64)
+        # Par blocs de shingles : la mémoire temporaire reste bornée pour les longs documents
+        for debut in range(0, len(valeurs), 1024):
+            bloc = valeurs[debut:debut + 1024, None]
+            np.minimum(signature, (bloc * self._a + self._b).min(axis=0) >> np.uint64(32), out=signature)
+        return signature.astype(np.uint32)
+
+    def _cles(self, signature):
+        # --- Une clé entière par bande (calcul vectorisé) ---
+        bandes = signature.astype(np.uint64).reshape(self.nb_bandes, self.lignes_par_bande)
+        return ((bandes * self._coefs_bande).sum(axis=1) + self._decalages_bande).tolist()
+
+    def ajouter(self, doc_id, signature):
+        # --- Insère un document dans l'index ---
+        self.signatures[doc_id] = signature
+        for cle in self._cles(signature):
+            self.seaux.setdefault(cle, []).append(doc_id)
+
+    def retirer(self, doc_id):
+        # --- Retire un document de l'index (document modifié ou supprimé) ---
+        signature = self.signatures.pop(doc_id, None)
+        if signature is None:
+            return
+        for cle in self._cles(signature):
+            seau = self.seaux.get(cle)
+            if seau is not None and doc_id in seau:
+                seau.remove(doc_id)
+                if not seau:
+                    del self.seaux[cle]
+
+    def candidats(self, signature):
+        # --- Documents partageant au moins une bande avec la signature ---
+        return set().union(*(self.seaux.get(cle, ()) for cle in self._cles(signature)))
+
+    def chercher(self, signature):
+        # --- Quasi-doublon le plus proche : (doc_id, similarité estimée) ou None ---
+        # Seuls les candidats des seaux communs sont comparés (coût indépendant de la taille du corpus)
+        candidats = list(self.candidats(signature))
+        if not candidats:
+            return None
+        similarites = (np.array([self.signatures[doc_id] for doc_id in candidats]) == signature).mean(axis=1)
+        meilleur = int(np.argmax(similarites))
+        if similarites[meilleur] < self.seuil:
+            return None
+        return candidats[meilleur], float(similarites[meilleur])
+
+    def __len__(self):
+        return len(self.signatures)
@@ -0,0 +1,130 @@
+import numpy as np
+
+
+class PostingsCompresses:
+    # --- Listes inversées compressées : terme -> (lignes, fréquences) par blocs de taille fixe ---
+    # Les postings de chaque terme (colonne de la matrice TF) sont découpés en blocs de taille_bloc.
+    # Dans un bloc, les lignes sont stockées en écarts avec la ligne précédente (la première ligne
+    # du bloc est gardée en clair dans `premieres`), et toutes les valeurs du bloc sont empaquetées
+    # sur le nombre de bits du plus grand écart (bit-packing). Les fréquences (tf - 1) sont
+    # empaquetées de la même façon dans un flux séparé. Le décodage est vectorisé sur tous les
+    # blocs demandés à la fois.
+
+    def __init__(self, mat_TF, taille_bloc=128):
+        # --- Compresse une matrice Documents x Termes (TF entiers) ---
+        mat_TF = mat_TF.tocsc()
+        mat_TF.sort_indices()
+        self.taille_bloc = taille_bloc
+        self.nb_lignes, self.nb_termes = mat_TF.shape
+        self.nb_postings = mat_TF.nnz
+        # Nombre de documents de chaque terme
+        self.nb_documents = np.diff(mat_TF.indptr).astype(np.int64)
+        lignes = mat_TF.indices.astype(np.int64)
+        frequences = mat_TF.data.astype(np.int64)
+
+        # Blocs : debut_blocs[t] = premier bloc du terme t
+        nb_blocs_termes = -(-self.nb_documents // taille_bloc)
+        self.debut_blocs = np.concatenate([[0], np.cumsum(nb_blocs_termes)]).astype(np.int64)
+        rang = np.arange(self.nb_postings) - np.repeat(mat_TF.indptr[:-1].astype(np.int64), self.nb_documents)
+        debuts = np.flatnonzero(rang % taille_bloc == 0)
+        self.tailles = np.diff(np.append(debuts, self.nb_postings)).astype(np.uint16)
+        self.premieres = lignes[debuts].astype(np.int32)
+        # Dernière ligne de chaque bloc (permet de sauter un bloc sans le décoder)
+        self.dernieres = lignes[np.append(debuts[1:], self.nb_postings) - 1].astype(np.int32) \
+            if len(debuts) else np.empty(0, dtype=np.int32)
+
+        # Écarts entre lignes successives (0 au début de chaque bloc)
+        ecarts = np.zeros(self.nb_postings, dtype=np.int64)
+        ecarts[1:] = np.diff(lignes)
+        ecarts[debuts] = 0
+        self.largeurs_lignes, self.debut_octets_lignes, self.octets_lignes = self._empaqueter(ecarts, debuts)
+        self.largeurs_tf, self.debut_octets_tf, self.octets_tf = self._empaqueter(frequences - 1, debuts)
+
+    @staticmethod
+    def _nb_bits(valeurs):
+        # Nombre de bits nécessaires pour chaque valeur (0 pour 0)
+        return np.frexp(valeurs.astype(np.float64))[1].astype(np.uint8)
+
+    def _empaqueter(self, valeurs, debuts):
+        # --- Bit-packing bloc par bloc : (largeurs, début de chaque bloc en octets, flux d'octets) ---
+        if len(debuts) == 0:
+            return np.empty(0, dtype=np.uint8), np.zeros(1, dtype=np.int64), np.zeros(16, dtype=np.uint8)
+        largeurs = self._nb_bits(np.maximum.reduceat(valeurs, debuts))
+        octets_blocs = (self.tailles.astype(np.int64) * largeurs + 7) // 8
+        debut_octets = np.concatenate([[0], np.cumsum(octets_blocs)]).astype(np.int64)
+        tailles = self.tailles.astype(np.int64)
+        decalages, _ = self._decalages_bits(
+            np.arange(len(debuts)), tailles, self._rangs(tailles), largeurs, debut_octets
+        )
+        # Flux lu par mots de 64 bits : longueur multiple de 8 octets, plus deux mots de marge
+        # (une valeur de largeur nulle en fin de flux lit encore le mot suivant)
+        flux = np.zeros((debut_octets[-1] + 7) // 8 * 8 + 16, dtype=np.uint8)
+        valeurs_decalees = valeurs.astype(np.uint64) << (decalages & 7).astype(np.uint64)
+        octet = decalages >> 3
+        garder = valeurs > 0
+        valeurs_decalees, octet = valeurs_decalees[garder], octet[garder]
+        # Une valeur de 32 bits au plus décalée de 7 bits tient dans 5 octets
+        for j in range(5):
+            octets = (valeurs_decalees >> np.uint64(8 * j)) & np.uint64(0xFF)
+            np.bitwise_or.at(flux, octet + j, octets.astype(np.uint8))
+        return largeurs, debut_octets, flux
+
+    @staticmethod
+    def _rangs(tailles):
+        # Rang de chaque valeur dans son bloc
+        return np.arange(tailles.sum()) - np.repeat(np.cumsum(tailles) - tailles, tailles)
+
+    @staticmethod
+    def _decalages_bits(blocs, tailles, rangs, largeurs, debut_octets):
+        # --- Position (en bits) de chaque valeur des blocs donnés, dans l'ordre des blocs ---
+        largeurs_valeurs = np.repeat(largeurs[blocs], tailles)
+        return np.repeat(debut_octets[blocs] * 8, tailles) + rangs * largeurs_valeurs, largeurs_valeurs
+
+    @classmethod
+    def _deballer(cls, flux, blocs, tailles, rangs, largeurs, debut_octets):
+        # --- Valeurs des blocs donnés : chaque valeur est à cheval sur au plus deux mots de 64 bits ---
+        decalages, largeurs_valeurs = cls._decalages_bits(blocs, tailles, rangs, largeurs, debut_octets)
+        mots = flux.view('<u8')
+        indices = decalages >> 6
+        decalages_mot = (decalages & 63).astype(np.uint64)
+        bas = mots[indices] >> decalages_mot
+        # Bits venant du mot suivant (décalage en deux temps : un décalage de 64 bits n'est pas défini)
+        haut = (mots[indices + 1] << np.uint64(1)) << (np.uint64(63) - decalages_mot)
+        masques = (np.uint64(1) << largeurs_valeurs.astype(np.uint64)) - np.uint64(1)
+        return ((bas | haut) & masques).astype(np.int64)
+
+    def decoder_blocs(self, blocs):
+        # --- (lignes, tf) des postings des blocs donnés (indices croissants de blocs) ---
+        blocs = np.asarray(blocs, dtype=np.int64)
+        if len(blocs) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        tailles = self.tailles[blocs].astype(np.int64)
+        rangs = self._rangs(tailles)
+        ecarts = self._deballer(
+            self.octets_lignes, blocs, tailles, rangs, self.largeurs_lignes, self.debut_octets_lignes
+        )
+        # Somme cumulée des écarts remise à la première ligne au début de chaque bloc
+        cumul = np.cumsum(ecarts)
+        debuts = np.cumsum(tailles) - tailles
+        lignes = cumul - np.repeat(cumul[debuts] - self.premieres[blocs], tailles)
+        tf = self._deballer(self.octets_tf, blocs, tailles, rangs, self.largeurs_tf, self.debut_octets_tf) + 1
+        return lignes, tf
+
+    def blocs(self, terme):
+        # --- Indices des blocs du terme ---
+        return np.arange(self.debut_blocs[terme], self.debut_blocs[terme + 1])
+
+    def postings(self, terme):
+        # --- (lignes triées, tf) de tous les documents contenant le terme ---
+        return self.decoder_blocs(self.blocs(terme))
+
+    def nb_octets(self):
+        # --- Taille totale : flux compressés et métadonnées des blocs ---
+        return sum(tableau.nbytes for tableau in (
+            self.octets_lignes, self.octets_tf, self.largeurs_lignes, self.largeurs_tf,
+            self.debut_octets_lignes, self.debut_octets_tf, self.premieres, self.dernieres,
+            self.tailles, self.debut_blocs
+        ))
+
+    def octets_par_posting(self):
+        return self.nb_octets() / max(self.nb_postings, 1)
@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+class RateLimiter:
+    # --- Limite le nombre de requêtes par seconde (partagé entre plusieurs threads) ---
+
+    def __init__(self, requetes_par_seconde=1.0, horloge=time.monotonic, dormir=time.sleep):
+        # --- requetes_par_seconde : débit maximal (None ou 0 = pas de limite) ---
+        self.intervalle = 1.0 / requetes_par_seconde if requetes_par_seconde else 0.0
+        self.horloge = horloge
+        self.dormir = dormir
+        self._prochain_creneau = 0.0
+        self._verrou = threading.Lock()
+
+    def attendre(self):
+        # --- Bloque jusqu'au prochain créneau disponible puis le réserve ---
+        if self.intervalle <= 0:
+            return
+        with self._verrou:
+            maintenant = self.horloge()
+            creneau = max(maintenant, self._prochain_creneau)
+            self._prochain_creneau = creneau + self.intervalle
+        attente = creneau - maintenant
+        if attente > 0:
+            self.dormir(attente)
+
+
+class TokenBucket:
+    # --- Seau à jetons : `capacite` requêtes en rafale, rechargé à `debit` jetons par seconde ---
+
+    def __init__(self, capacite, debit, horloge=time.monotonic):
+        if capacite < 1:
+            raise ValueError("capacite doit être au moins 1")
+        if debit <= 0:
+            raise ValueError("debit doit être strictement positif")
+        self.capacite = float(capacite)
+        self.debit = float(debit)
+        self.horloge = horloge
+        self.jetons = float(capacite)
+        self._derniere_recharge = horloge()
+        self._verrou = threading.Lock()
+
+    def _recharger(self):
+        maintenant = self.horloge()
+        self.jetons = min(self.capacite, self.jetons + (maintenant - self._derniere_recharge) * self.debit)
+        self._derniere_recharge = maintenant
+
+    def prendre(self, nb=1):
+        # --- Consomme nb jetons s'ils sont disponibles ; renvoie False sinon (non bloquant) ---
+        with self._verrou:
+            self._recharger()
+            if self.jetons >= nb:
+                self.jetons -= nb
+                return True
+            return False
+
+    def delai_avant(self, nb=1):
+        # --- Temps (s) avant que nb jetons soient disponibles ---
+        with self._verrou:
+            self._recharger()
+            manque = nb - self.jetons
+            if manque <= 0:
+                return 0.0
+            return manque / self.debit
@@ -0,0 +1,346 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from classes.DocumentFactory import DocumentFactory
+from classes.RateLimiter import RateLimiter
+
+
+REDDIT_AUTH_URL = 'https://www.reddit.com/api/v1/access_token'
+REDDIT_API_URL = 'https://oauth.reddit.com'
+
+
+class RedditCrawler:
+    # --- Récupère plusieurs subreddits / listings en parallèle avec une seule session authentifiée ---
+
+    def __init__(self, corpus=None, client_id=None, client_secret=None, username=None, password=None,
+                 user_agent=None, api_url=REDDIT_API_URL, auth_url=REDDIT_AUTH_URL, max_concurrence=4,
+                 budget_requetes=None, requetes_par_seconde=1.0, taille_lot=50, timeout=30, cache=None):
+        # --- Paramètre le crawler ---
+        # corpus : corpus dans lequel les documents sont enregistrés par lots (None = pas d'enregistrement)
+        # identifiants : lus dans l'environnement (.env) s'ils ne sont pas fournis
+        # api_url / auth_url : modifiables pour une fausse API Reddit locale (auth_url=None = pas d'OAuth)
+        # max_concurrence : nombre maximal de requêtes simultanées
+        # budget_requetes : nombre maximal de requêtes pour tout le crawl (None = illimité)
+        # requetes_par_seconde : débit global (l'API OAuth de Reddit autorise ~100 requêtes / minute)
+        # cache : HttpCache optionnel (une réponse en cache ne demande ni jeton OAuth ni débit)
+        self.corpus = corpus
+        self.client_id = client_id if client_id is not None else os.getenv("CLIENT_ID")
+        self.client_secret = client_secret if client_secret is not None else os.getenv("CLIENT_SECRET")
+        self.username = username if username is not None else os.getenv("USER_NAME")
+        self.password = password if password is not None else os.getenv("PASSWORD")
+        self.user_agent = user_agent or os.getenv("USER_AGENT") or 'RedditScrapper'
+        self.api_url = api_url.rstrip('/')
+        self.auth_url = auth_url
+        self.max_concurrence = max_concurrence
+        self.budget_requetes = budget_requetes
+        self.taille_lot = taille_lot
+        self.timeout = timeout
+        self.limiteur = RateLimiter(requetes_par_seconde)
+        self.cache = cache
+
+        # Une seule session HTTP (connexions keep-alive) partagée par toutes les requêtes
+        self.session = requests.Session()
+        adaptateur = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrence)
+        self.session.mount('http://', adaptateur)
+        self.session.mount('https://', adaptateur)
+        self.session.headers['User-Agent'] = self.user_agent
+        self._token_expiration = 0.0
+        self._verrou = threading.Lock()
+
+        self.metriques = {
+            'nb_requetes': 0, 'nb_documents': 0, 'nb_lots': 0, 'budget_epuise': False, 'nb_commentaires': 0,
+        }
+
+    def fermer(self):
+        # --- Ferme les connexions de la session ---
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def _authentifier(self):
+        # --- Obtient (ou renouvelle) le jeton OAuth une seule fois pour toute la session ---
+        if self.auth_url is None:
+            return
+        with self._verrou:
+            if time.monotonic() < self._token_expiration:
+                return
+            response = self.session.post(
+                self.auth_url,
+                auth=(self.client_id, self.client_secret),
+                data={'grant_type': 'password', 'username': self.username, 'password': self.password},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            donnees = response.json()
+            self.session.headers['Authorization'] = f"bearer {donnees['access_token']}"
+            # Renouveler le jeton une minute avant son expiration
+            self._token_expiration = time.monotonic() + donnees.get('expires_in', 3600) - 60
+
+    def _reserver_requete(self):
+        # --- Décompte une requête du budget global ; False si le budget est épuisé ---
+        with self._verrou:
+            if self.budget_requetes is not None and self.metriques['nb_requetes'] >= self.budget_requetes:
+                self.metriques['budget_epuise'] = True
+                return False
+            self.metriques['nb_requetes'] += 1
+            return True
+
+    def _avant_requete(self):
+        # --- Appelé avant chaque accès réseau : jeton OAuth et limite de débit ---
+        self._authentifier()
+        self.limiteur.attendre()
+
+    def requete_json(self, chemin, params=None):
+        # --- GET authentifié sur l'API (bloquant, exécuté dans un thread du pool) ---
+        if self.cache is not None:
+            with self.cache.ouvrir(
+                self.session, f"{self.api_url}{chemin}", params, timeout=self.timeout,
+                avant_requete=self._avant_requete
+            ) as flux:
+                return json.load(flux)
+        self._avant_requete()
+        response = self.session.get(f"{self.api_url}{chemin}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _date(donnees):
+        # --- Date de création (created_utc, secondes epoch) en UTC naïf, comme les dates arXiv ---
+        return datetime.fromtimestamp(
+            donnees.get('created_utc', donnees.get('created', 0)), tz=timezone.utc
+        ).replace(tzinfo=None)
+
+    @staticmethod
+    def post_vers_document(post):
+        # --- Convertit les données JSON d'un post (kind t3) en RedditDocument ---
+        # L'auteur est déjà une chaîne dans le listing : aucun appel réseau supplémentaire
+        return DocumentFactory.create_document(
+            source='reddit',
+            titre=post.get('title', ''),
+            auteur=post.get('author') or 'inconnu',
+            date=RedditCrawler._date(post),
+            url=post.get('url', ''),
+            texte=(post.get('selftext') or '').replace('\n', ' '),
+            nb_commentaires=post.get('num_comments', 0),
+            id_source=post.get('id')
+        )
+
+    def crawler(self, subreddits, listings=('hot',), limite=100, incremental=False, avec_commentaires=False,
+                options_commentaires=None):
+        # --- Version synchrone de crawler_async ---
+        # avec_commentaires : récupère aussi les commentaires des posts (voir ingerer_commentaires)
+        # Appelée alors qu'une boucle asyncio tourne déjà dans ce thread (Jupyter), la boucle du crawl
+        # est exécutée dans un thread dédié ; depuis du code asynchrone, préférer `await crawler_async(...)`.
+        doc_ids = []
+        crawl = self._crawler_async(subreddits, listings, limite, incremental, doc_ids)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            documents = asyncio.run(crawl)
+        else:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                documents = pool.submit(asyncio.run, crawl).result()
+        if avec_commentaires and self.corpus is not None:
+            # Ids renvoyés par le corpus (document canonique si un quasi-doublon a été supprimé),
+            # une seule fois par soumission même si elle figure dans plusieurs listings
+            self.ingerer_commentaires(list(dict.fromkeys(doc_ids)), **(options_commentaires or {}))
+        return documents
+
+    async def crawler_async(self, subreddits, listings=('hot',), limite=100, incremental=False):
+        # --- Récupère `limite` posts pour chaque couple (subreddit, listing) ---
+        # Renvoie la liste des documents récupérés (enregistrés dans le corpus par lots si fourni)
+        # incremental : le listing 'new' (trié par date) s'arrête au watermark 'reddit:<subreddit>'
+        # du corpus, qui est avancé à la fin du parcours ; les posts déjà connus des autres
+        # listings ne sont pas ré-enregistrés (index des ids natifs du corpus).
+        return await self._crawler_async(subreddits, listings, limite, incremental, [])
+
+    async def _crawler_async(self, subreddits, listings, limite, incremental, doc_ids):
+        # doc_ids : complétée avec les ids renvoyés par le corpus pour chaque document enregistré
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrence)
+        documents = []
+        lot = []
+
+        def ajouter(nouveaux):
+            # Exécuté dans la boucle asyncio : pas d'accès concurrent au corpus ni au lot. Les métriques
+            # sont partagées par les crawls simultanés d'un même crawler (CrawlScheduler) : sous verrou.
+            documents.extend(nouveaux)
+            lot.extend(nouveaux)
+            with self._verrou:
+                self.metriques['nb_documents'] += len(nouveaux)
+            if len(lot) >= self.taille_lot:
+                self._enregistrer_lot(lot, doc_ids)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrence) as pool:
+            async def parcourir(subreddit, listing):
+                # Pagination par curseur `after` (100 posts au maximum par page)
+                cle_watermark = f"reddit:{subreddit}"
+                suivre_watermark = incremental and listing == 'new' and self.corpus is not None
+                depuis = self.corpus.get_watermark(cle_watermark) if suivre_watermark else None
+                plus_recent = None
+                complet = False
+                after = None
+                restant = limite
+                while restant > 0:
+                    if not self._reserver_requete():
+                        break
+                    params = {'limit': min(100, restant), 'raw_json': 1}
+                    if after:
+                        params['after'] = after
+                    async with semaphore:
+                        page = await loop.run_in_executor(
+                            pool, self.requete_json, f"/r/{subreddit}/{listing}", params
+                        )
+                    donnees = page.get('data', {})
+                    posts = [enfant['data'] for enfant in donnees.get('children', []) if enfant.get('kind') == 't3']
+                    nouveaux = [self.post_vers_document(post) for post in posts[:restant]]
+                    if depuis is not None:
+                        anciens = [doc for doc in nouveaux if doc.date <= depuis]
+                        nouveaux = [doc for doc in nouveaux if doc.date > depuis]
+                        complet = complet or bool(anciens)
+                    if nouveaux:
+                        date_max = max(doc.date for doc in nouveaux)
+                        plus_recent = date_max if plus_recent is None else max(plus_recent, date_max)
+                    ajouter(nouveaux)
+                    restant -= len(posts)
+                    after = donnees.get('after')
+                    if not posts or not after:
+                        complet = True
+                    if complet:
+                        break
+
+                # Le watermark n'avance que s'il ne reste pas de trou jusqu'à l'ancien watermark
+                if suivre_watermark and plus_recent is not None and (depuis is None or complet):
+                    self.corpus.update_watermark(cle_watermark, plus_recent)
+
+            await asyncio.gather(*(
+                parcourir(subreddit, listing) for subreddit in subreddits for listing in listings
+            ))
+
+        self._enregistrer_lot(lot, doc_ids)
+        return documents
+
+    def _enregistrer_lot(self, lot, doc_ids):
+        # --- Enregistre un lot de documents dans le corpus, ajoute leurs ids à doc_ids puis vide le lot ---
+        if lot and self.corpus is not None:
+            doc_ids.extend(self.corpus.register_documents(lot))
+            with self._verrou:
+                self.metriques['nb_lots'] += 1
+        lot.clear()
+
+    @staticmethod
+    def commentaire_vers_document(commentaire, titre_soumission, id_soumission, doc_id_soumission=None):
+        # --- Convertit les données JSON d'un commentaire (kind t1) en RedditCommentDocument ---
+        return DocumentFactory.create_document(
+            source='reddit_commentaire',
+            titre=f"Re: {titre_soumission}",
+            auteur=commentaire.get('author') or 'inconnu',
+            date=RedditCrawler._date(commentaire),
+            url=f"https://www.reddit.com{commentaire.get('permalink', '')}",
+            texte=(commentaire.get('body') or '').replace('\n', ' '),
+            id_source=commentaire.get('id'),
+            id_parent_source=commentaire.get('parent_id'),
+            id_soumission=id_soumission,
+            profondeur=commentaire.get('depth', 0),
+            doc_id_soumission=doc_id_soumission
+        )
+
+    def recuperer_commentaires(self, id_soumission, profondeur_max=3, limite_more=2, max_commentaires=500,
+                               tri='top', doc_id_soumission=None):
+        # --- Récupère l'arbre de commentaires d'une soumission avec un coût borné ---
+        # profondeur_max : nombre de niveaux gardés (1 = réponses directes à la soumission seulement)
+        # limite_more : nombre maximal de requêtes /api/morechildren (équivalent de replace_more(limit))
+        # max_commentaires : nombre maximal de commentaires gardés pour la soumission
+        # Au plus 1 + limite_more requêtes et max_commentaires documents par soumission.
+        if not self._reserver_requete():
+            return []
+        reponse = self.requete_json(f"/comments/{id_soumission}", {
+            'depth': profondeur_max, 'limit': max_commentaires, 'sort': tri, 'raw_json': 1
+        })
+        enfants_soumission = reponse[0]['data']['children'] if reponse and reponse[0]['data']['children'] else []
+        titre = enfants_soumission[0]['data'].get('title', '') if enfants_soumission else ''
+        documents = []
+        mores = deque()
+
+        def parcourir(elements):
+            # Parcours itératif (pas de récursion sur les fils très profonds)
+            pile = list(reversed(elements))
+            while pile and len(documents) < max_commentaires:
+                element = pile.pop()
+                donnees = element.get('data', {})
+                if donnees.get('depth', 0) >= profondeur_max:
+                    continue
+                if element.get('kind') == 'more':
+                    if donnees.get('children'):
+                        mores.append(donnees)
+                    continue
+                if element.get('kind') != 't1':
+                    continue
+                documents.append(self.commentaire_vers_document(donnees, titre, id_soumission, doc_id_soumission))
+                reponses = donnees.get('replies')
+                if isinstance(reponses, dict):
+                    pile.extend(reversed(reponses.get('data', {}).get('children', [])))
+
+        parcourir(reponse[1]['data']['children'] if len(reponse) > 1 else [])
+
+        # Développer les « more » dans la limite fixée (100 ids au maximum par requête)
+        expansions = 0
+        while mores and expansions < limite_more and len(documents) < max_commentaires:
+            more = mores.popleft()
+            ids, reste = more['children'][:100], more['children'][100:]
+            if reste:
+                mores.appendleft({**more, 'children': reste})
+            if not self._reserver_requete():
+                break
+            resultat = self.requete_json('/api/morechildren', {
+                'link_id': f"t3_{id_soumission}", 'children': ','.join(ids), 'api_type': 'json',
+                'depth': profondeur_max, 'raw_json': 1
+            })
+            expansions += 1
+            parcourir(resultat.get('json', {}).get('data', {}).get('things', []))
+
+        return documents[:max_commentaires]
+
+    def ingerer_commentaires(self, doc_ids, **options):
+        # --- Récupère en parallèle les commentaires des soumissions du corpus (doc_ids) ---
+        # Chaque commentaire devient un document enfant rattaché à sa soumission ;
+        # les commentaires d'une soumission sont enregistrés dès qu'elle est terminée.
+        soumissions = [
+            (doc_id, self.corpus.id2doc[doc_id].id_source) for doc_id in doc_ids
+            if doc_id in self.corpus.id2doc and getattr(self.corpus.id2doc[doc_id], 'id_source', None)
+        ]
+        nb_commentaires = 0
+        en_vol = set()
+        with ThreadPoolExecutor(max_workers=self.max_concurrence) as pool:
+            for doc_id, id_source in soumissions:
+                # Nombre borné de soumissions en cours : la mémoire ne dépend pas du nombre de posts
+                if len(en_vol) >= 2 * self.max_concurrence:
+                    termines, en_vol = wait(en_vol, return_when=FIRST_COMPLETED)
+                    nb_commentaires += self._enregistrer_commentaires(termines)
+                en_vol.add(pool.submit(self.recuperer_commentaires, id_source, doc_id_soumission=doc_id, **options))
+            nb_commentaires += self._enregistrer_commentaires(wait(en_vol)[0])
+        with self._verrou:
+            self.metriques['nb_commentaires'] += nb_commentaires
+        return nb_commentaires
+
+    def _enregistrer_commentaires(self, futures):
+        # --- Enregistre les commentaires des soumissions terminées ---
+        nb = 0
+        for future in futures:
+            commentaires = future.result()
+            self.corpus.register_documents(commentaires)
+            nb += len(commentaires)
+        return nb
@@ -0,0 +1,194 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+from classes.RedditCrawler import RedditCrawler
+
+
+_FIN_DU_FLUX = object()
+
+
+def soumission_vers_document(post):
+    # --- Convertit une soumission (objet PRAW ou dict JSON de l'API) en RedditDocument ---
+    if not isinstance(post, dict):
+        post = {
+            'id': post.id,
+            'title': post.title,
+            # Redditor.__str__ renvoie le nom déjà présent dans la soumission (pas de requête)
+            'author': str(post.author) if post.author else None,
+            'created_utc': post.created_utc,
+            'url': post.url,
+            'num_comments': post.num_comments,
+            'selftext': post.selftext,
+        }
+    return RedditCrawler.post_vers_document(post)
+
+
+def flux_praw(reddit, subreddits):
+    # --- Flux infini des nouvelles soumissions d'un ou plusieurs subreddits (PRAW) ---
+    return reddit.subreddit('+'.join(subreddits)).stream.submissions(skip_existing=True)
+
+
+class RedditStream:
+    # --- Ingestion continue d'un flux de soumissions, indexées par micro-lots ---
+
+    def __init__(self, corpus, moteur=None, taille_lot=50, delai_max=5.0, taille_file=500,
+                 horloge=time.time):
+        # --- Paramètre l'ingestion ---
+        # moteur : SearchEngine mis à jour à chaque lot (None = corpus seulement)
+        # taille_lot / delai_max : un lot est indexé dès qu'il contient taille_lot soumissions
+        #                          ou que sa plus ancienne soumission attend depuis delai_max secondes
+        # taille_file : soumissions en attente au maximum ; au-delà la lecture du flux est
+        #               bloquée (contre-pression) jusqu'à ce que l'indexation rattrape son retard
+        # horloge : horloge murale (secondes epoch) utilisée pour la fraîcheur
+        # Chaque lot appelle SearchEngine.ajouter_documents (pondération IDF et normes recalculées,
+        # vectorisées, sur toute la matrice) : taille_lot / delai_max fixent le compromis entre
+        # fraîcheur et débit (les index optionnels ne sont reconstruits qu'à leur prochaine utilisation).
+        self.corpus = corpus
+        self.moteur = moteur
+        self.taille_lot = taille_lot
+        self.delai_max = delai_max
+        self.taille_file = taille_file
+        self.horloge = horloge
+        # File et signal d'arrêt propres à chaque appel de consommer() : un producteur d'un appel
+        # précédent encore bloqué dans le flux n'écrit jamais dans la file de l'appel suivant
+        self.file = queue.Queue(maxsize=taille_file)
+        self._arret = threading.Event()
+        self._producteur = None
+        self.latences = []
+        self.attentes = []
+        self.metriques = {
+            'nb_soumissions': 0, 'nb_lots': 0, 'nb_blocages': 0, 'duree_blocage': 0.0,
+            'duree_indexation': 0.0,
+        }
+
+    def arreter(self):
+        # --- Demande l'arrêt de la consommation (le lot en cours est indexé) ---
+        self._arret.set()
+
+    @staticmethod
+    def _deposer(file, element, arret):
+        # --- Met un élément dans la file ; abandonne si l'arrêt est demandé pendant l'attente ---
+        while not arret.is_set():
+            try:
+                file.put(element, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _lire_flux(self, flux, max_items, file, arret):
+        # --- Thread producteur : lit le flux et remplit la file (bloque si elle est pleine) ---
+        try:
+            for nb, post in enumerate(flux, start=1):
+                if arret.is_set():
+                    break
+                element = (post, self.horloge())
+                if file.full():
+                    # Contre-pression : l'indexation est en retard, la lecture du flux attend
+                    self.metriques['nb_blocages'] += 1
+                    debut = time.perf_counter()
+                    depose = self._deposer(file, element, arret)
+                    self.metriques['duree_blocage'] += time.perf_counter() - debut
+                else:
+                    depose = self._deposer(file, element, arret)
+                if not depose or (max_items is not None and nb >= max_items):
+                    break
+        finally:
+            try:
+                file.put_nowait(_FIN_DU_FLUX)
+            except queue.Full:
+                # Le consommateur s'est arrêté : il ne lit plus la file
+                pass
+
+    def _attendre_producteur(self, timeout=1.0):
+        # --- Arrête le producteur de l'appel précédent (un flux infini peut rester bloqué : timeout) ---
+        if self._producteur is not None:
+            self._arret.set()
+            self._producteur.join(timeout)
+            self._producteur = None
+
+    def consommer(self, flux, duree_max=None, max_items=None):
+        # --- Consomme le flux jusqu'à sa fin, duree_max secondes ou max_items soumissions ---
+        self._attendre_producteur()
+        self.file = queue.Queue(maxsize=self.taille_file)
+        self._arret = threading.Event()
+        producteur = threading.Thread(
+            target=self._lire_flux, args=(flux, max_items, self.file, self._arret), daemon=True
+        )
+        self._producteur = producteur
+        producteur.start()
+        fin = None if duree_max is None else time.monotonic() + duree_max
+        lot = []
+        debut_lot = None
+        termine = False
+        while not termine:
+            if fin is not None and time.monotonic() >= fin:
+                self.arreter()
+            if self._arret.is_set():
+                # Indexer ce qui est déjà dans la file sans attendre le flux
+                while True:
+                    try:
+                        element = self.file.get_nowait()
+                    except queue.Empty:
+                        break
+                    if element is not _FIN_DU_FLUX:
+                        lot.append(element)
+                termine = True
+            else:
+                # Attendre au plus jusqu'à l'échéance du lot en cours
+                timeout = 0.1
+                if debut_lot is not None:
+                    timeout = max(0.0, min(timeout, debut_lot + self.delai_max - time.monotonic()))
+                try:
+                    element = self.file.get(timeout=timeout)
+                except queue.Empty:
+                    element = None
+                if element is _FIN_DU_FLUX:
+                    termine = True
+                elif element is not None:
+                    if not lot:
+                        debut_lot = time.monotonic()
+                    lot.append(element)
+
+            echeance = debut_lot is not None and time.monotonic() - debut_lot >= self.delai_max
+            if lot and (len(lot) >= self.taille_lot or echeance or termine):
+                self._indexer_lot(lot)
+                lot = []
+                debut_lot = None
+        self._attendre_producteur()
+        return self.rapport()
+
+    def _indexer_lot(self, lot):
+        # --- Enregistre un lot dans le corpus et l'index en une seule étape ---
+        debut = time.perf_counter()
+        documents = [soumission_vers_document(post) for post, _ in lot]
+        doc_ids = self.corpus.register_documents(documents)
+        if self.moteur is not None:
+            self.moteur.ajouter_documents(doc_ids)
+        self.metriques['duree_indexation'] += time.perf_counter() - debut
+
+        # Fraîcheur : délai entre la création de la soumission et sa disponibilité dans l'index
+        maintenant = self.horloge()
+        for post, recu in lot:
+            cree = post['created_utc'] if isinstance(post, dict) else post.created_utc
+            self.latences.append(maintenant - cree)
+            # Part de cette latence passée entre la réception et l'indexation
+            self.attentes.append(maintenant - recu)
+        self.metriques['nb_soumissions'] += len(lot)
+        self.metriques['nb_lots'] += 1
+
+    def rapport(self):
+        # --- Métriques : taille moyenne des lots, contre-pression et fraîcheur (s) ---
+        rapport = dict(self.metriques)
+        nb_lots = self.metriques['nb_lots']
+        rapport['taille_moyenne_lot'] = self.metriques['nb_soumissions'] / nb_lots if nb_lots else 0.0
+        if self.latences:
+            latences = np.array(self.latences)
+            rapport['fraicheur_p50'] = float(np.percentile(latences, 50))
+            rapport['fraicheur_p95'] = float(np.percentile(latences, 95))
+            rapport['fraicheur_max'] = float(latences.max())
+            rapport['attente_p95'] = float(np.percentile(np.array(self.attentes), 95))
+        return rapport
@@ -0,0 +1,132 @@
+import re
+
+import numpy as np
+
+
+# Opérateurs reconnus (anglais ou français, insensibles à la casse)
+OPERATEURS = {'AND': 'et', 'ET': 'et', 'OR': 'ou', 'OU': 'ou', 'NOT': 'non', 'NON': 'non'}
+
+_LEXEMES = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+
+
+class RequeteBooleenne:
+    # --- Requête booléenne : democracy AND NOT war, (economy OR jobs) AND america, "middle class" ---
+    # Priorités : NOT > AND > OR ; deux termes juxtaposés sont reliés par AND.
+    # L'arbre est fait de tuples : ('terme', mot), ('phrase', texte), ('et', a, b), ('ou', a, b), ('non', a).
+
+    def __init__(self, requete):
+        self.requete = requete
+        self._lexemes = self._decouper(requete)
+        self._position = 0
+        if not self._lexemes:
+            raise ValueError("Requête booléenne vide")
+        self.arbre = self._ou()
+        if self._position < len(self._lexemes):
+            raise ValueError(f"Requête booléenne invalide près de '{self._lexemes[self._position][1]}'")
+
+    @staticmethod
+    def _decouper(requete):
+        # --- Lexèmes (type, valeur) : '(', ')', 'op', 'phrase', 'terme' ---
+        lexemes = []
+        position = 0
+        requete = requete.strip()
+        while position < len(requete):
+            correspondance = _LEXEMES.match(requete, position)
+            if correspondance is None:
+                raise ValueError(f"Guillemet non fermé dans la requête : {requete}")
+            ouvrante, fermante, phrase, mot = correspondance.groups()
+            if ouvrante:
+                lexemes.append(('(', ouvrante))
+            elif fermante:
+                lexemes.append((')', fermante))
+            elif phrase is not None:
+                lexemes.append(('phrase', phrase))
+            elif mot.upper() in OPERATEURS:
+                lexemes.append(('op', OPERATEURS[mot.upper()]))
+            else:
+                lexemes.append(('terme', mot))
+            position = correspondance.end()
+        return lexemes
+
+    def _suivant(self):
+        return self._lexemes[self._position] if self._position < len(self._lexemes) else (None, None)
+
+    def _ou(self):
+        gauche = self._et()
+        while self._suivant() == ('op', 'ou'):
+            self._position += 1
+            gauche = ('ou', gauche, self._et())
+        return gauche
+
+    def _et(self):
+        gauche = self._non()
+        while True:
+            type_lexeme, valeur = self._suivant()
+            if (type_lexeme, valeur) == ('op', 'et'):
+                self._position += 1
+            elif not (type_lexeme in ('terme', 'phrase', '(') or (type_lexeme, valeur) == ('op', 'non')):
+                return gauche
+            # AND explicite ou implicite (termes juxtaposés)
+            gauche = ('et', gauche, self._non())
+
+    def _non(self):
+        if self._suivant() == ('op', 'non'):
+            self._position += 1
+            return ('non', self._non())
+        return self._primaire()
+
+    def _primaire(self):
+        type_lexeme, valeur = self._suivant()
+        if type_lexeme == '(':
+            self._position += 1
+            noeud = self._ou()
+            if self._suivant()[0] != ')':
+                raise ValueError(f"Parenthèse non fermée dans la requête : {self.requete}")
+            self._position += 1
+            return noeud
+        if type_lexeme in ('terme', 'phrase'):
+            self._position += 1
+            return (type_lexeme, valeur)
+        attendu = 'fin de requête' if type_lexeme is None else f"'{valeur}'"
+        raise ValueError(f"Terme attendu dans la requête booléenne, trouvé {attendu}")
+
+    def termes_positifs(self, noeud=None):
+        # --- Termes et phrases non niés (ils forment le vecteur de classement) ---
+        noeud = self.arbre if noeud is None else noeud
+        if noeud[0] in ('terme', 'phrase'):
+            return [noeud[1]]
+        if noeud[0] == 'non':
+            return []
+        return self.termes_positifs(noeud[1]) + self.termes_positifs(noeud[2])
+
+    def evaluer(self, postings, nb_lignes, noeud=None):
+        # --- Lignes (tableau trié) satisfaisant la requête ---
+        # postings : fonction(noeud feuille) -> tableau trié des lignes du terme ou de la phrase
+        # Les négations sont évaluées par différence avec l'autre opérande d'un AND ; seule une
+        # négation isolée parcourt toutes les lignes.
+        noeud = self.arbre if noeud is None else noeud
+        operation = noeud[0]
+        if operation in ('terme', 'phrase'):
+            return postings(noeud)
+        if operation == 'non':
+            return np.setdiff1d(np.arange(nb_lignes), self.evaluer(postings, nb_lignes, noeud[1]), assume_unique=True)
+        gauche, droite = noeud[1], noeud[2]
+        if operation == 'et':
+            if droite[0] == 'non' and gauche[0] != 'non':
+                return np.setdiff1d(
+                    self.evaluer(postings, nb_lignes, gauche), self.evaluer(postings, nb_lignes, droite[1]),
+                    assume_unique=True
+                )
+            if gauche[0] == 'non' and droite[0] != 'non':
+                return np.setdiff1d(
+                    self.evaluer(postings, nb_lignes, droite), self.evaluer(postings, nb_lignes, gauche[1]),
+                    assume_unique=True
+                )
+            lignes_gauche = self.evaluer(postings, nb_lignes, gauche)
+            if len(lignes_gauche) == 0:
+                return lignes_gauche
+            return np.intersect1d(lignes_gauche, self.evaluer(postings, nb_lignes, droite), assume_unique=True)
+        return np.union1d(self.evaluer(postings, nb_lignes, gauche), self.evaluer(postings, nb_lignes, droite))
+
+    def __repr__(self):
+        return f"RequeteBooleenne({self.arbre!r})"
@@ -1,18 +1,50 @@
 import re
 import string
 import math
+import threading
+from bisect import bisect_left
+from functools import wraps
 import pandas as pd
 import numpy as np
+from datetime import datetime, timezone
 from scipy.sparse import csr_matrix, diags
 from tqdm import tqdm
 
+from classes.CorrecteurOrthographique import CorrecteurOrthographique
+from classes.IndexLSA import IndexLSA
+from classes.IndexPositionnel import IndexPositionnel
+from classes.PostingsCompresses import PostingsCompresses
+from classes.RequeteBooleenne import RequeteBooleenne
+from classes.SimHashLSH import SimHashLSH
+from classes.Vocabulaire import Vocabulaire
+
+
+# Jokers acceptés dans les mots-clés (voir SearchEngine.etendre_motif)
+JOKERS = '*?'
+
+
+def _sous_verrou(methode):
+    # --- Exécute la méthode sous le verrou du moteur : ajouter_documents ne publie pas un nouvel
+    # état pendant qu'elle lit l'ancien (les index construits à la demande sont aussi protégés) ---
+    @wraps(methode)
+    def appel(self, *args, **kwargs):
+        with self._verrou:
+            return methode(self, *args, **kwargs)
+    return appel
+
 
 class SearchEngine:
     # --- Moteur de recherche basé sur TFxIDF et similarité cosinus ---
     
-    def __init__(self, corpus):
+    def __init__(self, corpus, positionnel=False, compression=False):
         # --- Initialise le moteur de recherche avec un corpus ---
+        # positionnel : construire aussi l'index positionnel (requêtes de phrase)
+        # compression : construire les listes inversées compressées et calculer les scores dessus
         self.corpus = corpus
+        # Verrou de l'état publié (lectures et publication d'un lot) et verrou des écritures :
+        # ajouter_documents prépare le nouvel état hors du premier, les lots sont traités un par un
+        self._verrou = threading.RLock()
+        self._verrou_ecriture = threading.Lock()
         
         # Construire le vocabulaire de base et la matrice TF
         self.vocab_base, self.mots = self.construire_vocab_base()
@@ -24,8 +56,62 @@ class SearchEngine:
         # Construire la matrice TFxIDF
         self.mat_TFxIDF = self.construire_matrice_TFxIDF(self.mat_TF, self.vocab)
         
-        # Créer le mapping mot -> index pour la requête
-        self.mot_to_index = {mot: idx for idx, mot in enumerate(self.mots)}
+        # Mapping mot -> index pour la requête (celui du vocabulaire)
+        self.mot_to_index = self.vocab.mot_to_index
+        
+        # Ordre des lignes de la matrice (ligne i <-> i-ème document de id2doc)
+        self.doc_ids = list(self.corpus.id2doc.keys())
+        self.documents = list(self.corpus.id2doc.values())
+        self.doc_id_to_ligne = {doc_id: idx for idx, doc_id in enumerate(self.doc_ids)}
+        self.corpus_version = self.corpus.version
+        
+        # Cache de la matrice Auteurs x Termes (clé : version du corpus)
+        self._cache_comptes_auteurs = None
+        
+        # Normes des documents (calculées une seule fois pour toutes les requêtes)
+        self.normes_docs = self._calculer_normes_docs()
+        
+        # Masques booléens précalculés pour les filtres de recherche
+        self._construire_masques()
+        
+        # Index positionnel optionnel (construit à la demande sinon)
+        self.index_positionnel = None
+        
+        # Expansion des jokers (democra*, *cracy, wom?n) : nombre maximal de termes par motif
+        # et index des trigrammes du vocabulaire (construit à la première requête avec joker)
+        self.max_expansions = 50
+        self._index_kgrammes = None
+        
+        # Correction des mots hors vocabulaire : proposée après chaque recherche
+        # (dernieres_corrections), appliquée si correction_auto ou search(..., corriger=True)
+        self.correction_auto = False
+        self.dernieres_corrections = {}
+        self._correcteur = None
+        
+        # Matrice TF au format CSC : listes triées des lignes de chaque terme (requêtes booléennes)
+        self._mat_TF_csc = None
+        
+        # Lignes TFxIDF normalisées (documents similaires), calculées à la première utilisation
+        self._mat_normalisee = None
+        # Index approximatif des plus proches voisins (SimHashLSH) pour similar(approx=True) ; invalidé
+        # par ajouter_documents et reconstruit avec les mêmes paramètres à la prochaine utilisation
+        self.index_ann = None
+        self._parametres_ann = {}
+        # Index sémantique latent (IndexLSA) pour search(lsa=True) ; invalidé par ajouter_documents
+        # et reconstruit au même rang à la prochaine recherche sémantique
+        self.index_lsa = None
+        self._rang_lsa = 100
+        
+        # Listes inversées compressées (PostingsCompresses) : si elles existent, la recherche
+        # calcule les scores terme par terme sur elles au lieu du produit avec mat_TFxIDF
+        self.index_compresse = None
+        # Vrai quand ajouter_documents a modifié la matrice TF : l'index compressé est reconstruit
+        # à sa prochaine utilisation (pas à chaque lot d'une ingestion continue)
+        self._index_compresse_perime = False
+        if positionnel:
+            self.construire_index_positionnel()
+        if compression:
+            self.construire_index_compresse()
     
     def construire_vocab_base(self):
         # --- Construit le vocabulaire de base (sans les stats) ---
@@ -60,16 +146,8 @@ class SearchEngine:
         # Nombre de documents contenant le mot = nombre de lignes non nulles pour chaque colonne
         nb_documents = (mat_TF > 0).sum(axis=0).A1  # Compte les valeurs > 0 par colonne
         
-        # Construire le dictionnaire vocab
-        vocab = {}
-        for idx, mot in enumerate(mots):
-            vocab[mot] = {
-                'id': idx + 1,
-                'nb_occurrences': int(nb_occurrences[idx]),
-                'nb_documents': int(nb_documents[idx])
-            }
-        
-        return vocab
+        # Vocabulaire : mot -> {'id', 'nb_occurrences', 'nb_documents'} (statistiques en tableaux)
+        return Vocabulaire(mots, nb_occurrences, nb_documents)
     
     def construire_matrice_TF(self, vocab=None):
         # --- Construit la matrice Documents x Termes (Term Frequency) ---
@@ -135,53 +213,371 @@ class SearchEngine:
         
         # Calculer l'IDF pour chaque terme
         # IDF(t) = log(N / df(t)) où df(t) est le nombre de documents contenant le terme t
-        mots = sorted(vocab.keys())
-        idf_values = []
-        
-        for mot in mots:
-            df_t = vocab[mot]['nb_documents']
-            if df_t > 0:
-                idf = math.log(N / df_t)
-            else:
-                idf = 0 
-            idf_values.append(idf)
-        
-        # Convertir en array numpy pour la multiplication
-        idf_array = np.array(idf_values)
+        if isinstance(vocab, Vocabulaire):
+            nb_documents = vocab.nb_documents
+        else:
+            nb_documents = np.array([vocab[mot]['nb_documents'] for mot in sorted(vocab.keys())])
+        idf_array = self._idf(nb_documents, N)
         
         # Multiplier chaque colonne de la matrice TF par l'IDF correspondant
-        idf_diag = diags(idf_array, format='csr')
-        
-        # Multiplier mat_TF par la diagonale IDF (chaque colonne est multipliée par son IDF)
-        mat_TFxIDF = mat_TF.dot(idf_diag)
+        # (chaque valeur non nulle par l'IDF de sa colonne, sans produit matriciel)
+        mat_TF = mat_TF.tocsr()
+        mat_TFxIDF = csr_matrix(
+            (mat_TF.data * idf_array[mat_TF.indices], mat_TF.indices.copy(), mat_TF.indptr.copy()),
+            shape=mat_TF.shape
+        )
         
         return mat_TFxIDF
     
-    def search(self, mots_cles, nb_documents=10):
+    @staticmethod
+    def _idf(nb_documents, N):
+        # --- IDF de chaque terme (0 pour un terme sans document) ---
+        idf = np.zeros(len(nb_documents))
+        presents = nb_documents > 0
+        idf[presents] = np.log(N / nb_documents[presents])
+        return idf
+    
+    def ajouter_documents(self, doc_ids):
+        # --- Met à jour l'index avec des documents du corpus (nouveaux ou modifiés) en une étape ---
+        # Les nouveaux documents sont ajoutés en fin de matrice (même ordre que id2doc), les
+        # documents déjà indexés sont remplacés. Seuls les documents du lot sont tokenisés ; le
+        # vocabulaire, les statistiques des termes et les colonnes des filtres sont mis à jour sur
+        # les seuls mots et lignes du lot. L'IDF dépend du nombre de documents : la pondération et
+        # les normes sont recalculées par opérations vectorisées sur les tableaux de la matrice.
+        # Le nouvel état est construit sur des copies puis publié d'un coup sous le verrou : une
+        # recherche concurrente voit l'index avant ou après le lot, jamais à moitié mis à jour.
+        # Les index optionnels (positionnel, compressé...) sont seulement invalidés et reconstruits
+        # à leur prochaine utilisation.
+        with self._verrou_ecriture:
+            self._ajouter_documents(doc_ids)
+    
+    def _ajouter_documents(self, doc_ids):
+        nouveaux_ids = []
+        lignes_modifiees = []
+        for doc_id in dict.fromkeys(doc_ids):
+            if doc_id in self.doc_id_to_ligne:
+                lignes_modifiees.append(self.doc_id_to_ligne[doc_id])
+            elif doc_id in self.corpus.id2doc:
+                nouveaux_ids.append(doc_id)
+        if not nouveaux_ids and not lignes_modifiees:
+            return
+        
+        nb_anciennes = len(self.doc_ids)
+        nb_lignes = nb_anciennes + len(nouveaux_ids)
+        lignes_docs = lignes_modifiees + list(range(nb_anciennes, nb_lignes))
+        documents_lot = [self.corpus.id2doc[self.doc_ids[l]] for l in lignes_modifiees]
+        documents_lot += [self.corpus.id2doc[doc_id] for doc_id in nouveaux_ids]
+        
+        # Compter les mots des documents du lot
+        comptes_docs = []
+        nouveaux_mots = set()
+        for doc in documents_lot:
+            compteur_mots = {}
+            for mot in self._tokeniser(doc.texte or ''):
+                compteur_mots[mot] = compteur_mots.get(mot, 0) + 1
+                if mot not in self.mot_to_index:
+                    nouveaux_mots.add(mot)
+            comptes_docs.append(compteur_mots)
+        
+        # Agrandir le vocabulaire en gardant les mots triés : renuméroter les colonnes existantes
+        ancienne = self.mat_TF
+        if nouveaux_mots:
+            vocab, ancien_vers_nouveau = self.vocab.etendre(nouveaux_mots)
+            indices = ancien_vers_nouveau[ancienne.indices]
+        else:
+            vocab = Vocabulaire(
+                self.mots, self.vocab.nb_occurrences.copy(), self.vocab.nb_documents.copy(), self.mot_to_index
+            )
+            indices = ancienne.indices
+        nb_termes = len(vocab.mots)
+        
+        # Lignes du lot (modifiées puis nouvelles)
+        data, row_indices, col_indices = [], [], []
+        for ligne, compteur_mots in zip(lignes_docs, comptes_docs):
+            for mot, tf in compteur_mots.items():
+                data.append(tf)
+                row_indices.append(ligne)
+                col_indices.append(vocab.mot_to_index[mot])
+        mat_lot = csr_matrix((data, (row_indices, col_indices)), shape=(nb_lignes, nb_termes))
+        
+        # Nouvelle matrice TF (nouveaux tableaux : la matrice publiée n'est pas modifiée) : anciennes
+        # lignes sans les entrées des lignes modifiées, étendue aux nouvelles lignes, plus le lot
+        data, indptr = ancienne.data, ancienne.indptr
+        if lignes_modifiees:
+            nb_par_ligne = np.diff(indptr)
+            garder = np.ones(nb_anciennes, dtype=bool)
+            garder[lignes_modifiees] = False
+            entrees = np.repeat(garder, nb_par_ligne)
+            # Statistiques des termes des anciennes versions retirées
+            retirees = ~entrees
+            np.subtract.at(vocab.nb_occurrences, indices[retirees], data[retirees].astype(np.int64))
+            np.subtract.at(vocab.nb_documents, indices[retirees], 1)
+            data, indices = data[entrees], indices[entrees]
+            indptr = np.concatenate([[0], np.cumsum(nb_par_ligne * garder)])
+        indptr = np.concatenate([indptr, np.full(len(nouveaux_ids), indptr[-1])])
+        mat_TF = csr_matrix((data, indices, indptr), shape=(nb_lignes, nb_termes)) + mat_lot
+        
+        # Statistiques des seuls termes touchés par le lot
+        np.add.at(vocab.nb_occurrences, mat_lot.indices, mat_lot.data.astype(np.int64))
+        np.add.at(vocab.nb_documents, mat_lot.indices, 1)
+        
+        # Pondération IDF et normes (vectorisées)
+        mat_TFxIDF = self.construire_matrice_TFxIDF(mat_TF, vocab)
+        normes_docs = self._calculer_normes_docs(mat_TFxIDF)
+        
+        # Ordre des lignes et documents remplacés (copies)
+        doc_ids = self.doc_ids + nouveaux_ids
+        documents = list(self.documents)
+        for ligne, doc in zip(lignes_modifiees, documents_lot):
+            documents[ligne] = doc
+        documents.extend(documents_lot[len(lignes_modifiees):])
+        doc_id_to_ligne = dict(self.doc_id_to_ligne)
+        doc_id_to_ligne.update(zip(nouveaux_ids, range(nb_anciennes, nb_lignes)))
+        masques = self._masques_lot(lignes_docs, [doc_ids[l] for l in lignes_docs], documents_lot)
+        
+        # Publication du nouvel état
+        with self._verrou:
+            self.mat_TF = mat_TF
+            self.vocab = vocab
+            self.vocab_base = vocab
+            self.mots = vocab.mots
+            self.mot_to_index = vocab.mot_to_index
+            self.mat_TFxIDF = mat_TFxIDF
+            self.normes_docs = normes_docs
+            self.doc_ids = doc_ids
+            self.documents = documents
+            self.doc_id_to_ligne = doc_id_to_ligne
+            for nom, valeur in masques.items():
+                setattr(self, nom, valeur)
+            self._cache_masques = {}
+            self.corpus_version = self.corpus.version
+            self._cache_comptes_auteurs = None
+            self._mat_TF_csc = None
+            self._mat_normalisee = None
+            # Les ids de colonne ont pu changer : l'index positionnel est reconstruit à la prochaine phrase
+            self.index_positionnel = None
+            if self.index_compresse is not None:
+                self._index_compresse_perime = True
+            # Index ANN et SVD recalculés à leur prochaine utilisation (mêmes paramètres), pas à chaque lot
+            self.index_ann = None
+            self.index_lsa = None
+            if nouveaux_mots:
+                self._index_kgrammes = None
+                self._correcteur = None
+    
+    def _masques_lot(self, lignes, doc_ids, documents):
+        # --- Colonnes des filtres après un lot : copies mises à jour sur les seules lignes du lot ---
+        # lignes : lignes du lot (modifiées puis nouvelles, ces dernières à la suite des anciennes)
+        # doc_ids, documents : doc_id et document de chacune de ces lignes
+        nb_lignes = max(len(self.doc_ids), max(lignes) + 1)
+        
+        def etendre(colonne, valeurs):
+            nouvelle = np.empty(nb_lignes, dtype=colonne.dtype)
+            nouvelle[:len(colonne)] = colonne
+            nouvelle[lignes] = valeurs
+            return nouvelle
+        
+        auteur_to_code = dict(self.auteur_to_code)
+        source_to_code = dict(self.source_to_code)
+        return {
+            'codes_auteur': etendre(self.codes_auteur, [
+                auteur_to_code.setdefault(doc.auteur or 'inconnu', len(auteur_to_code)) for doc in documents
+            ]),
+            'auteur_to_code': auteur_to_code,
+            'codes_source': etendre(self.codes_source, [
+                source_to_code.setdefault(doc.getType(), len(source_to_code)) for doc in documents
+            ]),
+            'source_to_code': source_to_code,
+            'doc_dates': etendre(self.doc_dates, self._normaliser_dates([doc.date for doc in documents])),
+            'doc_nb_commentaires': etendre(
+                self.doc_nb_commentaires, [getattr(doc, 'nb_commentaires', -1) for doc in documents]
+            ),
+            'groupes': etendre(self.groupes, [self.corpus.canonique.get(doc_id, doc_id) for doc_id in doc_ids]),
+        }
+    
+    def _construire_masques(self):
+        # --- Précalcule les colonnes utilisées par les filtres (une valeur par ligne de la matrice) ---
+        # Auteurs et sources : un code entier par ligne (les masques booléens sont mis en cache)
+        self.codes_auteur, self.auteur_to_code = self._encoder_valeurs(
+            [doc.auteur or 'inconnu' for doc in self.documents]
+        )
+        self.codes_source, self.source_to_code = self._encoder_valeurs(
+            [doc.getType() for doc in self.documents]
+        )
+        self._cache_masques = {}
+        
+        # Dates : datetime64 (NaT si la date est absente ou illisible)
+        self.doc_dates = self._normaliser_dates([doc.date for doc in self.documents])
+        
+        # Nombre de commentaires : -1 pour les documents qui n'en ont pas (non Reddit)
+        self.doc_nb_commentaires = np.array(
+            [getattr(doc, 'nb_commentaires', -1) for doc in self.documents],
+            dtype=np.int64
+        )
+        
+        # Groupe de quasi-doublons : doc_id du document canonique de chaque ligne
+        self.groupes = np.array(
+            [self.corpus.canonique.get(doc_id, doc_id) for doc_id in self.doc_ids], dtype=np.int64
+        )
+    
+    @staticmethod
+    def _encoder_valeurs(valeurs):
+        # --- Associe un code entier à chaque valeur distincte ---
+        valeur_to_code = {}
+        codes = np.empty(len(valeurs), dtype=np.int32)
+        for idx, valeur in enumerate(valeurs):
+            codes[idx] = valeur_to_code.setdefault(valeur, len(valeur_to_code))
+        return codes, valeur_to_code
+    
+    def _masque_valeurs(self, nom, codes, valeur_to_code, valeurs):
+        # --- Masque booléen des lignes dont la valeur appartient à `valeurs` (mis en cache) ---
+        if isinstance(valeurs, str):
+            valeurs = [valeurs]
+        cle = (nom, tuple(sorted(set(valeurs))))
+        if cle not in self._cache_masques:
+            codes_voulus = [valeur_to_code[v] for v in cle[1] if v in valeur_to_code]
+            self._cache_masques[cle] = np.isin(codes, codes_voulus)
+        return self._cache_masques[cle]
+    
+    @staticmethod
+    def _normaliser_dates(dates):
+        # --- Convertit une liste de dates hétérogènes en tableau datetime64 ---
+        valeurs = []
+        for value in dates:
+            if isinstance(value, datetime) and value.tzinfo is not None:
+                # Ramener en UTC naïf pour pouvoir comparer toutes les dates entre elles
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            valeurs.append(value)
+        # Chaque valeur distincte n'est convertie qu'une fois (les phrases d'un discours partagent sa date)
+        codes, distinctes = pd.factorize(pd.Series(valeurs, dtype=object))
+        # Chaînes avec et sans fuseau (ex. '...Z' et '2024-01-20') : tout est ramené en UTC naïf
+        serie = pd.to_datetime(
+            pd.Series(distinctes, dtype=object), errors='coerce', format='mixed', utc=True
+        ).dt.tz_localize(None)
+        # Code -1 (valeur absente) : dernière case, NaT
+        return np.append(serie.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'))[codes]
+    
+    def _construire_masque_filtres(self, auteur=None, source=None, date_min=None, date_max=None,
+                                   nb_commentaires_min=None, nb_commentaires_max=None):
+        # --- Combine les masques précalculés ; renvoie None si aucun filtre n'est demandé ---
+        masque = None
+        
+        def combiner(masque_courant, nouveau):
+            return nouveau if masque_courant is None else masque_courant & nouveau
+        
+        # auteur / source : une valeur ou une liste de valeurs (OU logique)
+        if auteur is not None:
+            masque = combiner(masque, self._masque_valeurs(
+                'auteur', self.codes_auteur, self.auteur_to_code, auteur))
+        if source is not None:
+            masque = combiner(masque, self._masque_valeurs(
+                'source', self.codes_source, self.source_to_code, source))
+        
+        if date_min is not None:
+            borne = self._normaliser_dates([date_min])[0]
+            masque = combiner(masque, self.doc_dates >= borne)
+        if date_max is not None:
+            borne = self._normaliser_dates([date_max])[0]
+            masque = combiner(masque, self.doc_dates <= borne)
+        
+        if nb_commentaires_min is not None:
+            masque = combiner(masque, self.doc_nb_commentaires >= nb_commentaires_min)
+        if nb_commentaires_max is not None:
+            masque = combiner(
+                masque,
+                (self.doc_nb_commentaires >= 0) & (self.doc_nb_commentaires <= nb_commentaires_max)
+            )
+        
+        return masque
+    
+    @_sous_verrou
+    def search(self, mots_cles, nb_documents=10, auteur=None, source=None, date_min=None,
+               date_max=None, nb_commentaires_min=None, nb_commentaires_max=None, regrouper=None,
+               phrase=False, slop=0, corriger=None, booleen=False, lsa=False):
         # --- Recherche de documents basée sur les mots-clés ---
         # mots_cles : liste de mots-clés de la requête
         # nb_documents : nombre de documents à retourner
+        # auteur, source : valeur ou liste de valeurs (source = doc.getType())
+        # date_min, date_max : bornes incluses (datetime ou chaîne)
+        # nb_commentaires_min, nb_commentaires_max : bornes incluses (documents Reddit)
+        # Les filtres sont appliqués avant la sélection des nb_documents meilleurs.
+        # regrouper : ne garder que le meilleur document de chaque groupe de quasi-doublons
+        #             (par défaut si la politique du corpus est 'regrouper')
+        # phrase : ne garder que les documents contenant les mots-clés dans cet ordre, avec au
+        #          plus `slop` mots intercalés (index positionnel)
+        # corriger : remplacer les mots hors vocabulaire par leur correction (défaut : correction_auto) ;
+        #            les corrections trouvées sont toujours proposées dans self.dernieres_corrections
+        # booleen : mots_cles est une requête booléenne (democracy AND NOT war, (economy OR jobs) AND america,
+        #           "middle class") ; seuls les documents qui la satisfont sont classés, par cosinus
+        #           avec ses termes non niés
+        # lsa : classer par cosinus dans l'espace latent (IndexLSA, construit au besoin) : les documents
+        #       proches du sens de la requête sont trouvés même sans ses mots (corpus de moins de 2
+        #       documents ou termes : pas d'espace latent, classement par le cosinus habituel)
+        if corriger is None:
+            corriger = self.correction_auto
+        if regrouper is None:
+            regrouper = self.corpus.politique_quasi_doublons == 'regrouper'
+        
+        if booleen:
+            requete_booleenne = RequeteBooleenne(mots_cles if isinstance(mots_cles, str) else ' '.join(mots_cles))
+            mots_cles = requete_booleenne.termes_positifs()
         
         # Transformer la requête en vecteur
-        vecteur_requete = self._construire_vecteur_requete(mots_cles)
-        
-        # Calculer la similarité cosinus avec tous les documents
-        scores = self._calculer_similarite_cosinus(vecteur_requete)
-        
-        # Trier les scores par ordre décroissant
-        indices_tries = np.argsort(scores)[::-1]
+        vecteur_requete = self._construire_vecteur_requete(mots_cles, corriger=corriger)
+        
+        # Lignes de la matrice retenues par les filtres (None = toutes)
+        masque = self._construire_masque_filtres(
+            auteur=auteur, source=source, date_min=date_min, date_max=date_max,
+            nb_commentaires_min=nb_commentaires_min, nb_commentaires_max=nb_commentaires_max
+        )
+        if phrase:
+            masque_phrase = self._masque_phrase(mots_cles, slop)
+            masque = masque_phrase if masque is None else masque & masque_phrase
+        lignes = None if masque is None else np.flatnonzero(masque)
+        if booleen:
+            lignes_booleennes = self._lignes_booleennes(requete_booleenne, corriger=corriger)
+            lignes = lignes_booleennes if lignes is None else np.intersect1d(lignes, lignes_booleennes, assume_unique=True)
+        
+        # Calculer la similarité cosinus avec les documents retenus uniquement
+        if lsa and self.index_lsa is None and min(self.mat_TFxIDF.shape) >= 2:
+            self.construire_index_lsa(self._rang_lsa)
+        if lsa and self.index_lsa is not None:
+            scores = self.index_lsa.scores(vecteur_requete, lignes)
+        elif self.index_compresse is not None:
+            scores = self._calculer_scores_postings(vecteur_requete, lignes)
+        else:
+            scores = self._calculer_similarite_cosinus(vecteur_requete, lignes)
+        if lignes is None:
+            lignes = np.arange(len(scores))
+        
+        # Sélectionner les nb_documents meilleurs scores puis les trier par ordre décroissant
+        nb_docs_a_traiter = min(nb_documents, len(scores))
+        if nb_docs_a_traiter <= 0:
+            return pd.DataFrame()
+        if regrouper:
+            # Trier les documents pertinents puis garder la première occurrence de chaque groupe
+            pertinents = np.arange(len(scores)) if booleen else np.flatnonzero(scores > 0)
+            ordre = pertinents[np.argsort(-scores[pertinents], kind='stable')]
+            _, premiers = np.unique(self.groupes[lignes[ordre]], return_index=True)
+            indices_tries = ordre[np.sort(premiers)][:nb_documents]
+            nb_docs_a_traiter = len(indices_tries)
+        else:
+            meilleurs = np.argpartition(-scores, nb_docs_a_traiter - 1)[:nb_docs_a_traiter]
+            indices_tries = meilleurs[np.argsort(-scores[meilleurs], kind='stable')]
         
         # Récupérer les nb_documents meilleurs résultats
         resultats = []
-        documents = list(self.corpus.id2doc.values())
+        documents = self.documents
         
-        nb_docs_a_traiter = min(nb_documents, len(indices_tries))
         for i in tqdm(range(nb_docs_a_traiter), desc="Recherche en cours", unit="doc"):
-            doc_idx = indices_tries[i]
-            score = scores[doc_idx]
-            if score > 0:  # Ne garder que les documents avec un score > 0
+            score = scores[indices_tries[i]]
+            doc_idx = lignes[indices_tries[i]]
+            # Ne garder que les documents avec un score > 0 (en mode booléen, tous ceux qui satisfont
+            # la requête : une requête sans terme positif, ex. NOT war, donne des scores nuls)
+            if score > 0 or booleen:
                 doc = documents[doc_idx]
                 resultats.append({
+                    'id': self.doc_ids[doc_idx],
                     'titre': doc.titre,
                     'auteur': doc.auteur,
                     'source': doc.getType(),
@@ -189,27 +585,302 @@ class SearchEngine:
                     'url': doc.url,
                     'score': float(score)
                 })
+                if regrouper:
+                    groupe = int(self.groupes[doc_idx])
+                    resultats[-1]['nb_quasi_doublons'] = len(self.corpus.quasi_doublons.get(groupe, []))
         
         # Créer un DataFrame pandas avec les résultats
         df_resultats = pd.DataFrame(resultats)
         
         return df_resultats
     
-    def _construire_vecteur_requete(self, mots_cles):
+    def _matrice_auteurs_termes(self):
+        # --- Matrice Auteurs x Termes = indicatrice Auteurs x Documents · TF (mise en cache) ---
+        if self._cache_comptes_auteurs is None or self._cache_comptes_auteurs[0] != self.corpus_version:
+            indicatrice = self._indicatrice_auteurs()
+            comptes = indicatrice.dot(self.mat_TF).tocsc()
+            self._cache_comptes_auteurs = (self.corpus_version, indicatrice, comptes)
+        return self._cache_comptes_auteurs[1], self._cache_comptes_auteurs[2]
+    
+    def _indicatrice_auteurs(self):
+        # --- Matrice creuse Auteurs x Documents (1 si le document est de l'auteur) ---
+        nb_docs = len(self.documents)
+        return csr_matrix(
+            (np.ones(nb_docs, dtype=np.int64), (self.codes_auteur, np.arange(nb_docs))),
+            shape=(len(self.auteur_to_code), nb_docs)
+        )
+    
+    @_sous_verrou
+    def comptes_par_auteur(self, mots, auteurs=None, doc_ids=None):
+        # --- Nombre d'occurrences de chaque mot par auteur (DataFrame Auteurs x Mots) ---
+        # mots : liste de mots (nettoyés comme les documents ; absents du vocabulaire -> 0)
+        # auteurs : liste des auteurs à garder (None = tous)
+        # doc_ids : ids des documents à prendre en compte, par ex. resultats['id'] (None = tout le corpus)
+        termes = []
+        for mot in mots:
+            termes.extend(self._tokeniser(mot))
+        termes = list(dict.fromkeys(termes))
+        colonnes = [self.mot_to_index[t] for t in termes if t in self.mot_to_index]
+        
+        indicatrice, comptes = self._matrice_auteurs_termes()
+        if doc_ids is not None:
+            # Restreindre aux documents demandés : indicatrice[:, lignes] · TF[lignes]
+            lignes = np.array(
+                [self.doc_id_to_ligne[d] for d in doc_ids if d in self.doc_id_to_ligne], dtype=np.int64
+            )
+            sous_tf = self.mat_TF[lignes][:, colonnes]
+            valeurs = indicatrice[:, lignes].dot(sous_tf).toarray()
+        else:
+            valeurs = comptes[:, colonnes].toarray()
+        
+        noms_auteurs = sorted(self.auteur_to_code, key=self.auteur_to_code.get)
+        df = pd.DataFrame(0, index=noms_auteurs, columns=termes, dtype=np.int64)
+        if colonnes:
+            df[[t for t in termes if t in self.mot_to_index]] = valeurs
+        df.index.name = 'auteur'
+        
+        if auteurs is not None:
+            df = df.reindex(list(auteurs), fill_value=0)
+        return df
+    
+    def matrice_normalisee(self):
+        # --- Matrice TFxIDF dont chaque ligne est divisée par sa norme (mise en cache) ---
+        # Le produit scalaire de deux lignes est directement leur similarité cosinus
+        if self._mat_normalisee is None:
+            self._mat_normalisee = diags(1 / self.normes_docs, format='csr').dot(self.mat_TFxIDF).tocsr()
+        return self._mat_normalisee
+    
+    @_sous_verrou
+    def construire_index_lsa(self, rang=100):
+        # --- Construit l'index sémantique latent (SVD tronquée de mat_TFxIDF) ---
+        # Le rang est borné par les dimensions de la matrice : il faut au moins 2 documents et 2 termes
+        if min(self.mat_TFxIDF.shape) < 2:
+            raise ValueError(
+                f"Index LSA impossible : {self.mat_TFxIDF.shape[0]} document(s) et "
+                f"{self.mat_TFxIDF.shape[1]} terme(s) (au moins 2 de chaque)"
+            )
+        self._rang_lsa = rang
+        self.index_lsa = IndexLSA(self.mat_TFxIDF, rang=min(rang, min(self.mat_TFxIDF.shape) - 1))
+        return self.index_lsa
+    
+    @_sous_verrou
+    def construire_index_ann(self, nb_bandes=32, bits_par_bande=10, nb_sondes=4):
+        # --- Construit l'index approximatif des plus proches voisins sur les lignes normalisées ---
+        self._parametres_ann = {'nb_bandes': nb_bandes, 'bits_par_bande': bits_par_bande, 'nb_sondes': nb_sondes}
+        self.index_ann = SimHashLSH(
+            self.matrice_normalisee(), nb_bandes=nb_bandes, bits_par_bande=bits_par_bande, nb_sondes=nb_sondes
+        )
+        return self.index_ann
+    
+    @_sous_verrou
+    def similar(self, doc_id, k=10, approx=False, nb_sondes=None):
+        # --- Les k documents les plus similaires à un document de l'index (similarité cosinus) ---
+        # La ligne normalisée du document sert de requête : un produit creux puis une sélection top-k.
+        # approx : seuls les candidats de l'index SimHashLSH (construit au besoin) sont scorés ;
+        # nb_sondes règle le compromis rappel / latence (None : valeur de l'index).
+        # Renvoie un DataFrame (mêmes colonnes que search), le document lui-même exclu.
+        if doc_id not in self.doc_id_to_ligne:
+            raise ValueError(f"Document {doc_id} absent de l'index")
+        ligne = self.doc_id_to_ligne[doc_id]
+        matrice = self.matrice_normalisee()
+        if approx:
+            if self.index_ann is None:
+                self.construire_index_ann(**self._parametres_ann)
+            meilleurs, scores_meilleurs = self.index_ann.chercher(matrice[ligne], k, nb_sondes, exclure=ligne)
+        else:
+            scores = matrice.dot(matrice[ligne].T).toarray().ravel()
+            scores[ligne] = 0
+            pertinents = np.flatnonzero(scores > 0)
+            k = min(k, len(pertinents))
+            meilleurs = pertinents[np.argpartition(-scores[pertinents], k - 1)[:k]] if k > 0 else pertinents
+            meilleurs = meilleurs[np.argsort(-scores[meilleurs], kind='stable')]
+            scores_meilleurs = scores[meilleurs]
+        if len(meilleurs) == 0:
+            return pd.DataFrame()
+        
+        resultats = []
+        for ligne_voisin, score in zip(meilleurs, scores_meilleurs):
+            doc = self.documents[ligne_voisin]
+            resultats.append({
+                'id': self.doc_ids[ligne_voisin],
+                'titre': doc.titre,
+                'auteur': doc.auteur,
+                'source': doc.getType(),
+                'date': doc.date,
+                'url': doc.url,
+                'score': float(score)
+            })
+        return pd.DataFrame(resultats)
+    
+    @_sous_verrou
+    def voisins(self, k=10, taille_bloc=None, memoire_max=256 * 2 ** 20):
+        # --- Les k plus proches voisins de chaque document (similarité cosinus, tous les couples) ---
+        # Les similarités sont calculées par blocs de lignes (bloc x tous les documents, en dense) :
+        # la mémoire de travail reste sous memoire_max octets quelle que soit la taille du corpus.
+        # Renvoie (voisins, scores), tableaux (nb documents x k) : voisins[i] contient les doc_ids des
+        # voisins du i-ème document de self.doc_ids, par score décroissant (-1 / 0 s'il en manque).
+        matrice = self.matrice_normalisee()
+        transposee = matrice.T.tocsr()
+        N = matrice.shape[0]
+        k = min(k, max(N - 1, 0))
+        if taille_bloc is None:
+            # Par score du bloc : 8 octets (bloc dense) + 8 (indices d'argpartition) + au plus 12
+            # (produit creux : valeur et indice de colonne, avant conversion en dense)
+            taille_bloc = max(1, int(memoire_max // (28 * max(N, 1))))
+        doc_ids = np.array(self.doc_ids)
+        voisins = np.full((N, k), -1, dtype=doc_ids.dtype if N else np.int64)
+        scores_voisins = np.zeros((N, k))
+        if k <= 0:
+            return voisins, scores_voisins
+        for debut in tqdm(range(0, N, taille_bloc), desc="Voisins", unit="bloc"):
+            fin = min(debut + taille_bloc, N)
+            scores = matrice[debut:fin].dot(transposee).toarray()
+            # Exclure chaque document de ses propres voisins
+            scores[np.arange(fin - debut), np.arange(debut, fin)] = 0
+            # Négation sur place (pas de copie du bloc) pour sélectionner les plus grands scores
+            np.negative(scores, out=scores)
+            meilleurs = np.argpartition(scores, k - 1, axis=1)[:, :k]
+            scores_meilleurs = -np.take_along_axis(scores, meilleurs, axis=1)
+            ordre = np.argsort(-scores_meilleurs, axis=1, kind='stable')
+            meilleurs = np.take_along_axis(meilleurs, ordre, axis=1)
+            scores_meilleurs = np.take_along_axis(scores_meilleurs, ordre, axis=1)
+            voisins[debut:fin] = np.where(scores_meilleurs > 0, doc_ids[meilleurs], -1)
+            scores_voisins[debut:fin] = scores_meilleurs
+        return voisins, scores_voisins
+    
+    @_sous_verrou
+    def construire_index_positionnel(self):
+        # --- Construit l'index positionnel à partir des textes (mêmes mots que la matrice TF) ---
+        lignes_mots = [
+            np.array([self.mot_to_index[mot] for mot in self._tokeniser(doc.texte or '')], dtype=np.int64)
+            for doc in self.documents
+        ]
+        self.index_positionnel = IndexPositionnel(lignes_mots, len(self.mots))
+        return self.index_positionnel
+    
+    def _lignes_phrase(self, mots, slop=0):
+        # --- Lignes contenant la phrase et nombre d'occurrences (index positionnel) ---
+        if self.index_positionnel is None:
+            self.construire_index_positionnel()
+        termes = [self.mot_to_index.get(mot) for mot_cle in mots for mot in self._tokeniser(mot_cle)]
+        return self.index_positionnel.phrase(termes, slop)
+    
+    def _masque_phrase(self, mots, slop=0):
+        masque = np.zeros(len(self.doc_ids), dtype=bool)
+        masque[self._lignes_phrase(mots, slop)[0]] = True
+        return masque
+    
+    @_sous_verrou
+    def occurrences_phrase(self, mots, slop=0):
+        # --- Nombre d'occurrences de la phrase par document (Series indexée par doc_id) ---
+        # mots : liste de mots (ou de groupes de mots) dans l'ordre de la phrase
+        # slop : nombre total de mots intercalés autorisés entre les mots de la phrase
+        lignes, nb = self._lignes_phrase(mots, slop)
+        return pd.Series(nb, index=pd.Index([self.doc_ids[l] for l in lignes], name='id'), name='occurrences')
+    
+    @_sous_verrou
+    def construire_index_compresse(self, taille_bloc=128):
+        # --- Construit les listes inversées compressées à partir de la matrice TF ---
+        self.index_compresse = PostingsCompresses(self.mat_TF, taille_bloc=taille_bloc)
+        self._index_compresse_perime = False
+        return self.index_compresse
+    
+    def _actualiser_index_compresse(self):
+        # --- Reconstruit l'index compressé s'il a été invalidé par ajouter_documents ---
+        if self._index_compresse_perime:
+            self.construire_index_compresse(self.index_compresse.taille_bloc)
+    
+    def _postings(self, terme):
+        # --- Lignes (triées) des documents contenant le terme d'id `terme` ---
+        if self.index_compresse is not None:
+            self._actualiser_index_compresse()
+            return self.index_compresse.postings(terme)[0]
+        if self._mat_TF_csc is None:
+            self._mat_TF_csc = self.mat_TF.tocsc()
+            self._mat_TF_csc.sort_indices()
+        indptr = self._mat_TF_csc.indptr
+        return self._mat_TF_csc.indices[indptr[terme]:indptr[terme + 1]].astype(np.int64)
+    
+    def _lignes_booleennes(self, requete, corriger=False):
+        # --- Lignes (triées) satisfaisant une requête booléenne (RequeteBooleenne ou chaîne) ---
+        # Évaluation par intersection / union / différence des listes triées de lignes : le coût est
+        # proportionnel aux postings des termes de la requête, pas à la taille du corpus.
+        if isinstance(requete, str):
+            requete = RequeteBooleenne(requete)
+        vide = np.empty(0, dtype=np.int64)
+        
+        def postings(feuille):
+            type_feuille, texte = feuille
+            if type_feuille == 'terme' and any(joker in texte for joker in JOKERS):
+                # Motif avec joker : union des termes correspondants
+                lignes = vide
+                for mot in self.etendre_motif(texte):
+                    lignes = np.union1d(lignes, self._postings(self.mot_to_index[mot]))
+                return lignes
+            mots = self._tokeniser(texte)
+            if corriger:
+                mots = [mot if mot in self.vocab else self.correcteur().corriger(mot) or mot for mot in mots]
+            if len(mots) == 1 and type_feuille == 'terme':
+                terme = self.mot_to_index.get(mots[0])
+                return vide if terme is None else self._postings(terme)
+            # Phrase entre guillemets (ou terme découpé en plusieurs mots, ex. middle-class)
+            return self._lignes_phrase(mots)[0] if mots else vide
+        
+        return requete.evaluer(postings, len(self.doc_ids))
+    
+    def _tokeniser(self, texte):
+        # --- Nettoie un texte et le découpe en mots (même traitement que les documents) ---
+        texte_nettoye = self.corpus.nettoyer_texte(texte)
+        delimiters = r'[\s' + re.escape(string.punctuation) + r']+'
+        return [m for m in re.split(delimiters, texte_nettoye) if m]
+    
+    @_sous_verrou
+    def correcteur(self):
+        # --- Correcteur orthographique du vocabulaire (construit à la première utilisation) ---
+        if self._correcteur is None:
+            self._correcteur = CorrecteurOrthographique.depuis_moteur(self)
+        return self._correcteur
+    
+    @_sous_verrou
+    def corriger_requete(self, mots_cles):
+        # --- Corrections proposées pour les mots hors vocabulaire : {mot: correction} ---
+        corrections = {}
+        for mot_cle in mots_cles:
+            for mot in self._tokeniser(mot_cle):
+                if mot not in self.vocab and mot not in corrections:
+                    correction = self.correcteur().corriger(mot)
+                    if correction is not None:
+                        corrections[mot] = correction
+        return corrections
+    
+    def _construire_vecteur_requete(self, mots_cles, corriger=False):
         # --- Construit le vecteur requête à partir des mots-clés ---
         import re
         import string
         import math
         
         # Nettoie et transforme les mots-clés en vecteur
+        # Les mots avec joker (* ou ?) sont remplacés par les termes du vocabulaire correspondants
+        # avant le nettoyage (qui supprimerait les jokers) ; ils sont scorés dans le même produit.
         requete_nettoyee = []
         for mot_cle in mots_cles:
+            if any(joker in mot_cle for joker in JOKERS):
+                mots_avec_joker = [m for m in mot_cle.split() if any(joker in m for joker in JOKERS)]
+                for motif in mots_avec_joker:
+                    requete_nettoyee.extend(self.etendre_motif(motif))
+                mot_cle = ' '.join(m for m in mot_cle.split() if m not in mots_avec_joker)
             mot_nettoye = self.corpus.nettoyer_texte(mot_cle)
             # Split pour obtenir les mots individuels
             delimiters = r'[\s' + re.escape(string.punctuation) + r']+'
             mots_split = re.split(delimiters, mot_nettoye)
             requete_nettoyee.extend([m for m in mots_split if m])
         
+        # Mots hors vocabulaire : correction proposée (et appliquée si demandé)
+        hors_vocabulaire = [mot for mot in requete_nettoyee if mot not in self.vocab]
+        self.dernieres_corrections = self.corriger_requete(hors_vocabulaire) if hors_vocabulaire else {}
+        if corriger:
+            requete_nettoyee = [self.dernieres_corrections.get(mot, mot) for mot in requete_nettoyee]
+        
         # Compter les occurrences dans la requête
         requete_freq = {}
         for mot in requete_nettoyee:
@@ -223,6 +894,7 @@ class SearchEngine:
             vecteur_requete[idx] = freq
         
         # Calculer l'IDF pour la requête et multiplier
+        # (un mot qui n'est plus dans aucun document après ajouter_documents a un poids nul)
         N = self.mat_TFxIDF.shape[0]
         for mot, freq in requete_freq.items():
             idx = self.mot_to_index[mot]
@@ -230,11 +902,98 @@ class SearchEngine:
             if df_t > 0:
                 idf = math.log(N / df_t)
                 vecteur_requete[idx] = freq * idf
+            else:
+                vecteur_requete[idx] = 0
         
         return vecteur_requete
     
-    def _calculer_similarite_cosinus(self, vecteur_requete):
-        # --- Calcule la similarité cosinus entre le vecteur requête et tous les documents ---
+    @_sous_verrou
+    def etendre_motif(self, motif, max_expansions=None):
+        # --- Termes du vocabulaire correspondant à un motif avec jokers (* : 0 ou plusieurs lettres, ? : une) ---
+        # Préfixe (democra*) : recherche dichotomique dans self.mots (trié).
+        # Autres motifs (*cracy, wom?n, e*omy) : candidats par intersection des trigrammes du
+        # motif, puis vérification par expression régulière.
+        # Au-delà de max_expansions termes, seuls les plus fréquents (en documents) sont gardés.
+        max_expansions = self.max_expansions if max_expansions is None else max_expansions
+        # Nettoyer les parties fixes comme les documents, sans toucher aux jokers
+        parties = re.split(r'([*?])', motif.lower())
+        motif = ''.join(
+            partie if partie in JOKERS else self.corpus.nettoyer_texte(partie).replace(' ', '')
+            for partie in parties
+        )
+        fixe = motif.rstrip('*')
+        if fixe and not any(joker in fixe for joker in JOKERS):
+            if fixe == motif:
+                return [fixe] if fixe in self.mot_to_index else []
+            debut = bisect_left(self.mots, fixe)
+            fin = bisect_left(self.mots, fixe + '\U0010ffff', lo=debut)
+            ids = np.arange(debut, fin)
+        else:
+            ids = self._candidats_kgrammes(motif)
+            expression = re.compile(''.join(
+                '.*' if c == '*' else '.' if c == '?' else re.escape(c) for c in motif
+            ))
+            ids = np.array([i for i in ids if expression.fullmatch(self.mots[i])], dtype=np.int64)
+        
+        if len(ids) > max_expansions:
+            nb_documents = np.array([self.vocab[self.mots[i]]['nb_documents'] for i in ids])
+            ids = np.sort(ids[np.argsort(-nb_documents, kind='stable')[:max_expansions]])
+        return [self.mots[i] for i in ids]
+    
+    def _candidats_kgrammes(self, motif, k=3):
+        # --- Ids des termes contenant tous les trigrammes des parties fixes du motif ---
+        if self._index_kgrammes is None:
+            index = {}
+            for idx, mot in enumerate(self.mots):
+                borne = f"${mot}$"
+                for i in range(len(borne) - k + 1):
+                    index.setdefault(borne[i:i + k], []).append(idx)
+            # Listes triées (ids croissants) converties en tableaux pour l'intersection
+            self._index_kgrammes = {kgramme: np.array(ids, dtype=np.int64) for kgramme, ids in index.items()}
+        
+        kgrammes = set()
+        for partie in re.split(r'[*?]', f"${motif}$"):
+            kgrammes.update(partie[i:i + k] for i in range(len(partie) - k + 1))
+        if not kgrammes:
+            # Motif sans partie fixe assez longue : tout le vocabulaire est candidat
+            return np.arange(len(self.mots))
+        listes = sorted(
+            (self._index_kgrammes.get(kgramme, np.empty(0, dtype=np.int64)) for kgramme in kgrammes), key=len
+        )
+        candidats = listes[0]
+        for liste in listes[1:]:
+            candidats = np.intersect1d(candidats, liste, assume_unique=True)
+        return candidats
+    
+    def _calculer_normes_docs(self, mat_TFxIDF=None):
+        # --- Norme euclidienne de chaque ligne de la matrice TFxIDF (par défaut self.mat_TFxIDF) ---
+        if mat_TFxIDF is None:
+            mat_TFxIDF = self.mat_TFxIDF
+        carres = csr_matrix((mat_TFxIDF.data ** 2, mat_TFxIDF.indices, mat_TFxIDF.indptr), shape=mat_TFxIDF.shape)
+        normes_docs = np.sqrt(np.asarray(carres.sum(axis=1)).ravel())
+        # Éviter division par zéro
+        return np.where(normes_docs > 0, normes_docs, 1)
+    
+    def _calculer_scores_postings(self, vecteur_requete, lignes=None):
+        # --- Similarité cosinus calculée terme par terme sur les listes inversées compressées ---
+        # Seuls les postings des termes de la requête sont décodés ; mêmes scores que
+        # _calculer_similarite_cosinus (tf * idf du document, poids normalisé de la requête).
+        self._actualiser_index_compresse()
+        norme_requete = np.linalg.norm(vecteur_requete)
+        scores = np.zeros(len(self.doc_ids))
+        N = len(self.doc_ids)
+        for terme in np.flatnonzero(vecteur_requete):
+            if self.index_compresse.nb_documents[terme] == 0:
+                continue
+            lignes_terme, tf = self.index_compresse.postings(terme)
+            idf = math.log(N / self.index_compresse.nb_documents[terme])
+            scores[lignes_terme] += tf * idf * (vecteur_requete[terme] / norme_requete)
+        scores = scores / self.normes_docs
+        return scores if lignes is None else scores[lignes]
+    
+    def _calculer_similarite_cosinus(self, vecteur_requete, lignes=None):
+        # --- Calcule la similarité cosinus entre le vecteur requête et les documents ---
+        # lignes : indices des lignes à scorer (None = tous les documents)
         # Normaliser le vecteur requête
         norme_requete = np.linalg.norm(vecteur_requete)
         if norme_requete > 0:
@@ -242,14 +1001,16 @@ class SearchEngine:
         else:
             vecteur_requete_normalise = vecteur_requete
         
-        # Normaliser chaque ligne de la matrice (chaque document)
-        normes_docs = np.sqrt(np.array(self.mat_TFxIDF.multiply(self.mat_TFxIDF).sum(axis=1)).flatten())
-        # Éviter division par zéro
-        normes_docs = np.where(normes_docs > 0, normes_docs, 1)
+        # Normes des documents (précalculées) et sous-matrice des lignes retenues
+        matrice = self.mat_TFxIDF
+        normes_docs = self.normes_docs
+        if lignes is not None:
+            matrice = matrice[lignes]
+            normes_docs = normes_docs[lignes]
         
         # Produit scalaire avec chaque document normalisé
         vecteur_requete_sparse = csr_matrix(vecteur_requete_normalise)
-        scores = self.mat_TFxIDF.dot(vecteur_requete_sparse.T).toarray().flatten()
+        scores = matrice.dot(vecteur_requete_sparse.T).toarray().flatten()
         # Diviser par les normes des documents
         scores = scores / normes_docs
         
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+class SimHashLSH:
+    # --- Index approximatif des plus proches voisins (cosinus) par projections aléatoires signées ---
+    # Chaque document est projeté sur nb_bandes x bits_par_bande hyperplans aléatoires ; le signe de
+    # chaque projection donne un bit (SimHash). Deux vecteurs d'angle θ ont le même bit avec la
+    # probabilité 1 - θ / π : ceux qui partagent tous les bits d'une bande sont candidats.
+    # Multi-sondage : pour chaque bande, les seaux voisins obtenus en inversant les bits les moins
+    # sûrs de la requête (projections les plus proches de 0) sont aussi visités. Les candidats sont
+    # ensuite reclassés par le vrai cosinus.
+
+    def __init__(self, matrice, nb_bandes=32, bits_par_bande=10, nb_sondes=4, graine=42):
+        # --- Construit l'index ---
+        # matrice : lignes TFxIDF normalisées (csr, documents x termes), ex. SearchEngine.matrice_normalisee()
+        # nb_bandes : nombre de tables de hachage (rappel plus élevé, plus de candidats)
+        # bits_par_bande : taille des clés (seaux plus petits, rappel plus faible)
+        # nb_sondes : nombre de seaux voisins visités par bande (réglage rappel / latence des requêtes)
+        if not 1 <= bits_par_bande <= 32:
+            raise ValueError("bits_par_bande doit être compris entre 1 et 32")
+        if nb_bandes < 1:
+            raise ValueError("nb_bandes doit être au moins 1")
+        self.matrice = matrice
+        self.nb_bandes = nb_bandes
+        self.bits_par_bande = bits_par_bande
+        self.nb_sondes = nb_sondes
+        generateur = np.random.default_rng(graine)
+        self.hyperplans = generateur.standard_normal(
+            (matrice.shape[1], nb_bandes * bits_par_bande), dtype=np.float32
+        )
+        self._poids_bits = np.left_shift(1, np.arange(bits_par_bande, dtype=np.int64))
+
+        # Documents vides (ligne nulle) : jamais candidats
+        lignes = np.flatnonzero(np.diff(matrice.indptr) > 0)
+        cles = self._cles(self._codes(self._projeter(matrice[lignes]))).ravel()
+        # Toutes les tables dans un seul tableau trié de clés (bande, code) : une recherche
+        # dichotomique pour toutes les sondes de toutes les bandes
+        ordre = np.argsort(cles, kind='stable')
+        self.cles_triees = cles[ordre]
+        self.lignes_triees = np.repeat(lignes, nb_bandes)[ordre].astype(np.int32)
+
+    def _projeter(self, vecteurs):
+        # --- Projections (nb vecteurs x nb_bandes x bits_par_bande) ---
+        projections = np.asarray(vecteurs.astype(np.float32).dot(self.hyperplans))
+        return projections.reshape(-1, self.nb_bandes, self.bits_par_bande)
+
+    def _codes(self, projections):
+        # --- Code entier de chaque bande (bits des signes des projections) ---
+        return ((projections > 0) * self._poids_bits).sum(axis=2)
+
+    def _cles(self, codes):
+        # Clé unique d'un seau : numéro de bande dans les bits de poids fort
+        return (np.arange(self.nb_bandes, dtype=np.int64) << 32) | codes
+
+    def nb_octets(self):
+        # --- Taille des hyperplans et des tables ---
+        return self.hyperplans.nbytes + self.cles_triees.nbytes + self.lignes_triees.nbytes
+
+    def candidats(self, vecteur, nb_sondes=None):
+        # --- Lignes candidates (triées) pour un vecteur requête (1 x termes, creux ou dense) ---
+        nb_sondes = min(self.nb_sondes if nb_sondes is None else nb_sondes, self.bits_par_bande)
+        projections = self._projeter(vecteur)[0]
+        codes = self._codes(projections[None])[0]
+        # Sondes : le code de chaque bande, puis les codes où l'un des nb_sondes bits les moins sûrs est inversé
+        incertains = np.argsort(np.abs(projections), axis=1)[:, :nb_sondes]
+        sondes = np.concatenate([codes[:, None], codes[:, None] ^ self._poids_bits[incertains]], axis=1)
+        cles = self._cles(sondes.T).ravel()
+        debuts = np.searchsorted(self.cles_triees, cles, side='left')
+        tailles = np.searchsorted(self.cles_triees, cles, side='right') - debuts
+        total = tailles.sum()
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        # Positions de tous les seaux visités, puis dédoublonnage (tri des seuls candidats : O(c log c), pas O(N))
+        positions = np.arange(total) + np.repeat(debuts - (np.cumsum(tailles) - tailles), tailles)
+        return np.unique(self.lignes_triees[positions]).astype(np.int64)
+
+    def chercher(self, vecteur, k=10, nb_sondes=None, exclure=None):
+        # --- k plus proches voisins approchés : (lignes, scores) par cosinus décroissant ---
+        # vecteur : requête normalisée ; exclure : ligne à ignorer (le document requête lui-même)
+        candidats = self.candidats(vecteur, nb_sondes)
+        if exclure is not None:
+            candidats = candidats[candidats != exclure]
+        # Reclassement exact des candidats
+        scores = self.matrice[candidats].dot(vecteur.T)
+        scores = np.asarray(scores.todense() if hasattr(scores, 'todense') else scores).ravel()
+        garder = scores > 0
+        candidats, scores = candidats[garder], scores[garder]
+        k = min(k, len(candidats))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        meilleurs = np.argpartition(-scores, k - 1)[:k]
+        meilleurs = meilleurs[np.argsort(-scores[meilleurs], kind='stable')]
+        return candidats[meilleurs], scores[meilleurs]
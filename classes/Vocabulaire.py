@@ -0,0 +1,55 @@
+from bisect import bisect_left
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class Vocabulaire(Mapping):
+    # --- Vocabulaire du moteur : mot -> {'id', 'nb_occurrences', 'nb_documents'} ---
+    # Les statistiques sont stockées dans deux tableaux (une case par colonne de la matrice TF) :
+    # ajouter_documents les met à jour par opérations vectorisées, sans reconstruire un dictionnaire
+    # par mot. Les mots sont triés ; l'id d'un mot est son rang + 1.
+
+    def __init__(self, mots, nb_occurrences, nb_documents, mot_to_index=None):
+        # mots : liste triée des mots (colonnes de la matrice TF)
+        # nb_occurrences, nb_documents : statistiques de chaque colonne
+        # mot_to_index : mapping mot -> colonne déjà construit pour ces mots (sinon construit ici)
+        self.mots = mots
+        self.mot_to_index = mot_to_index if mot_to_index is not None else dict(zip(mots, range(len(mots))))
+        self.nb_occurrences = np.asarray(nb_occurrences, dtype=np.int64)
+        self.nb_documents = np.asarray(nb_documents, dtype=np.int64)
+
+    def __getitem__(self, mot):
+        idx = self.mot_to_index[mot]
+        return {
+            'id': idx + 1,
+            'nb_occurrences': int(self.nb_occurrences[idx]),
+            'nb_documents': int(self.nb_documents[idx])
+        }
+
+    def __contains__(self, mot):
+        return mot in self.mot_to_index
+
+    def __iter__(self):
+        return iter(self.mots)
+
+    def __len__(self):
+        return len(self.mots)
+
+    def etendre(self, nouveaux_mots):
+        # --- Vocabulaire agrandi de nouveaux_mots (absents) et colonne de chaque ancien mot ---
+        # Renvoie (vocabulaire, ancien_vers_nouveau) ; les statistiques des nouveaux mots sont nulles.
+        # Seuls les nouveaux mots sont placés par dichotomie : les anciennes colonnes sont décalées
+        # du nombre de nouveaux mots insérés avant elles.
+        nouveaux_mots = sorted(nouveaux_mots)
+        positions = np.array([bisect_left(self.mots, mot) for mot in nouveaux_mots], dtype=np.int64)
+        ancien_vers_nouveau = np.arange(len(self.mots), dtype=np.int64) + np.searchsorted(
+            positions, np.arange(len(self.mots)), side='right'
+        )
+        # Fusion de deux listes triées (détectée par le tri de Python, linéaire)
+        mots = sorted(self.mots + nouveaux_mots)
+        nb_occurrences = np.zeros(len(mots), dtype=np.int64)
+        nb_documents = np.zeros(len(mots), dtype=np.int64)
+        nb_occurrences[ancien_vers_nouveau] = self.nb_occurrences
+        nb_documents[ancien_vers_nouveau] = self.nb_documents
+        return Vocabulaire(mots, nb_occurrences, nb_documents), ancien_vers_nouveau
@@ -0,0 +1,95 @@
+import argparse
+
+from dotenv import load_dotenv
+
+from classes.ArxivFetcher import ArxivFetcher
+from classes.Corpus import Corpus
+from classes.HttpCache import HttpCache
+from classes.IngestionPipeline import IngestionPipeline, SourceIngestion
+from classes.RedditCrawler import RedditCrawler
+
+
+# --- Point d'entrée unique : fetch -> parse -> dedupe -> register -> index -> snapshot ---
+# Exemples :
+#   python ingestion.py --reddit Basketball nba --arxiv all:Basketball --limite 500
+#   python ingestion.py --discours discours_US.csv
+# Relancer la même commande après une interruption reprend au dernier snapshot.
+# Le corpus existant est toujours relu et complété : --nouveau relit toutes les sources depuis
+# le début (sans le checkpoint), --corpus-vide repart d'un corpus vide et remplace corpus.json.
+# Seul le corpus est sauvegardé : l'étape index n'est pas exécutée, le SearchEngine est
+# construit depuis corpus.json par le programme qui interroge le corpus.
+
+
+def lire_arguments():
+    parser = argparse.ArgumentParser(description="Ingestion Reddit / arXiv / discours dans corpus.json")
+    parser.add_argument('--reddit', nargs='*', default=[], metavar='SUBREDDIT', help="subreddits à récupérer")
+    parser.add_argument('--listing', default='new', help="listing Reddit (new, hot, top...)")
+    parser.add_argument('--arxiv', nargs='*', default=[], metavar='REQUETE', help="requêtes arXiv (ex. all:Basketball)")
+    parser.add_argument('--discours', nargs='*', default=[], metavar='CSV', help="fichiers de discours (format discours_US.csv)")
+    parser.add_argument('--limite', type=int, default=1000, help="nombre maximal de documents par source Reddit / arXiv")
+    parser.add_argument('--taille-page', type=int, default=100, help="taille des pages arXiv")
+    parser.add_argument('--corpus', default='corpus.json', help="fichier du corpus (snapshot)")
+    parser.add_argument('--checkpoint', default='ingestion_checkpoint.json', help="fichier de reprise")
+    parser.add_argument('--nouveau', action='store_true',
+                        help="ignorer le checkpoint existant (le corpus existant est conservé et complété)")
+    parser.add_argument('--corpus-vide', action='store_true',
+                        help="partir d'un corpus vide : corpus.json est remplacé par les documents de cette exécution")
+    parser.add_argument('--quasi-doublons', choices=['supprimer', 'lier', 'regrouper'], default=None,
+                        help="détection des quasi-doublons (MinHash/LSH) et politique appliquée")
+    parser.add_argument('--seuil-quasi-doublons', type=float, default=0.8, help="similarité de Jaccard minimale")
+    parser.add_argument('--cache', default=None, metavar='DOSSIER', help="cache HTTP des réponses arXiv")
+    parser.add_argument('--intervalle-snapshot', type=float, default=60.0, help="secondes entre deux snapshots")
+    parser.add_argument('--docs-par-snapshot', type=int, default=5000, help="documents entre deux snapshots")
+    return parser.parse_args()
+
+
+def main():
+    load_dotenv()
+    arguments = lire_arguments()
+
+    corpus = Corpus.getInstance("RedditScrapper")
+    if arguments.quasi_doublons:
+        corpus.configurer_quasi_doublons(arguments.quasi_doublons, seuil=arguments.seuil_quasi_doublons)
+    sources = []
+    crawler = RedditCrawler() if arguments.reddit else None
+    fetcher = None
+    if arguments.arxiv:
+        cache = HttpCache(arguments.cache) if arguments.cache else None
+        fetcher = ArxivFetcher(nb_workers=1, cache=cache)
+    for subreddit in arguments.reddit:
+        sources.append(SourceIngestion.reddit(crawler, subreddit, listing=arguments.listing, limite=arguments.limite))
+    for query in arguments.arxiv:
+        sources.append(SourceIngestion.arxiv(
+            fetcher, query, max_results=arguments.limite, taille_page=arguments.taille_page
+        ))
+    for chemin in arguments.discours:
+        sources.append(SourceIngestion.discours(chemin))
+    if not sources:
+        print("Aucune source : utiliser --reddit, --arxiv et/ou --discours.")
+        return
+
+    pipeline = IngestionPipeline(
+        corpus, sources, chemin_corpus=arguments.corpus, chemin_checkpoint=arguments.checkpoint,
+        indexer=False, intervalle_snapshot=arguments.intervalle_snapshot,
+        docs_par_snapshot=arguments.docs_par_snapshot
+    )
+    try:
+        rapport = pipeline.executer(reprendre=not arguments.nouveau, corpus_vide=arguments.corpus_vide)
+    finally:
+        if crawler is not None:
+            crawler.fermer()
+        if fetcher is not None:
+            fetcher.fermer()
+
+    print("\nDébit par étape :")
+    print(rapport[['nb_lots', 'nb_entrees', 'nb_sorties', 'duree_active', 'debit_actif', 'debit', 'occupation']]
+          .to_string(float_format=lambda x: f"{x:.2f}"))
+    print(f"\nCorpus : {len(corpus.id2doc)} documents")
+    if pipeline.sources_terminees():
+        print("Toutes les sources ont été lues jusqu'au bout.")
+    else:
+        print(f"Ingestion interrompue : relancer la commande pour reprendre ('{arguments.checkpoint}').")
+
+
+if __name__ == '__main__':
+    main()
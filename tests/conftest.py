@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+# Les modules du projet s'importent depuis la racine du dépôt (from classes.X import X)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.Corpus import Corpus
+from classes.SearchEngine import SearchEngine
+from tests.documents_factices import document, textes_aleatoires
+
+
+@pytest.fixture
+def corpus():
+    # --- Corpus vide (le singleton est réinitialisé pour chaque test) ---
+    Corpus._instance = None
+    Corpus._initialized = False
+    yield Corpus.getInstance("Test")
+    Corpus._instance = None
+    Corpus._initialized = False
+
+
+@pytest.fixture
+def corpus_textes(corpus):
+    # --- Corpus de 60 documents aux textes aléatoires (ids natifs p0..p59), 5 auteurs, dates et
+    # nombres de commentaires variés ---
+    for i, texte in enumerate(textes_aleatoires()):
+        corpus.register_document(document(
+            f"p{i}", texte, auteur=f"auteur{i % 5}", date=f"2024-01-{1 + i % 28:02d}", nb_commentaires=i % 7
+        ))
+    return corpus
+
+
+@pytest.fixture
+def moteur(corpus_textes):
+    # --- SearchEngine du corpus de test ---
+    return SearchEngine(corpus_textes)
@@ -0,0 +1,25 @@
+# --- Documents de test : textes aléatoires reproductibles et documents Reddit factices ---
+import random
+
+from classes.Document import RedditDocument
+
+
+# Mots des textes aléatoires du corpus de test (sport et politique)
+MOTS = [
+    'basketball', 'game', 'court', 'team', 'player', 'coach', 'season', 'league', 'score', 'dunk',
+    'america', 'economy', 'jobs', 'people', 'freedom', 'democracy', 'war', 'peace', 'health', 'care',
+]
+
+
+def textes_aleatoires(nb_documents=60, graine=0):
+    # --- Textes de 3 à 12 mots tirés dans MOTS (reproductibles) ---
+    generateur = random.Random(graine)
+    return [' '.join(generateur.choices(MOTS, k=generateur.randint(3, 12))) for _ in range(nb_documents)]
+
+
+def document(identifiant, texte, auteur='auteur', date='2024-01-01', nb_commentaires=0):
+    # --- Document Reddit de test (id natif : identifiant) ---
+    return RedditDocument(
+        f"post {identifiant}", auteur, 'Reddit', date, '', texte, nb_commentaires=nb_commentaires,
+        id_source=identifiant
+    )
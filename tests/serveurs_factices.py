@@ -0,0 +1,231 @@
+# --- Serveurs HTTP locaux servant des réponses préparées (tests sans réseau) ---
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+
+class ServeurFactice:
+    # --- Serveur local dans un thread : enregistre les requêtes et la concurrence maximale ---
+
+    def __init__(self, latence=0.0):
+        self.latence = latence
+        self.requetes = []
+        self.en_cours = 0
+        self.concurrence_max = 0
+        self._verrou = threading.Lock()
+        serveur = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                serveur._traiter(self, 'GET')
+
+            def do_POST(self):
+                serveur._traiter(self, 'POST')
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Gestionnaire)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _traiter(self, gestionnaire, methode):
+        url = urlparse(gestionnaire.path)
+        params = {cle: valeurs[0] for cle, valeurs in parse_qs(url.query).items()}
+        longueur = int(gestionnaire.headers.get('Content-Length') or 0)
+        if longueur:
+            gestionnaire.rfile.read(longueur)
+        with self._verrou:
+            self.requetes.append({'methode': methode, 'chemin': url.path, 'params': params, 'temps': time.monotonic()})
+            self.en_cours += 1
+            self.concurrence_max = max(self.concurrence_max, self.en_cours)
+        try:
+            if self.latence:
+                time.sleep(self.latence)
+            statut, entetes, corps = self.repondre(methode, url.path, params, gestionnaire.headers)
+        finally:
+            with self._verrou:
+                self.en_cours -= 1
+        gestionnaire.send_response(statut)
+        for nom, valeur in entetes.items():
+            gestionnaire.send_header(nom, valeur)
+        gestionnaire.send_header('Content-Length', str(len(corps)))
+        gestionnaire.end_headers()
+        gestionnaire.wfile.write(corps)
+
+    def repondre(self, methode, chemin, params, entetes):
+        raise NotImplementedError
+
+
+class ServeurArxivFactice(ServeurFactice):
+    # --- Fausse API arXiv : flux Atom préparés, paginés par start / max_results ---
+    # Les entrées sont datées du plus récent au plus ancien ; avec sortBy=lastUpdatedDate elles
+    # sont servies par date de mise à jour décroissante (une entrée révisée remonte en tête).
+    # Chaque page a un ETag : If-None-Match identique renvoie 304 (revalidation du cache).
+
+    def __init__(self, nb_resultats=230, latence=0.0, debut=datetime(2024, 6, 1)):
+        super().__init__(latence)
+        self.entrees = [
+            {
+                'id': f"http://arxiv.org/abs/2406.{i:05d}",
+                'version': 1,
+                'titre': f"Article {i}",
+                'auteurs': [f"Auteur {i % 7}", f"Coauteur {i % 3}"],
+                'date': debut - timedelta(hours=i),
+                'maj': debut - timedelta(hours=i),
+                'resume': f"Résumé de l'article {i} sur le basketball",
+            }
+            for i in range(nb_resultats)
+        ]
+
+    def ajouter_entrees(self, nb, date):
+        # --- Publie nb nouvelles entrées (plus récentes que date) en tête des résultats ---
+        nouvelles = [
+            {
+                'id': f"http://arxiv.org/abs/2407.{len(self.entrees) + i:05d}",
+                'version': 1,
+                'titre': f"Nouvel article {i}",
+                'auteurs': ['Auteur récent'],
+                'date': date + timedelta(minutes=nb - i),
+                'maj': date + timedelta(minutes=nb - i),
+                'resume': f"Nouveau résumé {i}",
+            }
+            for i in range(nb)
+        ]
+        self.entrees[:0] = nouvelles
+
+    def reviser(self, indices, date):
+        # --- Publie une nouvelle version (résumé modifié, mise à jour à `date`) des entrées indices ---
+        for indice in indices:
+            entree = self.entrees[indice]
+            entree['version'] += 1
+            entree['maj'] = date
+            entree['resume'] += f" (version {entree['version']})"
+
+    def flux(self, start, max_results, tri=None):
+        entrees = self.entrees
+        if tri == 'lastUpdatedDate':
+            entrees = sorted(entrees, key=lambda e: e['maj'], reverse=True)
+        entrees = ''.join(
+            f"<entry><id>{e['id']}v{e['version']}</id><title>{escape(e['titre'])}</title>"
+            f"<published>{e['date']:%Y-%m-%dT%H:%M:%SZ}</published>"
+            f"<updated>{e['maj']:%Y-%m-%dT%H:%M:%SZ}</updated>"
+            f"<summary>{escape(e['resume'])}</summary>"
+            + ''.join(f"<author><name>{escape(nom)}</name></author>" for nom in e['auteurs'])
+            + "</entry>"
+            for e in entrees[start:start + max_results]
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+            f"<opensearch:totalResults>{len(self.entrees)}</opensearch:totalResults>"
+            f"<opensearch:startIndex>{start}</opensearch:startIndex>{entrees}</feed>"
+        ).encode('utf-8')
+
+    def repondre(self, methode, chemin, params, entetes):
+        corps = self.flux(int(params.get('start', 0)), int(params.get('max_results', 10)), params.get('sortBy'))
+        etag = '"' + hashlib.sha256(corps).hexdigest()[:16] + '"'
+        if entetes.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, b''
+        return 200, {'Content-Type': 'application/atom+xml', 'ETag': etag}, corps
+
+
+class ServeurRedditFactice(ServeurFactice):
+    # --- Fausse API Reddit : listings /r/<subreddit>/<listing> paginés par curseur `after` ---
+    # Tous les listings d'un subreddit renvoient les mêmes posts (un post est dans 'hot' et 'new').
+    # Arbre de commentaires de chaque post (/comments/<id>) : nb_commentaires réponses directes
+    # ayant chacune une chaîne de 2 réponses, plus un « more » de nb_more réponses directes
+    # servies par /api/morechildren.
+
+    def __init__(self, subreddits, nb_posts=250, latence=0.0, debut=1_717_200_000, nb_commentaires=3, nb_more=2):
+        super().__init__(latence)
+        self.debut = debut
+        self.nb_commentaires = nb_commentaires
+        self.nb_more = nb_more
+        self.posts = {
+            subreddit: [
+                {
+                    'id': f"{subreddit}{i}",
+                    'title': f"{subreddit} post {i}",
+                    'author': f"redditeur{i % 5}",
+                    'created_utc': debut - 60 * i,
+                    'url': f"https://www.reddit.com/r/{subreddit}/{i}",
+                    'num_comments': i % 4,
+                    'selftext': f"texte du post {i}",
+                }
+                for i in range(nb_posts)
+            ]
+            for subreddit in subreddits
+        }
+
+    def commentaire(self, id_post, identifiant, profondeur, parent):
+        # --- Commentaire (kind t1) ; sa réponse est imbriquée jusqu'à la profondeur 2 ---
+        donnees = {
+            'id': identifiant, 'author': 'commentateur', 'created_utc': self.debut, 'body': f"réponse {identifiant}",
+            'permalink': f"/r/x/comments/{id_post}/_/{identifiant}/", 'parent_id': parent, 'depth': profondeur,
+            'replies': '',
+        }
+        if profondeur < 2:
+            donnees['replies'] = {'kind': 'Listing', 'data': {'children': [
+                self.commentaire(id_post, f"{identifiant}r", profondeur + 1, f"t1_{identifiant}")
+            ]}}
+        return {'kind': 't1', 'data': donnees}
+
+    def arbre_commentaires(self, id_post):
+        post = next(p for posts in self.posts.values() for p in posts if p['id'] == id_post)
+        enfants = [self.commentaire(id_post, f"{id_post}_c{i}", 0, f"t3_{id_post}") for i in range(self.nb_commentaires)]
+        if self.nb_more:
+            enfants.append({'kind': 'more', 'data': {
+                'depth': 0, 'children': [f"{id_post}_m{i}" for i in range(self.nb_more)],
+            }})
+        return [
+            {'kind': 'Listing', 'data': {'children': [{'kind': 't3', 'data': post}]}},
+            {'kind': 'Listing', 'data': {'children': enfants}},
+        ]
+
+    def repondre(self, methode, chemin, params, entetes):
+        if methode == 'POST' and chemin == '/api/v1/access_token':
+            return 200, {'Content-Type': 'application/json'}, json.dumps(
+                {'access_token': 'jeton', 'expires_in': 3600}
+            ).encode('utf-8')
+        morceaux = chemin.strip('/').split('/')
+        if len(morceaux) == 2 and morceaux[0] == 'comments':
+            return 200, {'Content-Type': 'application/json'}, json.dumps(
+                self.arbre_commentaires(morceaux[1])
+            ).encode('utf-8')
+        if chemin == '/api/morechildren':
+            id_post = params['link_id'][len('t3_'):]
+            things = [
+                self.commentaire(id_post, identifiant, 0, params['link_id'])
+                for identifiant in params['children'].split(',')
+            ]
+            return 200, {'Content-Type': 'application/json'}, json.dumps(
+                {'json': {'data': {'things': things}}}
+            ).encode('utf-8')
+        if len(morceaux) != 3 or morceaux[0] != 'r' or morceaux[1] not in self.posts:
+            return 404, {}, b''
+        posts = self.posts[morceaux[1]]
+        debut = 0
+        if params.get('after'):
+            debut = next(i for i, p in enumerate(posts) if f"t3_{p['id']}" == params['after']) + 1
+        page = posts[debut:debut + min(100, int(params.get('limit', 25)))]
+        after = f"t3_{page[-1]['id']}" if page and debut + len(page) < len(posts) else None
+        listing = {'kind': 'Listing', 'data': {
+            'after': after, 'children': [{'kind': 't3', 'data': post} for post in page],
+        }}
+        return 200, {'Content-Type': 'application/json'}, json.dumps(listing).encode('utf-8')
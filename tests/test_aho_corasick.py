@@ -0,0 +1,48 @@
+import random
+import re
+
+from classes.AhoCorasick import AhoCorasick
+from classes.Document import Document
+
+
+def occurrences_naives(texte, motifs, mots_entiers=False):
+    # --- Référence : re.finditer (insensible à la casse) sur chaque motif, chevauchements compris ---
+    resultats = []
+    for indice, motif in enumerate(motifs):
+        bornes = r'(?<!\w)' if mots_entiers else ''
+        for m in re.finditer(f"(?=({bornes}{re.escape(motif)}{bornes.replace('<', '')}))", texte, re.IGNORECASE):
+            resultats.append((m.start(1), m.end(1), indice))
+    return sorted(resultats)
+
+
+def test_identique_a_la_recherche_naive():
+    generateur = random.Random(0)
+    for _ in range(300):
+        texte = ''.join(generateur.choice('abAB c') for _ in range(generateur.randint(0, 60)))
+        motifs = list(dict.fromkeys(
+            ''.join(generateur.choice('abAB') for _ in range(generateur.randint(1, 4))).lower()
+            for _ in range(generateur.randint(1, 5))
+        ))
+        automate = AhoCorasick(motifs)
+        for mots_entiers in (False, True):
+            assert sorted(automate.rechercher(texte, mots_entiers)) == occurrences_naives(texte, motifs, mots_entiers)
+
+
+def test_positions_quand_la_minuscule_change_la_longueur():
+    # 'İ'.lower() fait deux caractères : les positions restent celles du texte d'origine
+    texte = "İİİİ the democracy wins"
+    automate = AhoCorasick(['democracy', 'wins'])
+    assert [(texte[debut:fin], indice) for debut, fin, indice in automate.rechercher(texte)] == \
+        [('democracy', 0), ('wins', 1)]
+    assert automate.compter(texte, mots_entiers=True) == {0: 1, 1: 1}
+    # Motif contenant lui-même un tel caractère
+    assert [texte[d:f] for d, f, _ in AhoCorasick(['İİ the']).rechercher(texte)] == ['İİ the']
+
+
+def test_concorde_multiple_alignee(corpus):
+    corpus.register_document(Document('t', 'a', 'Discours US', '2020-01-01', '', "İİİİ the democracy wins"))
+    multiple = corpus.concorde(['democracy', 'wins'], taille_contexte=5)
+    simple = corpus.concorde('democracy', taille_contexte=5)
+    assert list(multiple['motif trouvé']) == ['democracy', 'wins']
+    assert multiple.iloc[0]['contexte gauche'] == simple.iloc[0]['contexte gauche']
+    assert multiple.iloc[0]['contexte droit'] == simple.iloc[0]['contexte droit']
@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+
+from classes.ArxivFetcher import ArxivFetcher
+from tests.serveurs_factices import ServeurArxivFactice
+
+
+def test_pagination():
+    with ServeurArxivFactice(nb_resultats=230) as serveur, \
+            ArxivFetcher(base_url=serveur.url, requetes_par_seconde=None) as fetcher:
+        documents = list(fetcher.recuperer('all:basketball', max_results=1000, taille_page=50))
+
+    assert len(documents) == 230
+    assert len({doc.url for doc in documents}) == 230
+    debuts = sorted(int(requete['params']['start']) for requete in serveur.requetes)
+    assert debuts == [0, 50, 100, 150, 200]
+    assert fetcher.metriques == {'nb_requetes': 5, 'nb_documents': 230}
+
+
+def test_max_results_tronque_la_derniere_page():
+    with ServeurArxivFactice(nb_resultats=230) as serveur, \
+            ArxivFetcher(base_url=serveur.url, requetes_par_seconde=None) as fetcher:
+        documents = list(fetcher.recuperer('all:basketball', max_results=120, taille_page=50))
+
+    assert len(documents) == 120
+    tailles = sorted(int(requete['params']['max_results']) for requete in serveur.requetes)
+    assert tailles == [20, 50, 50]
+
+
+def test_pages_recuperees_en_parallele():
+    with ServeurArxivFactice(nb_resultats=400, latence=0.1) as serveur, \
+            ArxivFetcher(base_url=serveur.url, nb_workers=4, requetes_par_seconde=None) as fetcher:
+        debut = time.perf_counter()
+        documents = list(fetcher.recuperer('all:basketball', max_results=400, taille_page=50))
+        duree = time.perf_counter() - debut
+
+    assert len(documents) == 400
+    assert 1 < serveur.concurrence_max <= 4
+    # 8 pages de 0,1 s : la première seule, puis 7 pages sur 4 workers
+    assert duree < 8 * 0.1
+
+
+def test_limite_de_debit_partagee_par_les_workers():
+    debit = 20
+    with ServeurArxivFactice(nb_resultats=300) as serveur, \
+            ArxivFetcher(base_url=serveur.url, nb_workers=4, requetes_par_seconde=debit) as fetcher:
+        list(fetcher.recuperer('all:basketball', max_results=300, taille_page=50))
+
+    temps = sorted(requete['temps'] for requete in serveur.requetes)
+    assert len(temps) == 6
+    # Tolérance pour la gigue des threads
+    assert temps[-1] - temps[0] >= (len(temps) - 1) / debit * 0.9
+
+
+def test_crawl_incremental(corpus):
+    with ServeurArxivFactice(nb_resultats=120) as serveur, \
+            ArxivFetcher(base_url=serveur.url, requetes_par_seconde=None) as fetcher:
+        assert fetcher.mettre_a_jour_corpus(corpus, 'all:basketball', max_results=500, taille_page=50) == 120
+        nb_requetes = len(serveur.requetes)
+
+        # Rien de nouveau : une seule page, aucun document
+        assert fetcher.mettre_a_jour_corpus(corpus, 'all:basketball', max_results=500, taille_page=50) == 0
+        assert len(serveur.requetes) == nb_requetes + 1
+
+        serveur.ajouter_entrees(7, corpus.get_watermark('arxiv:all:basketball'))
+        assert fetcher.mettre_a_jour_corpus(corpus, 'all:basketball', max_results=500, taille_page=50) == 7
+
+    assert corpus.ndoc == 127
+
+
+def test_revision_met_a_jour_le_document(corpus):
+    with ServeurArxivFactice(nb_resultats=120) as serveur, \
+            ArxivFetcher(base_url=serveur.url, requetes_par_seconde=None) as fetcher:
+        fetcher.mettre_a_jour_corpus(corpus, 'all:basketball', max_results=500, taille_page=50)
+        watermark = corpus.get_watermark('arxiv:all:basketball')
+
+        # Nouvelle version (v2) d'articles anciens : mêmes documents, textes mis à jour
+        serveur.reviser([40, 90], watermark + timedelta(hours=1))
+        assert fetcher.mettre_a_jour_corpus(corpus, 'all:basketball', max_results=500, taille_page=50) == 2
+
+    assert corpus.ndoc == 120
+    document = corpus.id2doc[corpus.index_sources[('Arxiv', '2406.00040')]]
+    assert document.texte.endswith('(version 2)')
+    assert document.url.endswith('v2')
+    assert corpus.get_watermark('arxiv:all:basketball') == watermark + timedelta(hours=1)
+
+
+def test_entrees_a_la_date_du_watermark(corpus):
+    with ServeurArxivFactice(nb_resultats=50) as serveur, \
+            ArxivFetcher(base_url=serveur.url, requetes_par_seconde=None) as fetcher:
+        fetcher.mettre_a_jour_corpus(corpus, 'all:basketball', max_results=500, taille_page=20)
+        watermark = corpus.get_watermark('arxiv:all:basketball')
+
+        # Entrée publiée dans la même seconde que la plus récente déjà vue
+        serveur.ajouter_entrees(1, watermark - timedelta(minutes=1))
+        assert serveur.entrees[0]['maj'] == watermark
+        assert fetcher.mettre_a_jour_corpus(corpus, 'all:basketball', max_results=500, taille_page=20) == 1
+
+    assert corpus.ndoc == 51
@@ -0,0 +1,97 @@
+import io
+from datetime import datetime
+
+import pytest
+import xmltodict
+
+from classes.AtomParser import AtomParser
+from tests.serveurs_factices import ServeurArxivFactice
+
+
+def entree_arxiv(i, auteurs, published='2024-06-01T12:00:00Z'):
+    # --- Entrée mise en forme comme les réponses réelles de l'API (indentation, résumé sur plusieurs
+    # lignes, liens, catégories, affiliations) ---
+    auteurs = ''.join(
+        f"\n    <author>\n      <name>{nom}</name>\n      <arxiv:affiliation>Université {i}</arxiv:affiliation>\n    </author>"
+        for nom in auteurs
+    )
+    published = f"\n    <published>{published}</published>" if published is not None else ''
+    return (
+        f"\n  <entry>\n    <id>http://arxiv.org/abs/2406.{i:05d}v2</id>"
+        f"\n    <updated>2024-06-02T08:30:00Z</updated>{published}"
+        f"\n    <title>Player tracking &amp; shot\n  selection {i}</title>"
+        f"\n    <summary>  We study basketball data &lt;{i}&gt;.\nA second line of the abstract.\n</summary>"
+        f"{auteurs}"
+        f"\n    <arxiv:comment xmlns:arxiv=\"http://arxiv.org/schemas/atom\">12 pages</arxiv:comment>"
+        f"\n    <link href=\"http://arxiv.org/abs/2406.{i:05d}v2\" rel=\"alternate\" type=\"text/html\"/>"
+        f"\n    <category term=\"cs.LG\" scheme=\"http://arxiv.org/schemas/atom\"/>"
+        "\n  </entry>"
+    )
+
+
+def flux_arxiv(entrees, total=None):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        '\n  <title type="html">ArXiv Query: search_query=all:basketball</title>'
+        f"\n  <opensearch:totalResults>{len(entrees) if total is None else total}</opensearch:totalResults>"
+        '\n  <opensearch:startIndex>0</opensearch:startIndex>'
+        + ''.join(entrees) + '\n</feed>\n'
+    ).encode('utf-8')
+
+
+def documents_xmltodict(xml_data):
+    # --- Référence : extraction de fetch_arxiv (TD3 à TD7) sur le dictionnaire complet de xmltodict ---
+    parsed = xmltodict.parse(xml_data)
+    entries = parsed['feed'].get('entry', [])
+    if isinstance(entries, dict):
+        entries = [entries]
+    documents = []
+    for entry in entries:
+        summary = entry.get('summary', '').replace('\n', ' ')
+        title = entry.get('title', 'arXiv entry').strip()
+        published = entry.get('published')
+        try:
+            date_pub = datetime.strptime(published, "%Y-%m-%dT%H:%M:%SZ") if published else None
+        except ValueError:
+            date_pub = None
+        author_field = entry.get('author', {})
+        co_auteurs = []
+        if isinstance(author_field, list):
+            co_auteurs = [a.get('name', '') for a in author_field if isinstance(a, dict) and a.get('name')]
+        elif isinstance(author_field, dict):
+            nom_auteur = author_field.get('name', '')
+            if nom_auteur:
+                co_auteurs = [nom_auteur]
+        auteur = co_auteurs[0] if co_auteurs else 'arxiv'
+        documents.append((title, auteur, date_pub, entry.get('id', ''), summary, co_auteurs))
+    return documents
+
+
+def champs(doc):
+    return doc.titre, doc.auteur, doc.date, doc.url, doc.texte, doc.co_auteurs
+
+
+FLUX = {
+    'plusieurs entrées': flux_arxiv(
+        [entree_arxiv(i, [f"Auteur {i}", f"Co-auteur {i}", 'Tiers Auteur'][:1 + i % 3]) for i in range(12)], total=4321
+    ),
+    # xmltodict renvoie alors un dict et non une liste
+    'une seule entrée': flux_arxiv([entree_arxiv(0, ['Seul Auteur'])]),
+    'aucune entrée': flux_arxiv([], total=0),
+    'sans auteur ni date': flux_arxiv([entree_arxiv(1, [], published=None), entree_arxiv(2, ['A'], published='hier')]),
+    'serveur factice': ServeurArxivFactice(nb_resultats=30).flux(5, 20),
+}
+
+
+@pytest.mark.parametrize('nom', FLUX)
+def test_iterparse_egal_a_xmltodict(nom):
+    xml_data = FLUX[nom]
+    attendus = documents_xmltodict(xml_data)
+    total = int(xmltodict.parse(xml_data)['feed']['opensearch:totalResults'])
+    # Octets, puis flux lu par petits morceaux (comme response.raw)
+    for source in (xml_data, io.BufferedReader(io.BytesIO(xml_data), buffer_size=64)):
+        parseur = AtomParser()
+        assert [champs(doc) for doc in parseur.parser(source)] == attendus
+        assert (parseur.total_resultats, parseur.nb_entrees) == (total, len(attendus))
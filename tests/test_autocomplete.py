@@ -0,0 +1,29 @@
+import random
+
+from classes.Autocomplete import Autocomplete
+
+
+def suggestions_naives(mots, frequences, prefixe, k):
+    # --- Référence : mots commençant par le préfixe, par fréquence décroissante puis ordre alphabétique ---
+    candidats = [(-frequence, mot) for mot, frequence in zip(mots, frequences) if mot.startswith(prefixe)]
+    return [mot for _, mot in sorted(candidats)[:k]]
+
+
+def test_suggestions_identiques_au_tri_naif():
+    generateur = random.Random(0)
+    mots = sorted({''.join(generateur.choices('abcd', k=generateur.randint(1, 6))) for _ in range(1500)})
+    # Peu de fréquences distinctes : beaucoup d'ex aequo à départager
+    frequences = [generateur.randint(1, 8) for _ in mots]
+    # Petit seuil : les préfixes courts sont précalculés, les longs triés à la volée
+    index = Autocomplete(mots, frequences, k_max=4, seuil=20)
+    prefixes = [''] + [''.join(generateur.choices('abcde', k=generateur.randint(1, 4))) for _ in range(300)]
+    for prefixe in prefixes:
+        for k in (1, 4, 10):
+            assert index.suggest(prefixe, k) == suggestions_naives(mots, frequences, prefixe, k), (prefixe, k)
+
+
+def test_completer_requete(moteur):
+    index = Autocomplete.depuis_moteur(moteur)
+    attendus = suggestions_naives(moteur.mots, [moteur.vocab[m]['nb_documents'] for m in moteur.mots], 'd', 3)
+    assert index.completer_requete('basketball d', k=3) == [f"basketball {mot}" for mot in attendus]
+    assert index.completer_requete('basketball ') == []
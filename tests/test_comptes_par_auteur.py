@@ -0,0 +1,59 @@
+import random
+from collections import Counter
+
+from classes.Document import Document
+from tests.documents_factices import MOTS, document
+
+
+def comptes_naifs(moteur, mots, doc_ids):
+    # --- Occurrences de chaque mot par auteur, en relisant les textes des documents ---
+    termes = list(dict.fromkeys(t for mot in mots for t in moteur._tokeniser(mot)))
+    comptes = {}
+    for doc_id in doc_ids:
+        doc = moteur.corpus.id2doc[doc_id]
+        occurrences = Counter(moteur._tokeniser(doc.texte or ''))
+        compte = comptes.setdefault(doc.auteur or 'inconnu', Counter())
+        for terme in termes:
+            compte[terme] += occurrences[terme]
+    return termes, comptes
+
+
+def verifier(moteur, resultat, mots, doc_ids, auteurs=None):
+    termes, comptes = comptes_naifs(moteur, mots, doc_ids)
+    assert list(resultat.columns) == termes and resultat.index.name == 'auteur'
+    attendus = auteurs if auteurs is not None else moteur.auteur_to_code
+    assert sorted(resultat.index) == sorted(attendus)
+    for auteur in resultat.index:
+        compte = comptes.get(auteur, Counter())
+        assert [int(v) for v in resultat.loc[auteur]] == [compte[t] for t in termes], auteur
+
+
+def test_comptes_egaux_au_decompte_naif(moteur, corpus_textes):
+    generateur = random.Random(0)
+    # Mots avec majuscules / ponctuation (nettoyés comme les documents), doublons, mot absent
+    mots = ['Basketball!', 'war', 'jobs', 'WAR', 'zeppelin', 'court, game']
+    verifier(moteur, moteur.comptes_par_auteur(mots), mots, moteur.doc_ids)
+
+    # Sous-ensemble de documents (ex. résultats d'une recherche), dont un id inconnu ignoré
+    for _ in range(20):
+        sous_ensemble = generateur.sample(moteur.doc_ids, generateur.randint(1, 30))
+        mots = generateur.sample(MOTS, 4)
+        verifier(moteur, moteur.comptes_par_auteur(mots, doc_ids=sous_ensemble + [10 ** 6]), mots, sous_ensemble)
+
+    # auteurs : sélection et ordre imposés, un auteur inconnu a des comptes nuls
+    auteurs = ['auteur3', 'personne', 'auteur0']
+    resultat = moteur.comptes_par_auteur(['democracy', 'war'], auteurs=auteurs)
+    assert list(resultat.index) == auteurs
+    verifier(moteur, resultat, ['democracy', 'war'], moteur.doc_ids, auteurs)
+
+
+def test_comptes_apres_ajout_de_documents(moteur, corpus_textes):
+    moteur.comptes_par_auteur(['basketball'])
+    # Nouveaux documents : nouvel auteur, auteur absent ('inconnu'), document existant réécrit
+    moteur.ajouter_documents([
+        corpus_textes.register_document(document('n0', 'basketball basketball zeppelin', auteur='nouveau')),
+        corpus_textes.register_document(Document('discours', None, 'Discours US', None, '', 'war peace war')),
+        corpus_textes.register_document(document('p3', 'basketball war', auteur='auteur3')),
+    ])
+    mots = ['basketball', 'war', 'zeppelin']
+    verifier(moteur, moteur.comptes_par_auteur(mots), mots, moteur.doc_ids)
@@ -0,0 +1,54 @@
+import random
+
+from classes.CorrecteurOrthographique import CorrecteurOrthographique
+
+
+def distance_naive(a, b):
+    # --- Référence : distance d'alignement optimal des chaînes (Damerau-Levenshtein restreinte), table complète ---
+    d = [[max(i, j) if min(i, j) == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+def suggestions_naives(mots, frequences, mot, k, distance_max):
+    # --- Référence : distance à chaque mot du vocabulaire, puis distance, fréquence décroissante, ordre alphabétique ---
+    resultats = []
+    for candidat, frequence in zip(mots, frequences):
+        distance = distance_naive(mot, candidat)
+        if distance <= distance_max:
+            resultats.append((candidat, distance, frequence))
+    return sorted(resultats, key=lambda r: (r[1], -r[2], r[0]))[:k]
+
+
+def alterer(generateur, mot, nb):
+    # --- Applique nb fautes : suppression, insertion, substitution ou transposition ---
+    for _ in range(nb):
+        i = generateur.randrange(len(mot))
+        faute = generateur.choice(['suppression', 'insertion', 'substitution', 'transposition'])
+        if faute == 'suppression' and len(mot) > 1:
+            mot = mot[:i] + mot[i + 1:]
+        elif faute == 'insertion':
+            mot = mot[:i] + generateur.choice('abcdef') + mot[i:]
+        elif faute == 'transposition' and i + 1 < len(mot):
+            mot = mot[:i] + mot[i + 1] + mot[i] + mot[i + 2:]
+        else:
+            mot = mot[:i] + generateur.choice('abcdef') + mot[i + 1:]
+    return mot
+
+
+def test_suggestions_identiques_a_la_comparaison_exhaustive():
+    generateur = random.Random(0)
+    mots = sorted({''.join(generateur.choices('abcdef', k=generateur.randint(2, 7))) for _ in range(400)})
+    frequences = [generateur.randint(1, 5) for _ in mots]
+    correcteur = CorrecteurOrthographique(mots, frequences)
+    for _ in range(150):
+        mot = alterer(generateur, generateur.choice(mots), generateur.randint(1, 3))
+        attendues = suggestions_naives(mots, frequences, mot, 5, 2)
+        if mot in mots:
+            attendues = attendues[:1]
+        assert correcteur.suggestions(mot) == attendues, mot
+        assert correcteur.corriger(mot) == (attendues[0][0] if attendues else None)
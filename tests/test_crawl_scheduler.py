@@ -0,0 +1,124 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from classes.CrawlScheduler import CrawlScheduler, HorlogeSimulee, SourceCrawl
+from classes.DocumentFactory import DocumentFactory
+from classes.RateLimiter import TokenBucket
+
+
+class SourceFactice:
+    # --- Source dont le nombre de nouveaux éléments ne dépend que du temps simulé ---
+    def __init__(self, horloge, taux, erreurs=0):
+        self.horloge = horloge
+        self.taux = taux
+        self.erreurs = erreurs
+        self.dernier = horloge.maintenant()
+        self.appels = []
+
+    def __call__(self):
+        maintenant = self.horloge.maintenant()
+        self.appels.append(maintenant)
+        if self.erreurs > 0:
+            self.erreurs -= 1
+            raise ConnectionError("source indisponible")
+        nb = int(self.taux * (maintenant - self.dernier))
+        self.dernier = maintenant
+        return nb
+
+
+def test_sources_actives_crawlees_plus_souvent():
+    horloge = HorlogeSimulee()
+    scheduler = CrawlScheduler(nb_workers=0, objectif_items=10, horloge=horloge)
+    active = SourceFactice(horloge, taux=1.0)
+    calme = SourceFactice(horloge, taux=0.001)
+    scheduler.ajouter_source(SourceCrawl('active', 'api', active, intervalle_min=10, intervalle_max=3600))
+    scheduler.ajouter_source(SourceCrawl('calme', 'api', calme, intervalle_min=10, intervalle_max=3600))
+
+    rapport = scheduler.executer(duree=6 * 3600)
+
+    assert len(active.appels) > 5 * len(calme.appels)
+    # Le taux estimé converge vers le vrai taux de la source
+    assert scheduler.sources['active'].taux == pytest.approx(1.0, rel=0.2)
+    assert rapport['nb_erreurs'] == 0
+    assert horloge.maintenant() == pytest.approx(6 * 3600)
+
+
+def test_seau_a_jetons_limite_les_requetes_par_api():
+    horloge = HorlogeSimulee()
+    scheduler = CrawlScheduler(limites_api={'api': (2, 0.01)}, nb_workers=0, horloge=horloge)
+    sources = [SourceFactice(horloge, taux=10.0) for _ in range(4)]
+    for i, source in enumerate(sources):
+        scheduler.ajouter_source(SourceCrawl(f"s{i}", 'api', source, intervalle_min=1, intervalle_max=10))
+
+    scheduler.executer(duree=1000)
+
+    # Rafale de 2, puis 1 requête toutes les 100 s
+    appels = sorted(t for source in sources for t in source.appels)
+    assert len(appels) <= 2 + 1000 * 0.01 + 1
+    assert all(b - a >= 100 - 1e-6 for a, b in zip(appels[2:], appels[3:]))
+
+
+def test_retries_avec_backoff_exponentiel():
+    horloge = HorlogeSimulee()
+    scheduler = CrawlScheduler(nb_workers=0, backoff_initial=30, max_tentatives=5, horloge=horloge)
+    source = SourceFactice(horloge, taux=1.0, erreurs=3)
+    scheduler.ajouter_source(SourceCrawl('instable', 'api', source, intervalle_min=60))
+
+    rapport = scheduler.executer(max_requetes=4)
+
+    assert [b - a for a, b in zip(source.appels, source.appels[1:])] == [30, 60, 120]
+    assert rapport['nb_erreurs'] == 3
+    assert rapport['nb_retries'] == 3
+    assert scheduler.sources['instable'].tentatives == 0
+
+
+def test_workers_paralleles_avec_horloge_simulee():
+    horloge = HorlogeSimulee()
+    scheduler = CrawlScheduler(nb_workers=3, horloge=horloge)
+    sources = [SourceFactice(horloge, taux=0.1) for _ in range(5)]
+    for i, source in enumerate(sources):
+        scheduler.ajouter_source(SourceCrawl(f"s{i}", 'api', source, intervalle_min=60, intervalle_max=600))
+
+    rapport = scheduler.executer(max_requetes=20)
+
+    assert rapport['nb_requetes'] == 20
+    assert all(source.appels for source in sources)
+
+
+def test_seau_a_jetons_refuse_un_debit_nul():
+    with pytest.raises(ValueError):
+        TokenBucket(1, 0)
+    with pytest.raises(ValueError):
+        TokenBucket(0, 1)
+
+
+def test_enregistrements_concurrents(corpus):
+    # Des crawls simultanés enregistrent chacun leur lot : ids uniques, comptes propres à chaque lot
+    def lot(prefixe, taille=200):
+        return [
+            DocumentFactory.create_document(
+                'arxiv', f"{prefixe} {i}", 'auteur', datetime(2024, 1, 1), '', f"texte {prefixe} {i}",
+                id_source=f"{prefixe}-{i}"
+            )
+            for i in range(taille)
+        ]
+
+    resultats = {}
+
+    def enregistrer(prefixe):
+        resultats[prefixe] = corpus.register_documents(lot(prefixe), compter=True)
+
+    threads = [threading.Thread(target=enregistrer, args=(f"lot{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    doc_ids = [doc_id for ids, _ in resultats.values() for doc_id in ids]
+    assert len(set(doc_ids)) == 8 * 200
+    assert corpus.ndoc == 8 * 200
+    assert all(nb == 200 for _, nb in resultats.values())
+    # Un second passage ne compte rien : les documents sont inchangés
+    assert corpus.register_documents(lot('lot0'), compter=True)[1] == 0
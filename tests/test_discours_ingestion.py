@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+
+from classes.DiscoursIngestion import DiscoursIngestion, decouper_en_phrases
+
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def ecrire_discours(chemin):
+    # --- Fichier TSV de test : premiers discours du vrai fichier et cas limites ---
+    df = pd.read_csv(os.path.join(RACINE, 'discours_US.csv'), sep='\t', quotechar='"', nrows=30)
+    cas_limites = pd.DataFrame([
+        # Texte vide (ignoré), texte sans ponctuation finale, phrases séparées par ! et ?
+        {'speaker': 'OBAMA', 'text': '', 'date': 'April 1, 2016', 'descr': 'Vide', 'link': 'http://x/1'},
+        {'speaker': 'OBAMA', 'text': 'Yes we can', 'date': 'April 2, 2016', 'descr': 'Court', 'link': 'http://x/2'},
+        {'speaker': 'TRUMP', 'text': 'Great! Really?  Yes. and no.', 'date': 'April 3, 2016', 'descr': 'Ponctuation',
+         'link': 'http://x/3'},
+    ])
+    pd.concat([df.iloc[:12], cas_limites, df.iloc[12:]], ignore_index=True).to_csv(chemin, sep='\t', index=False)
+
+
+def documents_boucle_td8(chemin):
+    # --- Documents créés par l'ancienne boucle iterrows du notebook TD8 (référence) ---
+    # Renvoie (liste de tuples (titre, auteur, source, date, url, texte), nombre de discours traités)
+    df_discours = pd.read_csv(chemin, sep='\t', quotechar='"')
+    documents = []
+    nb_discours = 0
+    for idx, row in df_discours.iterrows():
+        phrases = decouper_en_phrases(row['text'])
+        if not phrases:
+            continue
+        nb_discours += 1
+        descr = row['descr']
+        for phrase_idx, phrase_texte in enumerate(phrases):
+            titre = f"{descr} - Phrase {phrase_idx + 1}" if descr else f"Discours {idx + 1} - Phrase {phrase_idx + 1}"
+            documents.append((titre, row['speaker'], "Discours US", row['date'], row['link'], phrase_texte))
+    return documents, nb_discours
+
+
+@pytest.mark.parametrize('nb_workers', [0, 2])
+def test_ingestion_egale_a_la_boucle_td8(corpus, tmp_path, nb_workers):
+    chemin = tmp_path / 'discours.csv'
+    ecrire_discours(chemin)
+    attendus, nb_discours = documents_boucle_td8(chemin)
+
+    # Petits blocs, peu de blocs en vol : l'ordre d'enregistrement doit rester celui du fichier
+    ingestion = DiscoursIngestion(corpus, taille_chunk=4, nb_workers=nb_workers, max_chunks_en_vol=2)
+    metriques = ingestion.ingerer(str(chemin), afficher_progression=False)
+
+    documents = [(doc.titre, doc.auteur, doc.source, doc.date, doc.url, doc.texte) for doc in corpus.id2doc.values()]
+    assert documents == attendus
+    assert (metriques['nb_discours'], metriques['nb_phrases']) == (nb_discours, len(attendus))
@@ -0,0 +1,109 @@
+import random
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from classes.Document import ArxivDocument, Document
+from classes.SearchEngine import SearchEngine
+from tests.documents_factices import MOTS
+
+
+@lru_cache(maxsize=None)
+def date_naive(valeur):
+    # --- Date d'un document en UTC naïf (None si absente ou illisible) ---
+    date = pd.to_datetime(valeur, errors='coerce')
+    if pd.isna(date):
+        return None
+    return date.tz_convert('UTC').tz_localize(None) if date.tzinfo is not None else date
+
+
+def garde_document(doc, auteur=None, source=None, date_min=None, date_max=None,
+                   nb_commentaires_min=None, nb_commentaires_max=None):
+    # --- Prédicat naïf des filtres de search, document par document ---
+    if auteur is not None and (doc.auteur or 'inconnu') not in ([auteur] if isinstance(auteur, str) else auteur):
+        return False
+    if source is not None and doc.getType() not in ([source] if isinstance(source, str) else source):
+        return False
+    date = date_naive(doc.date)
+    if date_min is not None and (date is None or date < date_naive(date_min)):
+        return False
+    if date_max is not None and (date is None or date > date_naive(date_max)):
+        return False
+    nb_commentaires = getattr(doc, 'nb_commentaires', -1)
+    if nb_commentaires_min is not None and nb_commentaires < nb_commentaires_min:
+        return False
+    if nb_commentaires_max is not None and not 0 <= nb_commentaires <= nb_commentaires_max:
+        return False
+    return True
+
+
+def ajouter_documents_varies(corpus):
+    # --- Documents non Reddit : sans nombre de commentaires, dates datetime, avec fuseau, absentes
+    # ou illisibles, auteur absent ---
+    generateur = random.Random(1)
+    fuseau = timezone(timedelta(hours=2))
+    dates = [
+        datetime(2024, 1, 10, 23, 30), datetime(2024, 1, 11, 1, 0, tzinfo=fuseau), None, 'pas une date',
+        '2024-01-15T12:00:00Z', '2024-01-20',
+    ]
+    for i in range(24):
+        texte = ' '.join(generateur.choices(MOTS, k=6))
+        if i % 2:
+            corpus.register_document(ArxivDocument(
+                f"article {i}", f"auteur{i % 5}", 'Arxiv', dates[i % len(dates)], '', texte, id_source=f"a{i}"
+            ))
+        else:
+            corpus.register_document(Document(
+                f"discours {i}", None if i % 4 == 0 else 'orateur', 'Discours US', dates[i % len(dates)], '', texte
+            ))
+
+
+def filtres_aleatoires(generateur):
+    # --- Combinaison aléatoire de filtres (chacun présent une fois sur deux) ---
+    candidats = {
+        'auteur': lambda: generateur.choice(['auteur1', 'inconnu', 'orateur', ['auteur0', 'auteur3'], 'absent']),
+        'source': lambda: generateur.choice(['Reddit', 'Arxiv', ['Discours US', 'Arxiv'], 'absente']),
+        'date_min': lambda: generateur.choice(['2024-01-05', datetime(2024, 1, 10, 23, 0), '2024-01-11T00:00:00+02:00']),
+        'date_max': lambda: generateur.choice(['2024-01-20', datetime(2024, 1, 11, tzinfo=timezone.utc), '2024-01-08']),
+        'nb_commentaires_min': lambda: generateur.randint(-1, 6),
+        'nb_commentaires_max': lambda: generateur.randint(0, 6),
+    }
+    return {nom: valeur() for nom, valeur in candidats.items() if generateur.random() < 0.5}
+
+
+def test_masque_egal_au_predicat_naif(corpus_textes):
+    ajouter_documents_varies(corpus_textes)
+    moteur = SearchEngine(corpus_textes)
+    generateur = random.Random(0)
+    for _ in range(300):
+        filtres = filtres_aleatoires(generateur)
+        masque = moteur._construire_masque_filtres(**filtres)
+        attendu = [garde_document(doc, **filtres) for doc in moteur.documents]
+        if masque is None:
+            assert not filtres
+        else:
+            assert masque.tolist() == attendu, filtres
+
+
+def test_recherche_filtree_egale_au_post_filtrage(corpus_textes):
+    ajouter_documents_varies(corpus_textes)
+    moteur = SearchEngine(corpus_textes)
+    # Ajout incrémental : les colonnes des filtres sont étendues sans reconstruction
+    moteur.ajouter_documents([corpus_textes.register_document(ArxivDocument(
+        'tardif', 'auteur1', 'Arxiv', datetime(2024, 1, 12, tzinfo=timezone.utc), '', 'basketball war', id_source='t'
+    ))])
+    generateur = random.Random(2)
+    for _ in range(100):
+        filtres = filtres_aleatoires(generateur)
+        requete = generateur.sample(MOTS, 2)
+        # Recherche complète, filtrée après coup document par document
+        tous = moteur.search(requete, nb_documents=len(moteur.documents))
+        attendus = tous[[garde_document(corpus_textes.id2doc[doc_id], **filtres) for doc_id in tous['id']]] \
+            if not tous.empty else tous
+        resultats = moteur.search(requete, nb_documents=len(moteur.documents), **filtres)
+        assert len(resultats) == len(attendus), filtres
+        if len(attendus):
+            assert set(resultats['id']) == set(attendus['id'])
+            assert np.allclose(np.sort(resultats['score']), np.sort(attendus['score']))
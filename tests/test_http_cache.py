@@ -0,0 +1,131 @@
+import threading
+
+import pytest
+import requests
+
+from classes.ArxivFetcher import ArxivFetcher
+from classes.HttpCache import HttpCache
+from classes.RedditCrawler import RedditCrawler
+from tests.serveurs_factices import ServeurArxivFactice, ServeurRedditFactice
+
+
+class Horloge:
+    # --- Horloge murale simulée (secondes epoch) ---
+    def __init__(self):
+        self.temps = 1_000_000.0
+
+    def __call__(self):
+        return self.temps
+
+
+def lire(cache, session, url, params=None):
+    with cache.ouvrir(session, url, params) as flux:
+        return flux.read()
+
+
+def test_rejeu_hors_ligne(tmp_path):
+    # Un premier crawl remplit le cache ; le second tourne sans serveur
+    with ServeurArxivFactice(nb_resultats=130) as serveur, \
+            ArxivFetcher(base_url=serveur.url, requetes_par_seconde=None, cache=HttpCache(tmp_path)) as fetcher:
+        en_ligne = [doc.url for doc in fetcher.recuperer('all:basketball', max_results=130, taille_page=50)]
+        url = serveur.url
+
+    cache = HttpCache(tmp_path, hors_ligne=True)
+    with ArxivFetcher(base_url=url, requetes_par_seconde=None, cache=cache) as fetcher:
+        hors_ligne = [doc.url for doc in fetcher.recuperer('all:basketball', max_results=130, taille_page=50)]
+        with pytest.raises(LookupError):
+            list(fetcher.recuperer('all:football', max_results=10))
+
+    assert sorted(hors_ligne) == sorted(en_ligne)
+    assert cache.stats['hits'] == 3
+    assert cache.stats['misses'] == 0
+    assert fetcher.metriques['nb_requetes'] == 0
+
+
+def test_ttl_et_revalidation_304(tmp_path):
+    horloge = Horloge()
+    cache = HttpCache(tmp_path, ttl=60, horloge=horloge)
+    with ServeurArxivFactice() as serveur, requests.Session() as session:
+        params = {'search_query': 'all:basketball', 'start': 0, 'max_results': 10}
+        corps = lire(cache, session, serveur.url, params)
+        horloge.temps += 30
+        assert lire(cache, session, serveur.url, params) == corps
+        assert len(serveur.requetes) == 1
+
+        # Après le TTL : requête conditionnelle, le serveur répond 304 et le corps en cache est servi
+        horloge.temps += 60
+        assert lire(cache, session, serveur.url, params) == corps
+        assert len(serveur.requetes) == 2
+        assert serveur.requetes[-1]['params'] == {k: str(v) for k, v in params.items()}
+
+        # La revalidation repart pour un TTL complet
+        horloge.temps += 30
+        lire(cache, session, serveur.url, params)
+        assert len(serveur.requetes) == 2
+
+    assert cache.stats['misses'] == 1
+    assert cache.stats['revalidations'] == 1
+    assert cache.stats['hits'] == 2
+    assert cache.taux_succes() == pytest.approx(3 / 4)
+
+
+def test_eviction_des_moins_recemment_utilises(tmp_path):
+    with ServeurArxivFactice() as serveur, requests.Session() as session:
+        pages = [{'search_query': 'all:basketball', 'start': start, 'max_results': 5} for start in (0, 5, 10)]
+        taille_page = len(serveur.flux(0, 5))
+        horloge = Horloge()
+        cache = HttpCache(tmp_path, taille_max=int(2.5 * taille_page), horloge=horloge)
+        for page in (pages[0], pages[1], pages[0], pages[2]):
+            # La première page redevient la plus récemment utilisée : la deuxième est évincée
+            lire(cache, session, serveur.url, page)
+            horloge.temps += 1
+
+        assert cache.stats['evictions'] == 1
+        nb_requetes = len(serveur.requetes)
+        lire(cache, session, serveur.url, pages[0])
+        lire(cache, session, serveur.url, pages[2])
+        assert len(serveur.requetes) == nb_requetes
+        lire(cache, session, serveur.url, pages[1])
+        assert len(serveur.requetes) == nb_requetes + 1
+
+    # La taille est recalculée depuis le disque à l'ouverture
+    assert HttpCache(tmp_path, taille_max=cache.taille_max)._taille_totale == cache._taille_totale
+
+
+def test_ecritures_concurrentes_de_la_meme_url(tmp_path):
+    cache = HttpCache(tmp_path, ttl=0)
+    erreurs = []
+    with ServeurArxivFactice() as serveur, requests.Session() as session:
+        params = {'search_query': 'all:basketball', 'start': 0, 'max_results': 20}
+        attendu = serveur.flux(0, 20)
+
+        def travailler():
+            try:
+                for _ in range(10):
+                    assert lire(cache, session, serveur.url, params) == attendu
+            except Exception as erreur:
+                erreurs.append(erreur)
+
+        threads = [threading.Thread(target=travailler) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert erreurs == []
+    assert not list(tmp_path.rglob('*.tmp'))
+
+
+def test_crawler_reddit_hors_ligne(tmp_path):
+    with ServeurRedditFactice(['Basketball'], nb_posts=150) as serveur:
+        url = serveur.url
+        with RedditCrawler(api_url=url, auth_url=f"{url}/api/v1/access_token", requetes_par_seconde=None,
+                           client_id='id', client_secret='secret', cache=HttpCache(tmp_path)) as crawler:
+            en_ligne = crawler.crawler(['Basketball'], listings=('new',), limite=150)
+
+    # Hors ligne : ni jeton OAuth ni requête, les listings viennent du cache
+    with RedditCrawler(api_url=url, auth_url=f"{url}/api/v1/access_token", requetes_par_seconde=None,
+                       client_id='id', client_secret='secret', cache=HttpCache(tmp_path, hors_ligne=True)) as crawler:
+        hors_ligne = crawler.crawler(['Basketball'], listings=('new',), limite=150)
+
+    assert [doc.id_source for doc in hors_ligne] == [doc.id_source for doc in en_ligne]
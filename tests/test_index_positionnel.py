@@ -0,0 +1,29 @@
+import itertools
+import random
+
+from tests.documents_factices import MOTS
+
+
+def occurrences_naives(mots, phrase, slop):
+    # --- Référence : départs de la phrase, ses mots suivants pris parmi les slop + len(phrase) - 1 mots suivants ---
+    nb = 0
+    for i, mot in enumerate(mots):
+        fenetre = range(i + 1, min(len(mots), i + len(phrase) + slop))
+        if mot == phrase[0] and any(
+            all(mots[p] == terme for p, terme in zip(positions, phrase[1:]))
+            for positions in itertools.combinations(fenetre, len(phrase) - 1)
+        ):
+            nb += 1
+    return nb
+
+
+def test_phrases_identiques_au_parcours_naif(moteur):
+    generateur = random.Random(0)
+    textes = {doc_id: moteur._tokeniser(doc.texte) for doc_id, doc in zip(moteur.doc_ids, moteur.documents)}
+    for _ in range(60):
+        phrase = generateur.choices(MOTS, k=generateur.randint(1, 3))
+        slop = generateur.choice([0, 0, 1, 3])
+        attendues = {doc_id: nb for doc_id, mots in textes.items() if (nb := occurrences_naives(mots, phrase, slop))}
+        assert moteur.occurrences_phrase(phrase, slop).to_dict() == attendues
+        resultats = moteur.search(phrase, nb_documents=len(textes), phrase=True, slop=slop)
+        assert set(resultats['id'] if not resultats.empty else []) == set(attendues)
@@ -0,0 +1,50 @@
+import random
+import re
+
+from classes.IndexTrigrammes import IndexTrigrammes
+
+
+def expression_aleatoire(generateur, profondeur=0):
+    # --- Expression régulière sur l'alphabet abcd : littéraux, classes, alternatives, répétitions ---
+    # Les groupes n'ont que des répétitions bornées : (x*)+ ferait exploser le retour arrière de re
+    morceaux = []
+    for _ in range(generateur.randint(1, 3)):
+        tirage = generateur.random()
+        repetitions = ['', '', '', '?', '{2}', '{1,3}']
+        if tirage < 0.4 or profondeur >= 2:
+            morceau = ''.join(generateur.choices('abcdAB', k=generateur.randint(1, 5)))
+            repetitions += ['*', '+']
+        elif tirage < 0.55:
+            morceau = generateur.choice(['[ab]', '[a-c]', '[^a]', '.', r'\w', r'\s'])
+            repetitions += ['*', '+']
+        elif tirage < 0.8:
+            morceau = '(' + '|'.join(
+                expression_aleatoire(generateur, profondeur + 1) for _ in range(generateur.randint(2, 3))
+            ) + ')'
+        else:
+            morceau = '(?:' + expression_aleatoire(generateur, profondeur + 1) + ')'
+        morceaux.append(morceau + generateur.choice(repetitions))
+    return ''.join(morceaux)
+
+
+def test_candidats_contiennent_toutes_les_correspondances():
+    generateur = random.Random(0)
+    textes = [''.join(generateur.choices('abcd aAB', k=generateur.randint(0, 40))) for _ in range(200)]
+    textes[5] = None
+    index = IndexTrigrammes(textes)
+    for _ in range(300):
+        expression = expression_aleatoire(generateur)
+        for flags in (0, re.IGNORECASE):
+            motif = re.compile(expression, flags)
+            attendues = [(ligne, m.span()) for ligne, texte in enumerate(textes) for m in motif.finditer(texte or '')
+                         if texte]
+            candidats = set(index.candidats(motif).tolist())
+            assert {ligne for ligne, _ in attendues} <= candidats, expression
+            assert [(ligne, m.span()) for ligne, m in index.correspondances(motif)] == attendues, expression
+
+
+def test_les_candidats_sont_filtres():
+    textes = ['democracy and freedom', 'the democratic party', 'a free market', 'war and peace'] * 10
+    index = IndexTrigrammes(textes)
+    assert list(index.candidats('democra(cy|tic)')) == [i for i, texte in enumerate(textes) if 'democra' in texte]
+    assert len(index.candidats('fre+dom|market')) == 20
@@ -0,0 +1,100 @@
+import json
+import os
+
+from classes.ArxivFetcher import ArxivFetcher
+from classes.Corpus import Corpus
+from classes.Document import RedditDocument
+from classes.IngestionPipeline import IngestionPipeline, SourceIngestion
+from tests.serveurs_factices import ServeurArxivFactice
+
+
+def source_memoire(nom, pages):
+    # --- Source dont les pages sont des listes de (id, texte), curseur : indice de la page suivante ---
+    def generer(curseur):
+        for indice in range(curseur or 0, len(pages)):
+            yield indice + 1, pages[indice]
+
+    def parser(page):
+        return [
+            RedditDocument(f"post {identifiant}", 'auteur', 'Reddit', '2024-01-01', '', texte, id_source=identifiant)
+            for identifiant, texte in page
+        ]
+    return SourceIngestion(nom, generer, parser)
+
+
+def test_doublons_ecartes_et_snapshot(corpus, tmp_path):
+    pages = [
+        [('a', 'basketball'), ('b', 'football'), ('a', 'basketball')],
+        [('b', 'football'), ('c', 'tennis'), ('a', 'basketball tonight')],
+    ]
+    pipeline = IngestionPipeline(
+        corpus, [source_memoire('memoire', pages)], chemin_corpus=str(tmp_path / 'corpus.json'),
+        chemin_checkpoint=str(tmp_path / 'checkpoint.json'), indexer=False
+    )
+    rapport = pipeline.executer(reprendre=False)
+
+    # Le doublon de la page 1 est écarté ; en page 2, 'a' modifié est une mise à jour
+    # ('b' inchangé est écarté par dedupe ou ignoré par le corpus selon l'avancement de register)
+    assert rapport.loc['dedupe', 'nb_entrees'] == 6
+    assert rapport.loc['dedupe', 'nb_sorties'] <= 5
+    assert corpus.compteurs_enregistrement['nouveaux'] == 3
+    assert corpus.compteurs_enregistrement['mis_a_jour'] == 1
+    assert corpus.ndoc == 3
+    assert corpus.id2doc[corpus.index_sources[('Reddit', 'a')]].texte == 'basketball tonight'
+    assert pipeline.moteur is None
+    assert pipeline.sources_terminees()
+    with open(tmp_path / 'checkpoint.json', encoding='utf-8') as f:
+        assert json.load(f)['sources']['memoire']['termine']
+
+
+def test_est_inchange(corpus):
+    document = RedditDocument('titre', 'auteur', 'Reddit', '2024-01-01', '', 'texte', id_source='x')
+    assert not corpus.est_inchange(document)
+    corpus.register_document(document)
+    assert corpus.est_inchange(RedditDocument('titre', 'auteur', 'Reddit', '2024-01-01', '', 'texte', id_source='x'))
+    assert not corpus.est_inchange(RedditDocument('titre', 'auteur', 'Reddit', '2024-01-01', '', 'autre', id_source='x'))
+    assert not corpus.est_inchange(RedditDocument('titre', 'auteur', 'Reddit', '2024-01-01', '', 'texte'))
+
+
+def relancer(tmp_path, sources, **options):
+    # --- Nouvelle exécution de la CLI : nouveau processus, donc corpus vide en mémoire ---
+    Corpus._instance = None
+    Corpus._initialized = False
+    corpus = Corpus.getInstance("Test")
+    pipeline = IngestionPipeline(
+        corpus, sources, chemin_corpus=str(tmp_path / 'corpus.json'),
+        chemin_checkpoint=str(tmp_path / 'checkpoint.json'), indexer=False
+    )
+    pipeline.executer(**options)
+    return corpus
+
+
+def test_le_corpus_existant_est_complete(corpus, tmp_path):
+    relancer(tmp_path, [source_memoire('reddit', [[('a', 'basketball'), ('b', 'football')]])])
+    # Sans checkpoint (supprimé) puis avec --nouveau : les documents de la première exécution restent
+    os.remove(tmp_path / 'checkpoint.json')
+    deuxieme = relancer(tmp_path, [source_memoire('autre', [[('c', 'tennis')]])])
+    assert sorted(doc.id_source for doc in deuxieme.id2doc.values()) == ['a', 'b', 'c']
+    troisieme = relancer(tmp_path, [source_memoire('autre', [[('d', 'golf')]])], reprendre=False)
+    assert sorted(doc.id_source for doc in troisieme.id2doc.values()) == ['a', 'b', 'c', 'd']
+
+    # Corpus vide demandé explicitement : corpus.json est remplacé
+    relancer(tmp_path, [source_memoire('autre', [[('e', 'rugby')]])], corpus_vide=True)
+    with open(tmp_path / 'corpus.json', encoding='utf-8') as f:
+        assert [doc['id_source'] for doc in json.load(f)['documents'].values()] == ['e']
+
+
+def test_source_arxiv_s_arrete_a_la_derniere_page(corpus, tmp_path):
+    # 230 résultats par pages de 100 : la troisième page (30 entrées) est la dernière
+    with ServeurArxivFactice(nb_resultats=230) as serveur, \
+            ArxivFetcher(base_url=serveur.url, requetes_par_seconde=None) as fetcher:
+        pipeline = IngestionPipeline(
+            corpus, [SourceIngestion.arxiv(fetcher, 'all:basketball', max_results=1000, taille_page=100)],
+            chemin_corpus=str(tmp_path / 'corpus.json'), chemin_checkpoint=str(tmp_path / 'checkpoint.json'),
+            indexer=False
+        )
+        pipeline.executer(reprendre=False)
+
+    assert corpus.ndoc == 230
+    assert sorted(int(requete['params']['start']) for requete in serveur.requetes) == [0, 100, 200]
+    assert pipeline.sources_terminees()
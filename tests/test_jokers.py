@@ -0,0 +1,35 @@
+import random
+import re
+
+import pytest
+
+from classes.SearchEngine import SearchEngine
+from tests.documents_factices import document
+
+
+@pytest.fixture
+def moteur_mots_varies(corpus):
+    # --- Moteur dont le vocabulaire compte quelques centaines de mots de 2 à 6 lettres (a à e) ---
+    generateur = random.Random(0)
+    mots = [''.join(generateur.choices('abcde', k=generateur.randint(2, 6))) for _ in range(400)]
+    for i in range(80):
+        corpus.register_document(document(f"d{i}", ' '.join(generateur.choices(mots, k=10))))
+    return SearchEngine(corpus)
+
+
+def expansion_naive(moteur, motif, max_expansions):
+    # --- Référence : expression régulière sur chaque mot, puis les plus fréquents (ordre alphabétique si ex aequo) ---
+    expression = re.compile(''.join('.*' if c == '*' else '.' if c == '?' else re.escape(c) for c in motif))
+    mots = [mot for mot in moteur.mots if expression.fullmatch(mot)]
+    mots = sorted(mots, key=lambda mot: (-moteur.vocab[mot]['nb_documents'], mot))[:max_expansions]
+    return sorted(mots)
+
+
+def test_expansion_identique_au_parcours_du_vocabulaire(moteur_mots_varies):
+    generateur = random.Random(1)
+    motifs = ['a*', 'abc*', 'ed*', '*cd', 'a?c*', '?b?', '*a*e', 'c*d*e', 'abcde', '*', 'x*']
+    motifs += [''.join(generateur.choice('abcde**?') for _ in range(generateur.randint(1, 5))) for _ in range(60)]
+    for motif in motifs:
+        for max_expansions in (5, 1000):
+            assert moteur_mots_varies.etendre_motif(motif, max_expansions) == \
+                expansion_naive(moteur_mots_varies, motif, max_expansions), motif
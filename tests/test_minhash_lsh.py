@@ -0,0 +1,48 @@
+import random
+
+import numpy as np
+
+from classes.MinHashLSH import MinHashLSH
+from tests.documents_factices import MOTS, document
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+
+def test_estimation_de_la_similarite_de_jaccard():
+    generateur = random.Random(0)
+    lsh = MinHashLSH()
+    for _ in range(50):
+        mots = generateur.choices(MOTS, k=40)
+        # Copie dont une partie des mots est remplacée : similarités réparties entre 0 et 1
+        autres = [generateur.choice(MOTS) if generateur.random() < generateur.random() else mot for mot in mots]
+        exacte = jaccard(set(lsh.shingles(mots).tolist()), set(lsh.shingles(autres).tolist()))
+        estimee = (lsh.signature(mots) == lsh.signature(autres)).mean()
+        assert abs(estimee - exacte) < 0.2
+
+
+def test_quasi_doublons_lies_comme_la_comparaison_exhaustive(corpus):
+    generateur = random.Random(1)
+    corpus.configurer_quasi_doublons('lier')
+    textes = [' '.join(generateur.choices(MOTS, k=30)) for _ in range(30)]
+    # Variantes : dernier mot remplacé (Jaccard des shingles ~0.93) ou moitié réécrite (< 0.5)
+    textes += [texte.rsplit(' ', 1)[0] + ' zeppelin' for texte in textes[:10]]
+    textes += [' '.join(texte.split()[:15] + generateur.choices(MOTS, k=15)) for texte in textes[10:20]]
+    generateur.shuffle(textes)
+    doc_ids = [corpus.register_document(document(f"d{i}", texte)) for i, texte in enumerate(textes)]
+
+    # Référence : Jaccard exact avec chacun des documents canoniques enregistrés avant
+    shingles = {doc_id: set(corpus.lsh.shingles(corpus._mots_minhash(corpus.id2doc[doc_id])).tolist())
+                for doc_id in doc_ids}
+    canoniques = []
+    for doc_id in doc_ids:
+        similarites = [jaccard(shingles[doc_id], shingles[autre]) for autre in canoniques]
+        meilleure = max(similarites, default=0)
+        assert meilleure > 0.9 or meilleure < 0.6
+        if meilleure > 0.9:
+            assert corpus.get_canonique(doc_id) == canoniques[int(np.argmax(similarites))]
+        else:
+            assert corpus.get_canonique(doc_id) == doc_id
+            canoniques.append(doc_id)
+    assert sum(len(liste) for liste in corpus.quasi_doublons.values()) == 10
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from scipy.sparse import random as matrice_aleatoire
+
+from classes.PostingsCompresses import PostingsCompresses
+
+
+def colonne(mat_csc, terme):
+    debut, fin = mat_csc.indptr[terme], mat_csc.indptr[terme + 1]
+    return mat_csc.indices[debut:fin], mat_csc.data[debut:fin]
+
+
+@pytest.mark.parametrize('taille_bloc', [1, 3, 128])
+def test_decodage_identique_a_la_matrice_csc(taille_bloc):
+    generateur = np.random.default_rng(0)
+    for nb_lignes, nb_termes, densite in ((0, 5, 0.0), (1, 1, 1.0), (50, 40, 0.1), (3000, 60, 0.05), (200_000, 3, 1e-4)):
+        mat_TF = matrice_aleatoire(nb_lignes, nb_termes, density=densite, format='csr', random_state=generateur)
+        # TF entiers : surtout 1, parfois très grands (largeurs de bits variées)
+        mat_TF.data = np.where(generateur.random(mat_TF.nnz) < 0.05, generateur.integers(2, 100_000, mat_TF.nnz), 1)
+        index = PostingsCompresses(mat_TF, taille_bloc=taille_bloc)
+        mat_csc = mat_TF.tocsc()
+        mat_csc.sort_indices()
+        assert list(index.nb_documents) == list(np.diff(mat_csc.indptr))
+        for terme in range(nb_termes):
+            lignes, tf = index.postings(terme)
+            attendues, tf_attendus = colonne(mat_csc, terme)
+            assert np.array_equal(lignes, attendues) and np.array_equal(tf, tf_attendus)
+        # Sous-ensemble quelconque (croissant) de blocs : concaténation des blocs décodés un par un
+        nb_blocs = index.debut_blocs[-1]
+        blocs = np.sort(generateur.choice(nb_blocs, size=min(nb_blocs, 20), replace=False)) if nb_blocs else []
+        lignes, tf = index.decoder_blocs(blocs)
+        un_par_un = [index.decoder_blocs([bloc]) for bloc in blocs]
+        assert np.array_equal(lignes, np.concatenate([l for l, _ in un_par_un] + [np.empty(0, np.int64)]))
+        assert np.array_equal(tf, np.concatenate([t for _, t in un_par_un] + [np.empty(0, np.int64)]))
+
+
+def test_recherche_sur_l_index_compresse(moteur):
+    moteur.construire_index_compresse(taille_bloc=4)
+    for mots_cles in (['basketball'], ['war', 'peace', 'people'], ['coach', 'coach', 'jobs']):
+        vecteur = moteur._construire_vecteur_requete(mots_cles)
+        assert np.allclose(moteur._calculer_scores_postings(vecteur), moteur._calculer_similarite_cosinus(vecteur))
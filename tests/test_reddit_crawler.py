@@ -0,0 +1,125 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from classes.RedditCrawler import RedditCrawler
+from tests.serveurs_factices import ServeurRedditFactice
+
+
+SUBREDDITS = ['Basketball', 'nba', 'NBA2k']
+
+
+def crawler_factice(serveur, corpus=None, **kwargs):
+    return RedditCrawler(
+        corpus, client_id='id', client_secret='secret', username='u', password='p',
+        api_url=serveur.url, auth_url=f"{serveur.url}/api/v1/access_token",
+        requetes_par_seconde=None, **kwargs
+    )
+
+
+def test_crawl_concurrent_de_plusieurs_subreddits():
+    with ServeurRedditFactice(SUBREDDITS, nb_posts=250, latence=0.05) as serveur, \
+            crawler_factice(serveur, max_concurrence=3) as crawler:
+        documents = crawler.crawler(SUBREDDITS, listings=('new',), limite=250)
+
+    assert len(documents) == 3 * 250
+    assert len({doc.id_source for doc in documents}) == 3 * 250
+    listings = [r for r in serveur.requetes if r['methode'] == 'GET']
+    # 3 pages (100 + 100 + 50) par subreddit, un seul jeton OAuth pour toute la session
+    assert len(listings) == 9
+    assert sum(r['methode'] == 'POST' for r in serveur.requetes) == 1
+    assert 1 < serveur.concurrence_max <= 3
+
+
+def test_budget_global_de_requetes():
+    with ServeurRedditFactice(SUBREDDITS, nb_posts=250) as serveur, \
+            crawler_factice(serveur, budget_requetes=4) as crawler:
+        documents = crawler.crawler(SUBREDDITS, listings=('new', 'hot'), limite=250)
+
+    listings = [r for r in serveur.requetes if r['methode'] == 'GET']
+    assert len(listings) == 4
+    assert crawler.metriques['nb_requetes'] == 4
+    assert crawler.metriques['budget_epuise']
+    assert len(documents) == 4 * 100
+
+
+def test_enregistrement_par_lots(corpus):
+    with ServeurRedditFactice(SUBREDDITS, nb_posts=120) as serveur, \
+            crawler_factice(serveur, corpus, taille_lot=50) as crawler:
+        documents = crawler.crawler(SUBREDDITS, listings=('new',), limite=120)
+
+    assert len(documents) == 360
+    assert corpus.ndoc == 360
+    # Lots enregistrés au fil des pages (au moins taille_lot documents chacun, sauf le dernier)
+    assert 360 // 100 <= crawler.metriques['nb_lots'] <= 360 // 50 + 1
+
+
+def test_crawl_incremental(corpus):
+    with ServeurRedditFactice(['Basketball'], nb_posts=150) as serveur, \
+            crawler_factice(serveur, corpus) as crawler:
+        assert len(crawler.crawler(['Basketball'], listings=('new',), limite=500, incremental=True)) == 150
+        nb_requetes = len(serveur.requetes)
+        # Rien de nouveau : la première page atteint le watermark
+        assert crawler.crawler(['Basketball'], listings=('new',), limite=500, incremental=True) == []
+        assert len(serveur.requetes) == nb_requetes + 1
+
+
+def requetes_commentaires(serveur):
+    return sorted(r['chemin'] for r in serveur.requetes if r['chemin'].startswith('/comments/'))
+
+
+def test_arbres_de_commentaires(corpus):
+    with ServeurRedditFactice(['Basketball'], nb_posts=10) as serveur, \
+            crawler_factice(serveur, corpus) as crawler:
+        # Chaque post figure dans 'hot' et 'new' : son arbre n'est récupéré qu'une fois
+        crawler.crawler(['Basketball'], listings=('hot', 'new'), limite=10, avec_commentaires=True,
+                        options_commentaires={'profondeur_max': 2, 'limite_more': 1})
+
+    assert requetes_commentaires(serveur) == sorted(f"/comments/Basketball{i}" for i in range(10))
+    assert sum(r['chemin'] == '/api/morechildren' for r in serveur.requetes) == 10
+    # Par post : 3 réponses directes et les 2 du « more », avec leurs réponses (profondeur 1 < 2)
+    assert crawler.metriques['nb_commentaires'] == 10 * (3 + 2) * 2
+    commentaires = [doc for doc in corpus.id2doc.values() if doc.getType() == 'Commentaire Reddit']
+    assert len(commentaires) == 100
+    assert max(doc.profondeur for doc in commentaires) == 1
+    soumission = corpus.index_sources[('Reddit', 'Basketball3')]
+    assert len(corpus.get_commentaires(soumission)) == 10
+
+
+def test_commentaires_avec_quasi_doublons_supprimes(corpus):
+    # Les textes des posts ne diffèrent que par un nombre : tous sont des quasi-doublons du premier
+    corpus.configurer_quasi_doublons('supprimer')
+    with ServeurRedditFactice(['Basketball'], nb_posts=5) as serveur, \
+            crawler_factice(serveur, corpus) as crawler:
+        crawler.crawler(['Basketball'], listings=('new',), limite=5, avec_commentaires=True)
+
+    assert sum(doc.getType() == 'Reddit' for doc in corpus.id2doc.values()) == 1
+    assert requetes_commentaires(serveur) == ['/comments/Basketball0']
+
+
+def test_crawler_depuis_une_boucle_asyncio_active():
+    # Cas de Jupyter : crawler() est appelé alors qu'une boucle tourne déjà dans le thread
+    async def cellule():
+        return crawler.crawler(['Basketball'], listings=('new',), limite=30)
+
+    with ServeurRedditFactice(['Basketball'], nb_posts=30) as serveur, crawler_factice(serveur) as crawler:
+        documents = asyncio.run(cellule())
+    assert len(documents) == 30
+
+
+def test_metriques_partagees_entre_crawls_simultanes():
+    with ServeurRedditFactice(SUBREDDITS, nb_posts=200) as serveur, crawler_factice(serveur) as crawler, \
+            ThreadPoolExecutor(max_workers=3) as pool:
+        resultats = list(pool.map(
+            lambda subreddit: crawler.crawler([subreddit], listings=('new', 'hot'), limite=200), SUBREDDITS * 2
+        ))
+    assert sum(len(documents) for documents in resultats) == 6 * 400
+    assert crawler.metriques['nb_documents'] == 6 * 400
+
+
+def test_dates_en_utc():
+    # created_utc est un instant UTC : la date ne dépend pas du fuseau de la machine
+    post = RedditCrawler.post_vers_document({'id': 'a', 'created_utc': 1_717_200_000})
+    commentaire = RedditCrawler.commentaire_vers_document({'id': 'c', 'created_utc': 0}, 'titre', 'a')
+    assert post.date == datetime(2024, 6, 1, 0, 0) and post.date.tzinfo is None
+    assert commentaire.date == datetime(1970, 1, 1)
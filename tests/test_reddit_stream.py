@@ -0,0 +1,55 @@
+import itertools
+import time
+
+from classes.Document import Document
+from classes.RedditStream import RedditStream
+from classes.SearchEngine import SearchEngine
+
+
+def post(identifiant, texte='basketball game tonight'):
+    # --- Soumission au format JSON de l'API ---
+    return {
+        'id': identifiant, 'title': f"post {identifiant}", 'author': 'auteur', 'created_utc': time.time(),
+        'url': f"https://reddit.com/{identifiant}", 'num_comments': 0, 'selftext': texte,
+    }
+
+
+def flux_infini(prefixe):
+    for i in itertools.count():
+        yield post(f"{prefixe}{i}")
+
+
+def test_micro_lots_indexes(corpus):
+    corpus.register_document(Document('initial', 'auteur', 'Reddit', '2024-01-01', '', 'initial document'))
+    moteur = SearchEngine(corpus)
+    flux = RedditStream(corpus, moteur, taille_lot=50, delai_max=10)
+
+    posts = [post(f"p{i}") for i in range(119)] + [post('p119', 'zeppelin basketball')]
+    rapport = flux.consommer(posts)
+
+    assert rapport['nb_soumissions'] == 120
+    assert rapport['nb_lots'] == 3
+    assert corpus.ndoc == 121
+    assert len(moteur.doc_ids) == 121
+    resultats = moteur.search(['zeppelin'])
+    assert list(resultats['titre']) == ['post p119']
+
+
+def test_arret_puis_nouveau_flux(corpus):
+    # Le producteur du premier appel (flux infini, file pleine) ne doit ni remplir la file du
+    # second appel ni le terminer prématurément
+    flux = RedditStream(corpus, taille_lot=10, delai_max=0.05, taille_file=20)
+    flux.consommer(flux_infini('a'), duree_max=0.3)
+    nb_premier = flux.metriques['nb_soumissions']
+    assert nb_premier > 0
+
+    def flux_lent():
+        for i in range(5):
+            time.sleep(0.05)
+            yield post(f"b{i}")
+
+    rapport = flux.consommer(flux_lent())
+
+    assert rapport['nb_soumissions'] == nb_premier + 5
+    titres = {doc.titre for doc in corpus.id2doc.values()}
+    assert {f"post b{i}" for i in range(5)} <= titres
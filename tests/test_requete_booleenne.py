@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from classes.RequeteBooleenne import RequeteBooleenne
+from classes.SearchEngine import SearchEngine
+from tests.documents_factices import MOTS
+
+
+def requete_aleatoire(generateur, profondeur=0):
+    # --- (texte de la requête, fonction ensemble des documents -> documents qui la satisfont) ---
+    tirage = generateur.random()
+    if profondeur >= 3 or tirage < 0.3:
+        if generateur.random() < 0.2:
+            phrase = generateur.choices(MOTS, k=2)
+            return f'"{" ".join(phrase)}"', lambda textes: {
+                doc_id for doc_id, mots in textes.items()
+                if any(mots[i:i + 2] == phrase for i in range(len(mots) - 1))
+            }
+        mot = generateur.choice(MOTS)
+        return mot, lambda textes: {doc_id for doc_id, mots in textes.items() if mot in mots}
+    if tirage < 0.45:
+        texte, ensemble = requete_aleatoire(generateur, profondeur + 1)
+        return f"NOT ({texte})", lambda textes: set(textes) - ensemble(textes)
+    (texte_a, a), (texte_b, b) = requete_aleatoire(generateur, profondeur + 1), requete_aleatoire(generateur, profondeur + 1)
+    if tirage < 0.75:
+        # AND explicite ou implicite (juxtaposition)
+        operateur = generateur.choice(['AND', 'and', ''])
+        return f"({texte_a}) {operateur} ({texte_b})", lambda textes: a(textes) & b(textes)
+    return f"({texte_a}) OR ({texte_b})", lambda textes: a(textes) | b(textes)
+
+
+@pytest.mark.parametrize('compression', [False, True])
+def test_requetes_identiques_a_l_algebre_des_ensembles(corpus_textes, compression):
+    moteur = SearchEngine(corpus_textes, compression=compression)
+    textes = {doc_id: moteur._tokeniser(doc.texte) for doc_id, doc in zip(moteur.doc_ids, moteur.documents)}
+    generateur = random.Random(0)
+    requetes = [requete_aleatoire(generateur) for _ in range(150)]
+    # Priorités sans parenthèses : NOT > AND > OR
+    requetes += [
+        ('jobs OR war peace', lambda t: {d for d, m in t.items() if 'jobs' in m or ('war' in m and 'peace' in m)}),
+        ('NOT war peace', lambda t: {d for d, m in t.items() if 'war' not in m and 'peace' in m}),
+        ('team ET NON coach OU dunk', lambda t: {d for d, m in t.items() if ('team' in m and 'coach' not in m) or 'dunk' in m}),
+    ]
+    for texte, ensemble in requetes:
+        attendus = ensemble(textes)
+        lignes = moteur._lignes_booleennes(RequeteBooleenne(texte))
+        assert {moteur.doc_ids[ligne] for ligne in lignes} == attendus, texte
+        resultats = moteur.search(texte, nb_documents=len(textes), booleen=True)
+        assert set(resultats['id'] if not resultats.empty else []) == attendus, texte
+
+
+def test_requetes_invalides():
+    for texte in ('', 'war AND', '(war OR peace', 'NOT', '"middle class'):
+        with pytest.raises(ValueError):
+            RequeteBooleenne(texte)
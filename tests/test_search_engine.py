@@ -0,0 +1,186 @@
+import math
+import warnings
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from classes.Document import RedditDocument
+from classes.SearchEngine import SearchEngine
+from tests.documents_factices import document
+
+
+def tfidf_naif(moteur):
+    # --- Matrice TFxIDF dense recalculée à partir des textes (lignes et colonnes du moteur) ---
+    comptes = [Counter(moteur._tokeniser(doc.texte or '')) for doc in moteur.documents]
+    df = Counter(mot for compte in comptes for mot in compte)
+    N = len(comptes)
+    matrice = np.zeros((N, len(moteur.mots)))
+    for ligne, compte in enumerate(comptes):
+        for mot, tf in compte.items():
+            matrice[ligne, moteur.mot_to_index[mot]] = tf * math.log(N / df[mot])
+    return matrice
+
+
+def cosinus_naifs(matrice, vecteur):
+    # --- Cosinus de chaque ligne avec le vecteur (0 pour une ligne ou un vecteur nul) ---
+    normes = np.linalg.norm(matrice, axis=1) * np.linalg.norm(vecteur)
+    return np.divide(matrice @ vecteur, normes, out=np.zeros(len(matrice)), where=normes > 0)
+
+
+def test_terme_sans_document_apres_mise_a_jour(corpus_textes):
+    # 'zeppelin' ne figure plus dans aucun document : son df vaut 0, il ne doit rien contribuer
+    corpus_textes.register_document(document('z', 'zeppelin basketball'))
+    moteur = SearchEngine(corpus_textes, compression=True)
+    moteur.ajouter_documents([corpus_textes.register_document(document('z', 'airship basketball'))])
+    reference = SearchEngine(corpus_textes)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        compresse = moteur.search(['zeppelin', 'basketball', 'dunk'], nb_documents=5)
+        exhaustif = reference.search(['zeppelin', 'basketball', 'dunk'], nb_documents=5)
+    assert np.allclose(compresse['score'], exhaustif['score'])
+    assert moteur.search(['zeppelin']).empty
+
+
+@pytest.mark.parametrize('compression', [False, True])
+def test_top_k_egal_au_classement_exhaustif(corpus_textes, compression):
+    moteur = SearchEngine(corpus_textes, compression=compression)
+    matrice = tfidf_naif(moteur)
+    for requete, filtres in (
+        (['basketball', 'coach'], {}), (['democracy', 'war', 'war'], {}), (['jobs'], {'auteur': 'auteur2'}),
+    ):
+        resultats = moteur.search(requete, nb_documents=5, **filtres)
+        vecteur = np.zeros(len(moteur.mots))
+        for mot, nb in Counter(requete).items():
+            vecteur[moteur.mot_to_index[mot]] = nb * math.log(len(matrice) / moteur.vocab[mot]['nb_documents'])
+        scores = cosinus_naifs(matrice, vecteur)
+        if filtres:
+            scores[[doc.auteur != filtres['auteur'] for doc in moteur.documents]] = 0
+        # Mêmes scores que les 5 meilleurs du calcul naïf, chacun étant bien celui de son document
+        assert np.allclose(resultats['score'], np.sort(scores)[::-1][:5])
+        lignes = [moteur.doc_id_to_ligne[doc_id] for doc_id in resultats['id']]
+        assert np.allclose(resultats['score'], scores[lignes])
+
+
+def test_similar_egal_au_cosinus_naif(moteur, corpus_textes):
+    matrice = tfidf_naif(moteur)
+    for doc_id in (corpus_textes.index_sources[('Reddit', f"p{i}")] for i in (0, 17, 42)):
+        ligne = moteur.doc_id_to_ligne[doc_id]
+        scores = cosinus_naifs(matrice, matrice[ligne])
+        scores[ligne] = 0
+        resultats = moteur.similar(doc_id, k=5)
+        assert np.allclose(resultats['score'], np.sort(scores)[::-1][:5])
+        assert np.allclose(resultats['score'], scores[[moteur.doc_id_to_ligne[d] for d in resultats['id']]])
+
+
+def test_voisins_egaux_au_cosinus_naif(moteur):
+    matrice = tfidf_naif(moteur)
+    normalisee = matrice / np.linalg.norm(matrice, axis=1, keepdims=True)
+    attendus = normalisee @ normalisee.T
+    np.fill_diagonal(attendus, 0)
+    attendus = -np.sort(-attendus, axis=1)[:, :5]
+    for taille_bloc in (None, 1, 7):
+        voisins, scores = moteur.voisins(k=5, taille_bloc=taille_bloc)
+        assert np.allclose(scores, attendus)
+    # Chaque voisin a bien le score annoncé
+    lignes = np.vectorize(moteur.doc_id_to_ligne.get)(voisins)
+    assert np.allclose(scores, np.take_along_axis(normalisee @ normalisee.T, lignes, axis=1))
+
+
+def test_rappel_de_l_index_ann(moteur):
+    moteur.construire_index_ann(nb_bandes=16, bits_par_bande=4, nb_sondes=2)
+    rappels = []
+    for doc_id in moteur.doc_ids:
+        exacts = set(moteur.similar(doc_id, k=5)['id'])
+        approches = set(moteur.similar(doc_id, k=5, approx=True)['id'])
+        rappels.append(len(exacts & approches) / len(exacts))
+    assert np.mean(rappels) >= 0.9
+
+
+def test_index_ann_reconstruit_a_la_demande(moteur, corpus_textes):
+    index = moteur.construire_index_ann(nb_bandes=8, bits_par_bande=4, nb_sondes=2)
+    ligne = moteur.doc_id_to_ligne[corpus_textes.index_sources[('Reddit', 'p1')]]
+    candidats = index.candidats(moteur.matrice_normalisee()[ligne])
+    assert list(candidats) == sorted(set(candidats)) and ligne in candidats
+
+    nouveau = corpus_textes.register_document(document('n', 'basketball court game'))
+    moteur.ajouter_documents([nouveau])
+    assert moteur.index_ann is None
+    resultats = moteur.similar(nouveau, k=5, approx=True)
+    assert (moteur.index_ann.nb_bandes, moteur.index_ann.bits_par_bande, moteur.index_ann.nb_sondes) == (8, 4, 2)
+    assert moteur.index_ann.matrice.shape[0] == 61
+    assert not resultats.empty
+
+
+def test_lsa_trouve_un_synonyme(corpus):
+    # 'automobile' n'apparaît jamais avec 'car', mais tous deux partagent leur contexte (engine, road)
+    textes = ['car engine road'] * 4 + ['automobile engine road'] * 4 + ['basketball court team'] * 4 \
+        + ['democracy freedom people'] * 4
+    for i, texte in enumerate(textes):
+        corpus.register_document(document(f"d{i}", texte))
+    moteur = SearchEngine(corpus)
+    moteur.construire_index_lsa(rang=3)
+    synonymes = {corpus.index_sources[('Reddit', f"d{i}")] for i in range(4, 8)}
+
+    assert not synonymes & set(moteur.search(['car'], nb_documents=16)['id'])
+    resultats = moteur.search(['car'], nb_documents=8, lsa=True)
+    # Les 8 premiers : les documents 'car' et leurs synonymes, avant tout document hors sujet
+    assert synonymes <= set(resultats['id'])
+    assert (resultats['score'] > 0.5).all()
+
+
+def test_index_lsa_reconstruit_a_la_demande(moteur, corpus_textes):
+    moteur.construire_index_lsa(rang=3)
+    moteur.ajouter_documents([corpus_textes.register_document(document('n', 'basketball court'))])
+    assert moteur.index_lsa is None
+    resultats = moteur.search(['court'], lsa=True)
+    assert moteur.index_lsa.rang == 3
+    assert len(moteur.index_lsa.documents) == 61
+    assert not resultats.empty
+
+
+def test_lsa_corpus_trop_petit(corpus):
+    corpus.register_document(document('seul', 'basketball tonight'))
+    moteur = SearchEngine(corpus)
+    with pytest.raises(ValueError):
+        moteur.construire_index_lsa()
+    # Pas d'espace latent : la recherche sémantique se rabat sur le cosinus (idf nul : aucun résultat)
+    assert moteur.search(['basketball'], lsa=True).equals(moteur.search(['basketball']))
+    assert moteur.index_lsa is None
+
+
+def test_ajout_par_lots_equivalent_a_une_reconstruction(moteur, corpus_textes):
+    # Nouveaux mots (dont un avant tous les autres dans l'ordre trié), documents modifiés, nouvel auteur
+    lot = [corpus_textes.register_document(document(f"n{i}", f"aardvark zebra basketball {'dunk ' * i}"))
+           for i in range(3)]
+    lot.append(corpus_textes.register_document(document('p4', 'rewritten court story')))
+    lot.append(corpus_textes.register_document(RedditDocument(
+        'autre', 'nouvel auteur', 'Reddit', '2024-02-01', '', 'court tonight', id_source='a', nb_commentaires=7
+    )))
+    moteur.ajouter_documents(lot)
+    # Lot sans nouveau mot : la matrice publiée avant le lot n'est pas modifiée sur place
+    matrice_publiee = moteur.mat_TF
+    ancienne = matrice_publiee.copy()
+    moteur.ajouter_documents([corpus_textes.register_document(document('p7', 'team game zebra')),
+                              corpus_textes.register_document(document('n9', 'court dunk'))])
+    assert (matrice_publiee != ancienne).nnz == 0 and matrice_publiee.shape == ancienne.shape
+
+    reference = SearchEngine(corpus_textes)
+    assert moteur.mots == reference.mots and moteur.doc_ids == reference.doc_ids
+    assert dict(moteur.vocab) == dict(reference.vocab)
+    assert abs(moteur.mat_TF - reference.mat_TF).max() == 0
+    assert np.allclose(moteur.mat_TFxIDF.toarray(), reference.mat_TFxIDF.toarray())
+    assert np.allclose(moteur.normes_docs, reference.normes_docs)
+    for colonne in ('doc_dates', 'doc_nb_commentaires', 'groupes'):
+        assert np.array_equal(getattr(moteur, colonne), getattr(reference, colonne))
+    # Codes des auteurs et des sources : numérotation libre, mêmes valeurs décodées
+    for nom in ('auteur', 'source'):
+        valeurs = [{code: valeur for valeur, code in getattr(m, f"{nom}_to_code").items()} for m in (moteur, reference)]
+        assert [valeurs[0][c] for c in getattr(moteur, f"codes_{nom}")] == \
+            [valeurs[1][c] for c in getattr(reference, f"codes_{nom}")]
+    for requete, filtres in ((['court', 'zebra'], {}), (['court'], {'auteur': 'nouvel auteur'})):
+        resultats = moteur.search(requete, **filtres)
+        attendus = reference.search(requete, **filtres)
+        assert list(resultats['id']) == list(attendus['id'])
+        assert np.allclose(resultats['score'], attendus['score'])